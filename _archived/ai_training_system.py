@@ -7,9 +7,13 @@ This creates a knowledge base from all course materials and integrates it with t
 import os
 import json
 import re
+import sys
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from html_text import html_to_text
+
 class CourseKnowledgeExtractor:
     """Extract and organize knowledge from all course materials."""
     
@@ -58,8 +62,12 @@ class CourseKnowledgeExtractor:
                 if file.endswith(('.md', '.txt', '.html')):
                     file_path = Path(root) / file
                     try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
+                        if file_path.suffix == '.html':
+                            # One text block per line, without markup or scripts
+                            content = html_to_text(path=file_path)
+                        else:
+                            with open(file_path, 'r', encoding='utf-8') as f:
+                                content = f.read()
                         self.process_file_content(str(file_path), content)
                     except Exception as e:
                         print(f"⚠️ Error reading {file_path}: {e}")
@@ -119,7 +127,8 @@ class CourseKnowledgeExtractor:
         
         # Extract formulas from HTML
         html_formulas = re.findall(r'<div[^>]*font-mono[^>]*>([^<]+)</div>', content, re.IGNORECASE)
-        html_formulas.extend(re.findall(r'([A-Z]\w*\s*=\s*[^<>\n]+)', content))
+        # Equations are matched in the visible text so script code isn't picked up
+        html_formulas.extend(re.findall(r'([A-Z]\w*\s*=\s*[^<>\n]+)', html_to_text(html=content)))
         
         # Extract examples
         examples = re.findall(r'<strong>Example[^<]*:</strong>([^<]+)', content, re.IGNORECASE)
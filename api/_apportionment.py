@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Apportionment Engine (MAT 143 Chapter 13)
+Standard divisors, quotas and seat allocations for Hamilton's method and the
+divisor methods of Jefferson, Adams, Webster and Huntington-Hill.
+
+Quotas and rounding are computed on NumPy arrays, one pass per candidate
+divisor. The modified divisor is not guessed by trial and error. It is
+bisected between bounds that are known to bracket it. When ties make an
+exact divisor impossible, seats are handed out with a priority queue instead.
+Once an allocation is known, the exact range of modified divisors that
+produce it is computed in closed form. The "nice" divisor shown to students
+is the shortest round number inside that range.
+
+Every result carries a step-by-step table in the shape the course uses:
+state, population, standard quota, lower/upper quota, modified quota, seats.
+"""
+
+import heapq
+import math
+
+import numpy as np
+
+METHODS = ('hamilton', 'jefferson', 'adams', 'webster', 'huntington_hill')
+DIVISOR_METHODS = METHODS[1:]
+MAX_BISECTION_STEPS = 200
+
+ROUNDING_RULES = {
+    'jefferson': "round every modified quota down",
+    'adams': "round every modified quota up",
+    'webster': "round every modified quota to the nearest whole number",
+    'huntington_hill': "round up when the quota is at least the geometric mean √(n(n+1)) of its neighbours, else down"
+}
+
+
+# ---------------------------------------------------------------------------
+# Rounding rules, vectorized
+# ---------------------------------------------------------------------------
+
+def round_quotas(quotas, method):
+    """Seats each state gets for the given modified quotas."""
+    if method == 'jefferson':
+        return np.floor(quotas)
+    if method == 'adams':
+        return np.ceil(quotas)
+    if method == 'webster':
+        return np.floor(quotas + 0.5)
+    if method == 'huntington_hill':
+        lower = np.floor(quotas)
+        return np.where(quotas >= np.sqrt(lower * (lower + 1)), lower + 1, lower)
+    raise ValueError(f"Unknown divisor method: {method}")
+
+
+def thresholds(seats, method):
+    """Quota at which a state moves up to `seats` seats (0 means always)."""
+    seats = np.asarray(seats, dtype=float)
+    if method == 'jefferson':
+        return seats
+    if method == 'adams':
+        return np.maximum(seats - 1, 0)
+    if method == 'webster':
+        return np.maximum(seats - 0.5, 0)
+    if method == 'huntington_hill':
+        return np.sqrt(np.maximum(seats - 1, 0) * seats)
+    raise ValueError(f"Unknown divisor method: {method}")
+
+
+def _validate(populations, seats):
+    try:
+        populations = np.asarray(populations, dtype=float)
+    except (TypeError, ValueError):
+        raise ValueError("populations must be a non-empty list of numbers")
+    if populations.ndim != 1 or populations.size == 0:
+        raise ValueError("populations must be a non-empty list of numbers")
+    if not np.all(np.isfinite(populations)) or np.any(populations <= 0):
+        raise ValueError("every population must be a positive number")
+    if isinstance(seats, bool) or not isinstance(seats, (int, float, np.number)) or int(seats) != seats or seats < 1:
+        raise ValueError("seats must be a positive whole number")
+    return populations, int(seats)
+
+
+# ---------------------------------------------------------------------------
+# Methods
+# ---------------------------------------------------------------------------
+
+def hamilton(populations, seats):
+    """Lower quotas, then leftover seats by largest fractional part (ties: listed first)."""
+    populations, seats = _validate(populations, seats)
+    standard_divisor = populations.sum() / seats
+    quotas = populations / standard_divisor
+    allocation = np.floor(quotas)
+    leftover = seats - int(allocation.sum())
+    remainders = quotas - allocation
+    if leftover:
+        # Stable sort on -remainder keeps the earlier state first on ties
+        order = np.argsort(-remainders, kind='stable')
+        allocation[order[:leftover]] += 1
+    return allocation.astype(int), {"leftover_seats": leftover, "remainders": remainders}
+
+
+def _count(populations, divisor, method):
+    return int(round_quotas(populations / divisor, method).sum())
+
+
+def _bisect_divisor(populations, seats, method):
+    """(divisor, iterations) with exactly `seats` seats, or (None, iterations) when ties prevent it.
+
+    The total rounded seats never increase as the divisor grows, and each
+    rounded quota is within 1 of the exact quota. So
+    total / (seats + n) gives at least `seats` seats and
+    total / (seats - n) gives at most `seats` seats.
+    """
+    n = populations.size
+    total = populations.sum()
+    low = total / (seats + n)
+    high = total / (seats - n) if seats > n else 2 * populations.max()
+    for iteration in range(1, MAX_BISECTION_STEPS + 1):
+        middle = (low + high) / 2
+        count = _count(populations, middle, method)
+        if count == seats:
+            return middle, iteration
+        if count > seats:
+            low = middle
+        else:
+            high = middle
+        if high - low <= 1e-12 * high:
+            break
+    return None, iteration
+
+
+def _priority_queue(populations, seats, method):
+    """Highest-averages allocation: give each next seat to the state with the largest p / threshold."""
+    n = populations.size
+    start = 1 if method in ('adams', 'huntington_hill') else 0
+    allocation = [start] * n
+    heap = [(-populations[i] / thresholds(start + 1, method), i) for i in range(n)]
+    heapq.heapify(heap)
+    for _ in range(seats - start * n):
+        _, i = heapq.heappop(heap)
+        allocation[i] += 1
+        heapq.heappush(heap, (-populations[i] / thresholds(allocation[i] + 1, method), i))
+    return np.array(allocation, dtype=int)
+
+
+def upper_inclusive(method):
+    """Whether the divisor range of a method includes its upper end.
+
+    Rounding down or to the nearest gives a state `a` seats for
+    p/(a+1) < d <= p/a (or the Webster/Huntington-Hill analogue), so the
+    interval is (lowest, highest]. Rounding up (Adams) gives `a` seats for
+    p/a <= d < p/(a-1), so the interval is [lowest, highest).
+    """
+    return method != 'adams'
+
+
+def in_divisor_range(divisor, lowest, highest, method):
+    if upper_inclusive(method):
+        return lowest < divisor <= highest
+    return lowest <= divisor < highest
+
+
+def divisor_range(populations, allocation, method):
+    """(lowest, highest) modified divisor giving this allocation; see upper_inclusive() for which end is open."""
+    with np.errstate(divide='ignore'):
+        upper = populations / thresholds(allocation, method)  # p / 0 -> inf: no limit
+        lower = populations / thresholds(allocation + 1, method)
+    return float(lower.max()), float(upper.min())
+
+
+def nice_divisor(lowest, highest, method='jefferson'):
+    """The round number inside the method's divisor range with the fewest significant digits."""
+    if not math.isfinite(highest):
+        highest = lowest * 2
+    magnitude = 10 ** math.floor(math.log10(highest))
+    for _ in range(16):
+        steps = highest / magnitude
+        # Largest multiple of magnitude at or below highest, or strictly below it when highest is excluded
+        candidate = (math.floor(steps) if upper_inclusive(method) else math.ceil(steps) - 1) * magnitude
+        if in_divisor_range(round(candidate, 12), lowest, highest, method):
+            return round(candidate, 12)
+        magnitude /= 10
+    return (lowest + highest) / 2
+
+
+def divisor_method(populations, seats, method):
+    """Allocation for a divisor method, plus how the modified divisor was found."""
+    populations, seats = _validate(populations, seats)
+    if method in ('adams', 'huntington_hill') and seats < populations.size:
+        raise ValueError(f"{method} gives every state at least one seat, so it needs at least {populations.size} seats")
+
+    divisor, iterations = _bisect_divisor(populations, seats, method)
+    if divisor is not None:
+        allocation = round_quotas(populations / divisor, method).astype(int)
+        strategy = 'bisection'
+    else:
+        allocation = _priority_queue(populations, seats, method)
+        strategy = 'priority_queue'
+    lowest, highest = divisor_range(populations, allocation, method)
+    chosen = nice_divisor(lowest, highest, method) if lowest < highest else None
+    return allocation, {
+        "strategy": strategy,
+        "iterations": iterations,
+        "modified_divisor": chosen,
+        "divisor_range": [lowest, highest if math.isfinite(highest) else None],
+        "upper_inclusive": upper_inclusive(method),
+        "tie": lowest >= highest
+    }
+
+
+# ---------------------------------------------------------------------------
+# Step-by-step results
+# ---------------------------------------------------------------------------
+
+def apportion(populations, seats, method='hamilton', names=None):
+    """Full worked result for one method: divisors, table, steps and allocation."""
+    method = method.lower().replace('-', '_').replace(' ', '_')
+    if method not in METHODS:
+        raise ValueError(f"method must be one of: {', '.join(METHODS)}")
+    populations, seats = _validate(populations, seats)
+    names = list(names) if names is not None else [f"State {i + 1}" for i in range(populations.size)]
+    if len(names) != populations.size:
+        raise ValueError("names and populations must have the same length")
+
+    total = populations.sum()
+    standard_divisor = total / seats
+    quotas = populations / standard_divisor
+    lower_quotas = np.floor(quotas).astype(int)
+    steps = [
+        f"Total population = {total:,.0f}",
+        f"Standard divisor = total population ÷ seats = {total:,.0f} ÷ {seats} = {standard_divisor:,.4f}",
+        "Standard quota of each state = population ÷ standard divisor"
+    ]
+    table = {
+        "state": names,
+        "population": populations.tolist(),
+        "standard_quota": np.round(quotas, 4).tolist(),
+        "lower_quota": lower_quotas.tolist(),
+        "upper_quota": (lower_quotas + 1).tolist()
+    }
+    result = {"method": method, "seats": seats, "total_population": float(total),
+              "standard_divisor": float(standard_divisor)}
+
+    if method == 'hamilton':
+        allocation, details = hamilton(populations, seats)
+        leftover = details["leftover_seats"]
+        table["fractional_part"] = np.round(details["remainders"], 4).tolist()
+        steps.append(f"Give each state its lower quota: {int(lower_quotas.sum())} seats")
+        steps.append(f"{leftover} seat(s) left over go one each to the states with the largest fractional parts")
+    else:
+        allocation, details = divisor_method(populations, seats, method)
+        divisor = details["modified_divisor"]
+        result.update({key: details[key] for key in ("modified_divisor", "divisor_range", "upper_inclusive")})
+        result["search"] = {"strategy": details["strategy"], "iterations": details["iterations"]}
+        steps.append(f"Rule: {ROUNDING_RULES[method]}")
+        if divisor is not None:
+            modified = populations / divisor
+            table["modified_quota"] = np.round(modified, 4).tolist()
+            low, high = details["divisor_range"]
+            if high is None:
+                range_text = f"Any modified divisor above {low:,.4f} works"
+            elif upper_inclusive(method):
+                range_text = f"Any modified divisor above {low:,.4f} and up to {high:,.4f} works"
+            else:
+                range_text = f"Any modified divisor from {low:,.4f} up to, but not including, {high:,.4f} works"
+            steps.append(f"{range_text}; use d = {divisor:,.6g}")
+            steps.append(f"Modified quota of each state = population ÷ {divisor:,.6g}, then apply the rounding rule")
+        else:
+            steps.append("Tied quotas: no single divisor gives exactly the right total, so the tie was broken in list order")
+
+    table["seats"] = allocation.tolist()
+    steps.append(f"Check: the seats add up to {int(allocation.sum())} = {seats}")
+    result.update({
+        "table": table,
+        "steps": steps,
+        "allocation": dict(zip(names, allocation.tolist()))
+    })
+    return result
+
+
+def compare_methods(populations, seats, names=None, methods=METHODS):
+    """Run several methods on the same data; methods that can't apply report an error instead."""
+    _validate(populations, seats)
+    results = {}
+    for method in methods:
+        try:
+            results[method] = apportion(populations, seats, method, names)
+        except ValueError as e:
+            results[method] = {"method": method, "error": str(e)}
+    return results
+
+
+def table_rows(result):
+    """The column-oriented table of a result as a list of row dicts."""
+    table = result["table"]
+    columns = list(table)
+    return [dict(zip(columns, values)) for values in zip(*(table[column] for column in columns))]
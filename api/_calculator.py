@@ -0,0 +1,560 @@
+#!/usr/bin/env python3
+"""
+MAT 143 Calculation Engine
+Answers plain numeric questions locally with worked steps, so they never
+wait on a model call.
+
+Covers the formulas on the course formula sheets:
+- simple interest          I = Prt
+- compound interest        A = P(1 + r/n)^(nt), A = Pe^(rt)
+- annual percentage yield  APY = (1 + r/n)^n - 1
+- expected value           E(X) = Σ x·P(x)
+- z-scores                 z = (x - μ) / σ
+- descriptive statistics   mean, median, mode, s for pasted data; normal areas (see _statistics.py)
+- unit rates               rate = amount ÷ units
+- temperature              F = 9C/5 + 32, C = 5(F - 32)/9
+- voting methods           pasted ballots or preference tables (see _voting.py)
+
+solve() returns None unless every value the formula needs was found in the
+question. It also returns None when the question asks for one of the
+formula's inputs, such as a present value, a principal, or the score for a
+given z. The caller then asks the model as usual, so a wrong guess never
+replaces a real answer.
+"""
+
+import math
+import re
+import threading
+from html import escape
+
+from _statistics import solve_statistics as statistics_solution
+from _voting import METHODS as VOTING_METHODS, schedule_from_text
+
+NUMBER = r'-?\d[\d,]*(?:\.\d+)?|-?\.\d+'
+PROBABILITY = r'\d+/\d+|(?:\d*\.)?\d+\s*%?'
+
+COMPOUNDING = [
+    (r'semi-?annual(?:ly)?|twice a year', 2, 'semiannually'),
+    (r'annual(?:ly)?|yearly|once a year', 1, 'annually'),
+    (r'quarterly', 4, 'quarterly'),
+    (r'monthly', 12, 'monthly'),
+    (r'weekly', 52, 'weekly'),
+    (r'daily', 365, 'daily'),
+]
+
+# 'annual interest rate', 'annual rate of 6%' describe the rate, not how often it compounds
+ANNUAL_RATE = r'annual(?:ly)?\s+(?:(?:percentage|interest)\s+)?(?:rate|interest|yield)|per annum'
+
+VOTING_KEYWORDS = [
+    ('plurality', r'plurality(?!\s+with\s+elimination)'),
+    ('borda', r'borda'),
+    ('irv', r'elimination|instant[\s-]*runoff|\birv\b|runoff|ranked[\s-]choice'),
+    ('pairwise', r'pairwise|head[\s-]to[\s-]head|condorcet'),
+]
+
+# The question asks for an input of the formula, not for its result: leave it to the model
+INTEREST_UNKNOWNS = (r'present value|deposit(?:ed)? now|invest(?:ed)? now|put (?:away|aside) now'
+                     r'|how much (?:must|should|do|does|would|will|to) (?:\w+ )*?(?:invest|deposit|save|put|borrow)'
+                     r'|(?:find|what is|what\'s|determine|solve for) the (?:principal|interest rate|rate|time|number of years)'
+                     r'|what (?:principal|interest rate|rate|annual rate)|how (?:long|many years|many months)'
+                     r'|\bpayments?\b|installments?|amortiz|annuit|doubl|tripl'
+                     r'|(?:to have|grows? to|reach(?:es)?|becomes?|accumulates? to) \$?\s*\d'
+                     r'|interest (?:earned |paid |charged |owed )?(?:is|was|of|=|totals?|amounts? to) \$'
+                     # regular deposits are an annuity, not one lump sum
+                     r'|(?:deposit|contribut|save|saving|add|put|invest|pay)\w*\b[^.?!]*?\b(?:each|every|per|a) (?:month|year|week|quarter)\b'
+                     r'|(?:monthly|weekly|yearly|annual|quarterly) (?:deposit|contribution|saving|investment|payment)s?')
+Z_SCORE_UNKNOWNS = (r'(?:what|which|find the|find a) (?:raw |data |test )?(?:score|value|x\b|measurement)'
+                    r'|(?:has|with|have|corresponds? to|gives?) an? z[\s-]*score'
+                    r'|(?:within |\d\s*)standard deviations? (?:above|below|from|away|of)|percent|proportion|probability')
+
+UNIT_RATE_WORDS = ('unit rate', 'unit price', 'per ', 'better buy', 'better deal', 'cheaper', 'best buy')
+
+_lock = threading.Lock()
+_stats = {"solved": 0, "fell_through": 0, "by_kind": {}}
+
+
+class _Query:
+    """Question text plus the spans already consumed by earlier lookups."""
+
+    def __init__(self, text):
+        self.original = text
+        self.text = text.lower().replace('−', '-').replace('×', 'x')
+        self.used = []
+
+    def _free(self, start, end):
+        return all(end <= s or start >= e for s, e in self.used)
+
+    def take(self, pattern, group=1):
+        """First unconsumed match of pattern; marks it used and returns the group text."""
+        for match in re.finditer(pattern, self.text):
+            if self._free(match.start(group), match.end(group)):
+                self.used.append(match.span(group))
+                return match.group(group)
+        return None
+
+    def take_number(self, pattern, group=1):
+        value = self.take(pattern, group)
+        return None if value is None else _number(value)
+
+    def remaining_numbers(self):
+        return [_number(m.group()) for m in re.finditer(NUMBER, self.text) if self._free(*m.span())]
+
+
+def _number(text):
+    return float(text.replace(',', '').replace('$', '').strip())
+
+
+def _probability(text):
+    text = text.strip()
+    if '/' in text:
+        numerator, denominator = text.split('/')
+        return float(numerator) / float(denominator)
+    if text.endswith('%'):
+        return float(text[:-1]) / 100
+    return float(text)
+
+
+def fmt(value, places=4):
+    """Plain number, trailing zeros trimmed: 0.0500 -> 0.05, 300.0 -> 300."""
+    text = f"{value:,.{places}f}".rstrip('0').rstrip('.')
+    return '0' if text in ('-0', '') else text
+
+
+def money(value):
+    return f"-${abs(value):,.2f}" if value < 0 else f"${value:,.2f}"
+
+
+def percent(rate, places=4):
+    return f"{fmt(rate * 100, places)}%"
+
+
+# ---------------------------------------------------------------------------
+# Field extraction
+# ---------------------------------------------------------------------------
+
+def _rate(q):
+    if len(re.findall(rf'(?:{NUMBER})\s*(?:%|percent)', q.text)) > 1:
+        return None  # several rates (e.g. comparing accounts): leave it to the model
+    rate = q.take_number(rf'({NUMBER})\s*(?:%|percent)')
+    if rate is not None:
+        return rate / 100
+    rate = q.take_number(rf'\b(?:rate|r)\s*(?:of|is|=|:)?\s*({NUMBER})')
+    if rate is not None:
+        return rate / 100 if rate >= 1 else rate
+    return None
+
+
+def _years(q):
+    """Time in years from '3 years', '18 months', '3 years and 6 months', '90 days' or 't = 2'.
+
+    (None, None) when the question gives two separate times.
+    """
+    duration = rf'(?:{NUMBER})[\s-]*(?:years?|yrs?|months?|weeks?|days?)\b'
+    match = q.take(rf'({duration}(?:(?:\s*,\s*|\s+and\s+|\s+){duration})*)')
+    if match is not None:
+        start, end = q.used[-1]
+        if re.search(duration, q.text[:start] + ' ' + q.text[end:]):
+            return None, None
+        total = 0
+        for found in re.finditer(rf'({NUMBER})[\s-]*(\w+)', match):
+            unit = found.group(2)
+            total += _number(found.group(1)) / {'m': 12, 'w': 52, 'd': 365}.get(unit[0], 1)
+        return total, match
+    value = q.take_number(rf'\bt\s*=\s*({NUMBER})')
+    return (value, f"t = {fmt(value)}") if value is not None else (None, None)
+
+
+def _principal(q):
+    value = q.take_number(rf'(?:\bp\s*=|principal(?:\s+of)?|invest(?:s|ed|ing)?|deposit(?:s|ed)?|borrow(?:s|ed)?|loan of)\s*\$?\s*({NUMBER})')
+    if value is None:
+        value = q.take_number(rf'\$\s*({NUMBER})')
+    if value is None:
+        value = q.take_number(rf'({NUMBER})\s*dollars')
+    if value is None:
+        rest = [n for n in q.remaining_numbers() if n > 0]
+        value = rest[0] if len(rest) == 1 else None
+    return value
+
+
+def _compounding(q):
+    """(n, label); (None, 'continuously') for continuous compounding; (None, None) if not stated."""
+    if re.search(r'continuous(?:ly)?', q.text):
+        return None, 'continuously'
+    n = q.take_number(r'\bn\s*=\s*(\d+)')
+    if n is None:
+        n = q.take_number(r'(\d+)\s*times\s*(?:a|per|each)\s*year')
+    if n is not None:
+        return int(n), f"{int(n)} times a year"
+    # 'compounded monthly' / 'monthly compounding' says it outright
+    for pattern, periods, label in COMPOUNDING:
+        if re.search(rf'compound(?:ed|ing)\s+(?:{pattern})|(?:{pattern})\s+compounding', q.text):
+            return periods, label
+    text = re.sub(ANNUAL_RATE, ' ', q.text)
+    for pattern, periods, label in COMPOUNDING:
+        if re.search(pattern, text):
+            return periods, label
+    return None, None
+
+
+# ---------------------------------------------------------------------------
+# Solvers: each returns a solution dict or None
+# ---------------------------------------------------------------------------
+
+def solve_simple_interest(q):
+    if re.search(INTEREST_UNKNOWNS, q.text):
+        return None
+    rate = _rate(q)
+    years, time_text = _years(q)
+    principal = _principal(q)
+    if None in (rate, years, principal):
+        return None
+    interest = principal * rate * years
+    return {
+        "kind": "simple_interest",
+        "title": "Simple Interest",
+        "formula": "I = Prt",
+        "steps": [
+            f"Identify the values: P = {money(principal)}, r = {percent(rate)} = {fmt(rate)}, t = {fmt(years)} years",
+            f"Substitute into I = Prt: I = {fmt(principal)} × {fmt(rate)} × {fmt(years)}",
+            f"Multiply: I = {money(interest)}",
+            f"Total amount: A = P + I = {money(principal)} + {money(interest)} = {money(principal + interest)}"
+        ],
+        "answer": f"Interest earned: {money(interest)} (balance after {time_text}: {money(principal + interest)})",
+        "tip": "Always change the percent to a decimal and the time to years before multiplying."
+    }
+
+
+def solve_compound_interest(q):
+    if re.search(INTEREST_UNKNOWNS, q.text):
+        return None
+    n, label = _compounding(q)
+    rate = _rate(q)
+    years, time_text = _years(q)
+    principal = _principal(q)
+    if None in (rate, years, principal):
+        return None
+
+    steps = []
+    if label is None:
+        n, label = 1, 'annually'
+        steps.append("No compounding frequency was given, so assume annual compounding (n = 1)")
+
+    if label == 'continuously':
+        exponent = rate * years
+        amount = principal * math.exp(exponent)
+        steps += [
+            f"Identify the values: P = {money(principal)}, r = {fmt(rate)}, t = {fmt(years)} years, compounded continuously",
+            f"Exponent: rt = {fmt(rate)} × {fmt(years)} = {fmt(exponent)}",
+            f"Growth factor: e^{fmt(exponent)} = {fmt(math.exp(exponent), 6)}",
+            f"A = {fmt(principal)} × {fmt(math.exp(exponent), 6)} = {money(amount)}"
+        ]
+        formula = "A = Pe^(rt)"
+    else:
+        periodic = rate / n
+        periods = n * years
+        factor = (1 + periodic) ** periods
+        amount = principal * factor
+        steps += [
+            f"Identify the values: P = {money(principal)}, r = {fmt(rate)}, n = {n} ({label}), t = {fmt(years)} years",
+            f"Rate per period: r/n = {fmt(rate)} ÷ {n} = {fmt(periodic, 6)}",
+            f"Number of periods: nt = {n} × {fmt(years)} = {fmt(periods)}",
+            f"Growth factor: (1 + {fmt(periodic, 6)})^{fmt(periods)} = {fmt(factor, 6)}",
+            f"A = {fmt(principal)} × {fmt(factor, 6)} = {money(amount)}"
+        ]
+        formula = "A = P(1 + r/n)^(nt)"
+    steps.append(f"Interest earned: A - P = {money(amount)} - {money(principal)} = {money(amount - principal)}")
+    return {
+        "kind": "compound_interest",
+        "title": "Compound Interest",
+        "formula": formula,
+        "steps": steps,
+        "answer": f"Balance after {time_text}: {money(amount)} (interest earned: {money(amount - principal)})",
+        "tip": "Round only at the very end. Rounding the growth factor early can change the cents."
+    }
+
+
+def solve_apy(q):
+    n, label = _compounding(q)
+    rate = _rate(q)
+    if rate is None or label is None:
+        return None
+    if label == 'continuously':
+        apy = math.exp(rate) - 1
+        formula = "APY = e^r - 1"
+        steps = [
+            f"Identify the values: r = {fmt(rate)}, compounded continuously",
+            f"e^{fmt(rate)} = {fmt(math.exp(rate), 6)}",
+            f"APY = {fmt(math.exp(rate), 6)} - 1 = {fmt(apy, 6)}"
+        ]
+    else:
+        factor = (1 + rate / n) ** n
+        apy = factor - 1
+        formula = "APY = (1 + r/n)^n - 1"
+        steps = [
+            f"Identify the values: r = {fmt(rate)}, n = {n} ({label})",
+            f"1 + r/n = 1 + {fmt(rate)} ÷ {n} = {fmt(1 + rate / n, 6)}",
+            f"Raise to the n: ({fmt(1 + rate / n, 6)})^{n} = {fmt(factor, 6)}",
+            f"APY = {fmt(factor, 6)} - 1 = {fmt(apy, 6)}"
+        ]
+    steps.append(f"As a percent: {percent(apy, 2)}")
+    return {
+        "kind": "apy",
+        "title": "Annual Percentage Yield",
+        "formula": formula,
+        "steps": steps,
+        "answer": f"APY = {percent(apy, 2)} (compared with the {percent(rate)} stated rate)",
+        "tip": "APY is what you really earn in a year. Use it to compare accounts that compound differently."
+    }
+
+
+def _outcome_pairs(q):
+    """[(value, probability)] from 'values ... probabilities ...' lists or 'X with probability p' pairs."""
+    values = re.search(rf'(?:values?|outcomes?|payouts?|amounts?)\s*(?:are|of|=|:)?\s*((?:\$?(?:{NUMBER})(?:\s*,\s*|\s+and\s+|\s+)?)+)', q.text)
+    probabilities = re.search(rf'probabilit(?:y|ies)\s*(?:are|of|=|:)?\s*((?:(?:{PROBABILITY})(?:\s*,\s*|\s+and\s+|\s+)?)+)', q.text)
+    if values and probabilities:
+        xs = [_number(v) for v in re.findall(rf'\$?(?:{NUMBER})', values.group(1))]
+        ps = [_probability(p) for p in re.findall(PROBABILITY, probabilities.group(1))]
+        if len(xs) == len(ps) >= 2:
+            return list(zip(xs, ps))
+
+    pairs = []
+    pattern = (rf'(win|gain|earn|get|lose|pay|cost)?s?\s*\$?\s*({NUMBER})\s*(?:dollars\s*)?'
+               rf'(?:with (?:a )?(?:probability|chance)(?: of)?|\(\s*p\s*=)\s*({PROBABILITY})')
+    for match in re.finditer(pattern, q.text):
+        value = _number(match.group(2))
+        if match.group(1) in ('lose', 'pay', 'cost') and value > 0:
+            value = -value
+        pairs.append((value, _probability(match.group(3))))
+    return pairs if len(pairs) >= 2 else None
+
+
+def solve_expected_value(q):
+    pairs = _outcome_pairs(q)
+    if not pairs:
+        return None
+    total_probability = sum(p for _, p in pairs)
+    if total_probability > 1.0001:
+        return None
+    products = [x * p for x, p in pairs]
+    expected = sum(products)
+    steps = [
+        "List each outcome with its probability: " + ", ".join(f"x = {fmt(x)} (P = {fmt(p)})" for x, p in pairs),
+        "Multiply each outcome by its probability: " + ", ".join(f"{fmt(x)} × {fmt(p)} = {fmt(v)}" for (x, p), v in zip(pairs, products)),
+        f"Add the products: E(X) = {' + '.join(fmt(v) for v in products)} = {fmt(expected)}"
+    ]
+    if abs(total_probability - 1) > 0.0001:
+        steps.append(f"Note: these probabilities add up to {fmt(total_probability)}, not 1. Check whether an outcome is missing.")
+    return {
+        "kind": "expected_value",
+        "title": "Expected Value",
+        "formula": "E(X) = Σ x · P(x)",
+        "steps": steps,
+        "answer": f"E(X) = {fmt(expected)}",
+        "tip": "Expected value is the long-run average per try. It doesn't have to be one of the possible outcomes."
+    }
+
+
+def solve_z_score(q):
+    if re.search(Z_SCORE_UNKNOWNS, q.text):
+        return None
+    mean = q.take_number(rf'(?:mean|average|μ|x̄|\bmu)\s*(?:of|is|=|:)?\s*({NUMBER})')
+    sd = q.take_number(rf'(?:standard deviation|std\.?\s*dev\.?|\bsd|\bs\.d\.|σ|sigma|\bs\s*=)\s*(?:of|is|=|:)?\s*({NUMBER})')
+    x = q.take_number(rf'(?:\bx\s*=|data value(?: of)?|score(?: of| is)?|value(?: of)?|for)\s*({NUMBER})')
+    if x is None:
+        rest = q.remaining_numbers()
+        x = rest[0] if len(rest) == 1 else None
+    if None in (mean, sd, x) or sd <= 0:
+        return None
+    z = (x - mean) / sd
+    position = "above" if z > 0 else "below" if z < 0 else "exactly at"
+    answer = f"z = {fmt(z, 2)}: the value is {fmt(abs(z), 2)} standard deviations {position} the mean" if z else "z = 0: the value is exactly at the mean"
+    return {
+        "kind": "z_score",
+        "title": "Z-Score",
+        "formula": "z = (x - μ) / σ",
+        "steps": [
+            f"Identify the values: x = {fmt(x)}, mean = {fmt(mean)}, standard deviation = {fmt(sd)}",
+            f"Subtract the mean: {fmt(x)} - {fmt(mean)} = {fmt(x - mean)}",
+            f"Divide by the standard deviation: {fmt(x - mean)} ÷ {fmt(sd)} = {fmt(z, 4)}"
+        ],
+        "answer": answer,
+        "tip": "Positive z means above average and negative means below. Between -2 and 2 covers about 95% of normal data."
+    }
+
+
+def solve_statistics(q):
+    return statistics_solution(q.original)
+
+
+def _singular(unit):
+    return unit[:-1] if unit.endswith('s') and not unit.endswith('ss') else unit
+
+
+def _rates(q):
+    """[(amount, amount unit, count, count unit)] from '$4.50 for 12 ounces' / '12 oz for $4.50' / '300 miles in 5 hours'."""
+    rates = []
+    for match in re.finditer(rf'\$\s*({NUMBER})\s*(?:for|per|/)\s*(?:a\s+)?({NUMBER})\s*-?\s*([a-z]+)', q.text):
+        rates.append((_number(match.group(1)), '$', _number(match.group(2)), match.group(3)))
+    for match in re.finditer(rf'({NUMBER})\s*-?\s*([a-z]+)\s*(?:for|at)\s*\$\s*({NUMBER})', q.text):
+        rates.append((_number(match.group(3)), '$', _number(match.group(1)), match.group(2)))
+    if not rates:
+        for match in re.finditer(rf'({NUMBER})\s*([a-z]+)\s*(?:in|per|every|/)\s*({NUMBER})\s*([a-z]+)', q.text):
+            rates.append((_number(match.group(1)), match.group(2), _number(match.group(3)), match.group(4)))
+    return [rate for rate in rates if rate[2] > 0]
+
+
+def solve_unit_rate(q):
+    rates = _rates(q)
+    if not rates:
+        return None
+    steps = []
+    unit_rates = []
+    for amount, amount_unit, count, count_unit in rates:
+        unit = _singular(count_unit)
+        value = amount / count
+        unit_rates.append((value, amount_unit, unit))
+        if amount_unit == '$':
+            steps.append(f"{money(amount)} ÷ {fmt(count)} {count_unit} = {money(value) if value >= 0.1 else '$' + fmt(value)} per {unit}")
+        else:
+            steps.append(f"{fmt(amount)} {amount_unit} ÷ {fmt(count)} {count_unit} = {fmt(value)} {amount_unit} per {unit}")
+
+    def describe(value, amount_unit, unit):
+        return f"{money(value) if value >= 0.1 else '$' + fmt(value)} per {unit}" if amount_unit == '$' else f"{fmt(value)} {amount_unit} per {unit}"
+
+    if len(unit_rates) > 1 and all(r[1] == '$' for r in unit_rates) and len({r[2] for r in unit_rates}) == 1:
+        best = min(range(len(unit_rates)), key=lambda i: unit_rates[i][0])
+        amount, _, count, count_unit = rates[best]
+        steps.append(f"Compare: the lowest price per {unit_rates[best][2]} is the better buy")
+        answer = f"Better buy: {money(amount)} for {fmt(count)} {count_unit} ({describe(*unit_rates[best])})"
+    else:
+        answer = "; ".join(describe(*rate) for rate in unit_rates)
+    return {
+        "kind": "unit_rate",
+        "title": "Unit Rate",
+        "formula": "unit rate = total amount ÷ number of units",
+        "steps": steps,
+        "answer": answer,
+        "tip": "A unit rate has 1 in the denominator. When comparing prices, the lower price per unit is the better deal."
+    }
+
+
+def solve_temperature(q):
+    match = re.search(rf'({NUMBER})\s*(°|degrees?)?\s*(fahrenheit|celsius|f\b|c\b)', q.text)
+    if not match:
+        return None
+    unit = match.group(3)[0]
+    if match.group(2) is None and len(match.group(3)) == 1 and 'convert' not in q.text and ' to ' not in q.text:
+        return None
+    # Only F <-> C: 'to kelvin' or 'to celsius' from celsius is for the model
+    target = re.search(r'\b(?:to|into|in)\s+(?:degrees\s+)?(fahrenheit|celsius|kelvin|rankine|[fck]\b)', q.text[match.end():])
+    if 'kelvin' in q.text or (target and target.group(1)[0] != {'f': 'c', 'c': 'f'}[unit]):
+        return None
+    value = _number(match.group(1))
+    if unit == 'f':
+        celsius = 5 * (value - 32) / 9
+        return {
+            "kind": "temperature",
+            "title": "Temperature Conversion",
+            "formula": "C = 5(F - 32) / 9",
+            "steps": [
+                f"Start with F = {fmt(value)}",
+                f"Subtract 32: {fmt(value)} - 32 = {fmt(value - 32)}",
+                f"Multiply by 5: {fmt(value - 32)} × 5 = {fmt(5 * (value - 32))}",
+                f"Divide by 9: {fmt(5 * (value - 32))} ÷ 9 = {fmt(celsius, 2)}"
+            ],
+            "answer": f"{fmt(value)}°F = {fmt(celsius, 2)}°C",
+            "tip": "Check it: 32°F is freezing (0°C) and 212°F is boiling (100°C)."
+        }
+    fahrenheit = 9 * value / 5 + 32
+    return {
+        "kind": "temperature",
+        "title": "Temperature Conversion",
+        "formula": "F = (9C / 5) + 32",
+        "steps": [
+            f"Start with C = {fmt(value)}",
+            f"Multiply by 9: {fmt(value)} × 9 = {fmt(9 * value)}",
+            f"Divide by 5: {fmt(9 * value)} ÷ 5 = {fmt(9 * value / 5)}",
+            f"Add 32: {fmt(9 * value / 5)} + 32 = {fmt(fahrenheit, 2)}"
+        ],
+        "answer": f"{fmt(value)}°C = {fmt(fahrenheit, 2)}°F",
+        "tip": "Check it: 0°C is freezing (32°F) and 100°C is boiling (212°F)."
+    }
+
+
+def solve_voting(q):
+    schedule = schedule_from_text(q.original)
+    if schedule is None:
+        return None
+    methods = [method for method, pattern in VOTING_KEYWORDS if re.search(pattern, q.text)] or list(VOTING_METHODS)
+    results = [schedule.run(method) for method in methods]
+    steps = ["Preference schedule: " + "; ".join(f"{row['count']} × {' > '.join(row['ranking'])}" for row in schedule.table())]
+    for result in results:
+        steps.extend(f"{result['title']}: {step}" for step in result["steps"])
+    answer = "; ".join(f"{result['title']}: {' and '.join(result['winners'])}{'' if result['winner'] else ' (tie)'}"
+                       for result in results)
+    return {
+        "kind": "voting",
+        "title": results[0]["title"] if len(results) == 1 else "Voting Methods",
+        "formula": f"preference schedule of {schedule.voters} voters ({len(schedule.counts)} different rankings)",
+        "steps": steps,
+        "answer": answer,
+        "tip": "Different methods can choose different winners from the same ballots. Section 13.2 covers why."
+    }
+
+
+# (keyword pattern, solver), most specific first
+SOLVERS = [
+    (r'\bapy\b|annual percentage yield|effective (?:annual )?(?:rate|yield)', solve_apy),
+    (r'compound', solve_compound_interest),
+    (r'simple interest|\bi\s*=\s*prt', solve_simple_interest),
+    (r'expected value|\be\(x\)', solve_expected_value),
+    (r'\bz[\s-]*scores?\b|standard score|\bz\s*=|standard deviations? (?:above|below|from)', solve_z_score),
+    (r'\bmean\b|\baverage\b|median|\bmode\b|standard deviation|variance|\brange\b|normal|bell[\s-]*curve|percentile'
+     r'|\bz[\s-]*scores?\b|\bp\s*\(\s*z', solve_statistics),
+    (r'fahrenheit|celsius|°\s*[fc]\b|degrees?\s*[fc]\b|convert', solve_temperature),
+    (r'plurality|borda|runoff|elimination|\birv\b|pairwise|head[\s-]to[\s-]head|condorcet|ballot|voters?\b|preference (?:schedule|table)|election|who wins',
+     solve_voting),
+    (r'|'.join(re.escape(word) for word in UNIT_RATE_WORDS), solve_unit_rate),
+]
+
+
+def solve(query):
+    """Worked solution dict for a numeric question, or None to fall through to the model."""
+    for keywords, solver in SOLVERS:
+        if re.search(keywords, query.lower()):
+            try:
+                solution = solver(_Query(query))
+            except (ValueError, ZeroDivisionError, OverflowError):
+                solution = None
+            if solution is not None:
+                with _lock:
+                    _stats["solved"] += 1
+                    _stats["by_kind"][solution["kind"]] = _stats["by_kind"].get(solution["kind"], 0) + 1
+                return solution
+    with _lock:
+        _stats["fell_through"] += 1
+    return None
+
+
+def solution_html(query, solution):
+    """Render a solution the way the tutor endpoints format their HTML answers."""
+    steps = "".join(f"{number}. {escape(step)}<br>" for number, step in enumerate(solution["steps"], 1))
+    return f"""
+    <strong>Question: "{escape(query)}"</strong><br><br>
+
+    <strong>📐 {solution["title"]}:</strong> {escape(solution["formula"])}<br><br>
+
+    <strong>🧮 Step by step:</strong><br>
+    {steps}<br>
+
+    <div style="background-color: #e8f5e9; border-left: 4px solid #399d3c; padding: 12px; border-radius: 4px;">
+    <strong>✅ Answer:</strong> {escape(solution["answer"])}
+    </div><br>
+
+    <strong>💡 Tip:</strong> {escape(solution["tip"])}
+    """
+
+
+def calculator_stats():
+    with _lock:
+        return dict(_stats, by_kind=dict(_stats["by_kind"]))
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Shared Anthropic Client Pool
+Process-wide client registry reused across warm serverless invocations.
+
+Files in api/ that start with an underscore are not deployed as endpoints by
+Vercel, so this module is only ever imported by the tutor endpoints and the
+tutor_system CLIs.
+"""
+
+import hashlib
+import threading
+import time
+
+try:
+    import anthropic
+except ImportError:
+    anthropic = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# Connection pool settings for the shared HTTP client
+MAX_CONNECTIONS = 20
+MAX_KEEPALIVE_CONNECTIONS = 10
+KEEPALIVE_EXPIRY = 60.0  # seconds an idle connection stays open
+
+_clients = {}
+_lock = threading.Lock()
+_stats = {
+    "hits": 0,
+    "misses": 0,
+    "setup_seconds": 0.0,
+}
+
+
+def _pool_key(api_key):
+    """Key clients by a digest so raw API keys never sit in the registry."""
+    return hashlib.sha256(api_key.encode('utf-8')).hexdigest()
+
+
+def _build_client(api_key):
+    """Create a client whose HTTP connections are kept alive between calls."""
+    if httpx is None:
+        return anthropic.Anthropic(api_key=api_key)
+
+    http_client = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY
+        )
+    )
+    return anthropic.Anthropic(api_key=api_key, http_client=http_client)
+
+
+def get_client(api_key):
+    """Return the shared Anthropic client for this API key, creating it once."""
+    if anthropic is None:
+        raise RuntimeError("The anthropic package is not installed")
+
+    key = _pool_key(api_key)
+    with _lock:
+        client = _clients.get(key)
+        if client is not None:
+            _stats["hits"] += 1
+            return client
+
+        started = time.perf_counter()
+        client = _build_client(api_key)
+        _stats["setup_seconds"] += time.perf_counter() - started
+        _stats["misses"] += 1
+        _clients[key] = client
+        return client
+
+
+def pool_stats():
+    """Return hit/miss counters for the client pool."""
+    with _lock:
+        total = _stats["hits"] + _stats["misses"]
+        return {
+            "clients": len(_clients),
+            "hits": _stats["hits"],
+            "misses": _stats["misses"],
+            "hit_rate": round(_stats["hits"] / total, 4) if total else 0.0,
+            "setup_seconds": round(_stats["setup_seconds"], 6)
+        }
+
+
+def reset_pool():
+    """Close and drop all pooled clients (used when rotating API keys)."""
+    with _lock:
+        for client in _clients.values():
+            try:
+                client.close()
+            except Exception:
+                pass
+        _clients.clear()
+        _stats["hits"] = 0
+        _stats["misses"] = 0
+        _stats["setup_seconds"] = 0.0
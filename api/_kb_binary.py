@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Compact Binary Knowledge Base (.kbin)
+Memory-mapped, lazily decoded alternative to ai_knowledge_base_enhanced.json.
+
+json.load has to parse and build every object in the file before the first
+request can be served. A .kbin file is mapped instead, and only the dicts,
+lists and strings that are actually touched get decoded.
+
+Layout (little-endian):
+    header   MAGIC "KBIN" | version u32 | string_count u32 | strings_offset u64
+             | nodes_offset u64 | root u64 | source size u64 | source mtime_ns i64
+             | source sha256 (32 bytes, zero if unknown)
+    strings  (string_count + 1) u64 end offsets, then one UTF-8 blob (deduplicated)
+    nodes    child/root offsets are relative to nodes_offset; each node is a
+             tag byte followed by:
+               'd' dict   count u32, then count x (key string id u32, child offset u64)
+               'l' list   count u32, then count x child offset u64
+               's' string string id u32
+               'i' int    i64
+               'f' float  f64
+               't'/'F'    true / false
+               'n'        null
+
+The header records the size, mtime and hash of the JSON file the .kbin was
+built from, so a .kbin left behind after the JSON is regenerated or edited
+is detected instead of silently serving old content. The hash is only
+computed when the size or mtime differ (e.g. after a fresh checkout).
+"""
+
+import mmap
+import os
+import struct
+from collections.abc import Mapping, Sequence
+
+MAGIC = b'KBIN'
+VERSION = 2
+_HEADER = struct.Struct('<4sIIQQQQq32s')
+NO_SOURCE = bytes(32)
+_U32 = struct.Struct('<I')
+_U64 = struct.Struct('<Q')
+_I64 = struct.Struct('<q')
+_F64 = struct.Struct('<d')
+_DICT_ENTRY = struct.Struct('<IQ')
+
+
+# ---------------------------------------------------------------------------
+# Writer
+# ---------------------------------------------------------------------------
+
+class _Writer:
+    def __init__(self):
+        self.string_ids = {}
+        self.strings = []
+        self.nodes = bytearray()
+
+    def string_id(self, text):
+        sid = self.string_ids.get(text)
+        if sid is None:
+            sid = self.string_ids[text] = len(self.strings)
+            self.strings.append(text.encode('utf-8'))
+        return sid
+
+    def node(self, value):
+        """Append a node and return its offset within the node section."""
+        if isinstance(value, dict):
+            children = [(self.string_id(str(k)), self.node(v)) for k, v in value.items()]
+            offset = len(self.nodes)
+            self.nodes += b'd' + _U32.pack(len(children))
+            for sid, child in children:
+                self.nodes += _DICT_ENTRY.pack(sid, child)
+            return offset
+        if isinstance(value, (list, tuple)):
+            children = [self.node(v) for v in value]
+            offset = len(self.nodes)
+            self.nodes += b'l' + _U32.pack(len(children))
+            for child in children:
+                self.nodes += _U64.pack(child)
+            return offset
+
+        offset = len(self.nodes)
+        if isinstance(value, str):
+            self.nodes += b's' + _U32.pack(self.string_id(value))
+        elif value is True:
+            self.nodes += b't'
+        elif value is False:
+            self.nodes += b'F'
+        elif value is None:
+            self.nodes += b'n'
+        elif isinstance(value, int):
+            self.nodes += b'i' + _I64.pack(value)
+        elif isinstance(value, float):
+            self.nodes += b'f' + _F64.pack(value)
+        else:
+            raise TypeError(f"Cannot encode {type(value).__name__} in a knowledge base")
+        return offset
+
+
+def source_digest(path):
+    """SHA-256 of a file's bytes (the JSON a .kbin is built from)."""
+    import hashlib  # only needed when the stat check can't settle it; keeps cold start cheap
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).digest()
+
+
+def write_kb(data, path, source=None):
+    """Serialize a JSON-compatible knowledge base to a .kbin file.
+
+    source is the JSON file `data` was written to; its hash is stored so
+    open_kb can tell when the .kbin is out of date.
+    """
+    writer = _Writer()
+    root = writer.node(data)
+
+    string_ends = bytearray()
+    end = 0
+    for encoded in writer.strings:
+        end += len(encoded)
+        string_ends += _U64.pack(end)
+    string_section = _U64.pack(0) + bytes(string_ends) + b''.join(writer.strings)
+
+    strings_offset = _HEADER.size
+    nodes_offset = strings_offset + len(string_section)
+    if source:
+        stat = os.stat(source)
+        source_fields = (stat.st_size, stat.st_mtime_ns, source_digest(source))
+    else:
+        source_fields = (0, 0, NO_SOURCE)
+    header = _HEADER.pack(MAGIC, VERSION, len(writer.strings), strings_offset, nodes_offset, root, *source_fields)
+
+    with open(path, 'wb') as f:
+        f.write(header)
+        f.write(string_section)
+        f.write(writer.nodes)
+
+
+# ---------------------------------------------------------------------------
+# Lazy reader
+# ---------------------------------------------------------------------------
+
+class _KBFile:
+    """Mapped file plus a cache of decoded strings."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.buf) < _HEADER.size:
+            raise ValueError(f"{path} is not a version {VERSION} .kbin file")
+        (magic, version, count, strings_offset, nodes_offset, root,
+         self.source_size, self.source_mtime_ns, self.source_digest) = _HEADER.unpack_from(self.buf, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} .kbin file")
+        self.ends_offset = strings_offset
+        self.blob_offset = strings_offset + (count + 1) * 8
+        self.nodes_offset = nodes_offset
+        self.root_offset = nodes_offset + root
+        self.string_cache = {}
+
+    def built_from(self, source):
+        """True if `source` is unchanged since this file was written from it."""
+        if self.source_digest == NO_SOURCE:
+            return False
+        stat = os.stat(source)
+        if (stat.st_size, stat.st_mtime_ns) == (self.source_size, self.source_mtime_ns):
+            return True
+        return stat.st_size == self.source_size and source_digest(source) == self.source_digest
+
+    def _string_end(self, index):
+        return _U64.unpack_from(self.buf, self.ends_offset + index * 8)[0]
+
+    def string(self, sid):
+        text = self.string_cache.get(sid)
+        if text is None:
+            start = self.blob_offset + self._string_end(sid)
+            end = self.blob_offset + self._string_end(sid + 1)
+            text = self.string_cache[sid] = self.buf[start:end].decode('utf-8')
+        return text
+
+    def decode(self, offset):
+        """Decode the node at an absolute file offset."""
+        tag = self.buf[offset:offset + 1]
+        if tag == b's':
+            return self.string(_U32.unpack_from(self.buf, offset + 1)[0])
+        if tag == b'd':
+            return LazyDict(self, offset)
+        if tag == b'l':
+            return LazyList(self, offset)
+        if tag == b'i':
+            return _I64.unpack_from(self.buf, offset + 1)[0]
+        if tag == b'f':
+            return _F64.unpack_from(self.buf, offset + 1)[0]
+        if tag == b't':
+            return True
+        if tag == b'F':
+            return False
+        if tag == b'n':
+            return None
+        raise ValueError(f"Corrupt .kbin node at offset {offset}")
+
+
+class LazyDict(Mapping):
+    """Read-only dict view whose values are decoded on first access."""
+
+    def __init__(self, kb, offset):
+        self._kb = kb
+        self._count = _U32.unpack_from(kb.buf, offset + 1)[0]
+        self._entries_offset = offset + 5
+        self._index = None
+        self._values = {}
+
+    def _key_index(self):
+        """Decode the keys (not the values) on first lookup."""
+        if self._index is None:
+            self._index = {}
+            for i in range(self._count):
+                sid, child = _DICT_ENTRY.unpack_from(self._kb.buf, self._entries_offset + i * _DICT_ENTRY.size)
+                self._index[self._kb.string(sid)] = child
+        return self._index
+
+    def __getitem__(self, key):
+        if key in self._values:
+            return self._values[key]
+        child = self._key_index()[key]
+        value = self._values[key] = self._kb.decode(self._kb.nodes_offset + child)
+        return value
+
+    def __iter__(self):
+        return iter(self._key_index())
+
+    def __len__(self):
+        return self._count
+
+    def __repr__(self):
+        return f"LazyDict({len(self)} keys)"
+
+
+class LazyList(Sequence):
+    """Read-only list view whose items are decoded on first access."""
+
+    def __init__(self, kb, offset):
+        self._kb = kb
+        self._count = _U32.unpack_from(kb.buf, offset + 1)[0]
+        self._items_offset = offset + 5
+        self._values = {}
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("LazyList index out of range")
+        if index not in self._values:
+            child = _U64.unpack_from(self._kb.buf, self._items_offset + index * 8)[0]
+            self._values[index] = self._kb.decode(self._kb.nodes_offset + child)
+        return self._values[index]
+
+    def __len__(self):
+        return self._count
+
+    def __repr__(self):
+        return f"LazyList({len(self)} items)"
+
+
+def open_kb(path, source=None):
+    """Map a .kbin file and return its root (usually a LazyDict).
+
+    If source (the JSON the .kbin was built from) exists and no longer matches
+    the hash stored at build time, raises ValueError so the caller can load
+    the JSON instead.
+    """
+    kb = _KBFile(path)
+    if source is not None and os.path.exists(source) and not kb.built_from(source):
+        raise ValueError(f"{path} is out of date with {source}")
+    return kb.decode(kb.root_offset)
+
+
+def to_plain(value):
+    """Fully decode a lazy value into ordinary dicts and lists."""
+    if isinstance(value, Mapping):
+        return {key: to_plain(item) for key, item in value.items()}
+    if isinstance(value, Sequence) and not isinstance(value, str):
+        return [to_plain(item) for item in value]
+    return value
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Knowledge Base Inverted Index
+Term -> document postings with positions, ranked with BM25.
+
+Built once so EnhancedMathTutor.get_relevant_content no longer rescans and
+lowercases every formula, guide and assignment per request.
+
+scripts/enhance_ai_tutor.py stores the built index in the .kbin under
+INDEX_KEY. StoredKnowledgeIndex answers queries from that lazy copy, so a
+cold start decodes only the terms and documents a query touches instead of
+the whole knowledge base.
+"""
+
+import math
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Sequence
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+
+# BM25 tuning
+K1 = 1.2
+B = 0.75
+
+# Top-level .kbin key holding KnowledgeIndex.to_data() for the 'math' section
+INDEX_KEY = 'math_index'
+
+# Fields of a document entry
+KIND, GROUP, TEXT, LENGTH = range(4)
+
+
+def tokenize(text):
+    """Lowercase word tokens ('z-score' stays one token)."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _as_items(value):
+    """Knowledge base sections hold either a single string or a list of strings."""
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, Sequence):  # list, or LazyList from a .kbin file
+        return [item for item in value if isinstance(item, str)]
+    return []
+
+
+class KnowledgeIndex:
+    """Inverted index over knowledge base entries.
+
+    Each document is one formula, concept, study guide, schedule or
+    assignment, tagged with its kind and the section key it came from.
+    """
+
+    def __init__(self):
+        self.docs = []  # doc_id -> (kind, group, text, length)
+        self.postings = defaultdict(lambda: defaultdict(dict))  # term -> kind -> {doc_id: [positions]}
+        self.by_kind = defaultdict(list)  # kind -> [doc_id] in insertion order
+        self.by_group = defaultdict(lambda: defaultdict(list))  # kind -> group -> [doc_id]
+        self.total_length = {}  # kind -> total tokens
+        self.vocabulary = []
+        self._prefix_cache = {}
+
+    @classmethod
+    def from_math_knowledge(cls, knowledge):
+        """Index the 'math' section of the knowledge base."""
+        index = cls()
+        for kind, section in [
+            ('formula', 'formulas'),
+            ('concept', 'concepts'),
+            ('study_guide', 'study_guides'),
+            ('schedule', 'schedules'),
+            ('assignment', 'assignments')
+        ]:
+            for group, value in knowledge.get(section, {}).items():
+                for text in _as_items(value):
+                    index.add(kind, group, text)
+        index.finalize()
+        return index
+
+    def add(self, kind, group, text):
+        doc_id = len(self.docs)
+        tokens = tokenize(text)
+        self.docs.append((kind, group, text, len(tokens)))
+        self.by_kind[kind].append(doc_id)
+        self.by_group[kind][group].append(doc_id)
+        self.total_length[kind] = self.total_length.get(kind, 0) + len(tokens)
+        for position, token in enumerate(tokens):
+            self.postings[token][kind].setdefault(doc_id, []).append(position)
+        return doc_id
+
+    def finalize(self):
+        """Sort the vocabulary for prefix lookups."""
+        self.vocabulary = sorted(self.postings)
+        self._prefix_cache.clear()
+
+    def to_data(self):
+        """The index as plain lists and dicts, for write_kb.
+
+        Postings are a list parallel to the sorted vocabulary, each kind's
+        entry a flat [doc_id, term frequency, ...] list, so a lazily decoded
+        copy finds a term by bisection without decoding the rest.
+        """
+        return {
+            'docs': [list(doc) for doc in self.docs],
+            'vocabulary': self.vocabulary,
+            'postings': [
+                {kind: [n for doc_id, positions in docs.items() for n in (doc_id, len(positions))]
+                 for kind, docs in self.postings[term].items()}
+                for term in self.vocabulary
+            ],
+            'by_kind': dict(self.by_kind),
+            'by_group': {kind: dict(groups) for kind, groups in self.by_group.items()},
+            'total_length': self.total_length
+        }
+
+    def term_postings(self, term, kind):
+        """[(doc_id, term frequency)] for one term within one kind."""
+        docs = self.postings[term].get(kind, {}) if term in self.postings else {}
+        return [(doc_id, len(positions)) for doc_id, positions in docs.items()]
+
+    def expand(self, term):
+        """All indexed terms starting with `term` ('proportion' -> 'proportions')."""
+        cached = self._prefix_cache.get(term)
+        if cached is not None:
+            return cached
+        start = bisect_left(self.vocabulary, term)
+        matches = []
+        for vocab_term in self.vocabulary[start:]:
+            if not vocab_term.startswith(term):
+                break
+            matches.append(vocab_term)
+        self._prefix_cache[term] = matches
+        return matches
+
+    def group_texts(self, kind, group):
+        """Texts for one section key, in original order."""
+        return [self.docs[doc_id][TEXT] for doc_id in self.by_group.get(kind, {}).get(group, [])]
+
+    def kind_texts(self, kind):
+        return [self.docs[doc_id][TEXT] for doc_id in self.by_kind.get(kind, [])]
+
+    def search(self, query_terms, kind, limit=10):
+        """BM25-rank documents of one kind against the query terms.
+
+        Returns [(text, score)] best first. Ties keep insertion order.
+        """
+        doc_count = len(self.by_kind.get(kind, []))
+        if not doc_count:
+            return []
+        avg_length = (self.total_length.get(kind, 0) / doc_count) or 1.0
+
+        terms = set()
+        for query_term in query_terms:
+            for token in tokenize(query_term):
+                terms.update(self.expand(token))
+
+        scores = defaultdict(float)
+        for term in terms:
+            postings = self.term_postings(term, kind)
+            if not postings:
+                continue
+            idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings:
+                length_norm = K1 * (1 - B + B * self.docs[doc_id][LENGTH] / avg_length)
+                scores[doc_id] += idf * tf * (K1 + 1) / (tf + length_norm)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(self.docs[doc_id][TEXT], score) for doc_id, score in ranked[:limit]]
+
+
+class StoredKnowledgeIndex(KnowledgeIndex):
+    """A KnowledgeIndex read from to_data() output, usually a lazy .kbin copy.
+
+    Nothing is rebuilt; terms are found by bisecting the stored vocabulary,
+    so only the entries a query needs are ever decoded.
+    """
+
+    def __init__(self, data):
+        self.docs = data['docs']
+        self.postings = data['postings']
+        self.by_kind = data['by_kind']
+        self.by_group = data['by_group']
+        self.total_length = data['total_length']
+        self.vocabulary = data['vocabulary']
+        self._prefix_cache = {}
+
+    def term_postings(self, term, kind):
+        position = bisect_left(self.vocabulary, term)
+        if position == len(self.vocabulary) or self.vocabulary[position] != term:
+            return []
+        flat = self.postings[position].get(kind)
+        if not flat:
+            return []
+        flat = flat[:]
+        return list(zip(flat[0::2], flat[1::2]))
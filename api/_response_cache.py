@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Tutor Response Cache
+TTL + LRU cache for tutor answers keyed on normalized (query, chapter, topic).
+
+Two backends are available:
+- MemoryBackend: in-process dict, lives as long as a warm lambda
+- SQLiteBackend: local file in /tmp that survives cold starts on the same box
+
+Select one with TUTOR_CACHE_BACKEND=memory|sqlite (default: memory).
+"""
+
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+DEFAULT_TTL = int(os.getenv('TUTOR_CACHE_TTL', 24 * 60 * 60))
+DEFAULT_MAX_ENTRIES = int(os.getenv('TUTOR_CACHE_MAX_ENTRIES', 512))
+DEFAULT_SQLITE_PATH = os.getenv('TUTOR_CACHE_PATH', '/tmp/tutor_response_cache.sqlite3')
+
+# Filler words that don't change what a student is asking for
+STOPWORDS = {
+    'a', 'an', 'the', 'i', 'me', 'my', 'do', 'does', 'did', 'how', 'what',
+    'whats', 'is', 'are', 'to', 'of', 'for', 'in', 'on', 'can', 'you',
+    'please', 'help', 'with', 'explain', 'show', 'find', 'tell', 'about',
+    'formula', 'formulas', 'calculate', 'compute', 'solve', 'work', 'out'
+}
+
+
+def normalize_query(query):
+    """Lowercase, strip punctuation and filler words, keeping word order and repeats.
+
+    Order matters: "$2000 at 5% for 3 years" and "$3 at 5% for 2000 years"
+    contain the same words but are different questions. So do operators and
+    signs: "2+3" is not "2*3", and "x = -1.5" is not "x = 1.5".
+    """
+    words = re.findall(r"(?<![\w.)])-[0-9]+(?:\.[0-9]+)?|[a-z0-9]+(?:\.[0-9]+)?|[-+*/^=<>%×÷]", query.lower())
+    return " ".join(w for w in words if w not in STOPWORDS)
+
+
+def make_cache_key(query, chapter="", topic=""):
+    """Build a stable cache key from the normalized request fields."""
+    raw = "|".join([normalize_query(query), str(chapter).strip(), str(topic).strip().lower()])
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class MemoryBackend:
+    """In-process LRU store backed by an OrderedDict."""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        """Return (stored_at, value) and mark the entry as recently used."""
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def set(self, key, value, stored_at):
+        """Store a value and return how many entries were evicted."""
+        self.entries[key] = (stored_at, value)
+        self.entries.move_to_end(key)
+        evicted = 0
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            evicted += 1
+        return evicted
+
+    def delete(self, key):
+        self.entries.pop(key, None)
+
+    def clear(self):
+        self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class SQLiteBackend:
+    """File-backed LRU store that survives cold starts on the same host."""
+
+    def __init__(self, path=DEFAULT_SQLITE_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON responses (last_used)")
+        self.conn.commit()
+
+    def get(self, key):
+        row = self.conn.execute(
+            "SELECT stored_at, value FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        self.conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+        self.conn.commit()
+        return row[0], json.loads(row[1])
+
+    def set(self, key, value, stored_at):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO responses (key, value, stored_at, last_used) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value), stored_at, time.time())
+        )
+        overflow = len(self) - self.max_entries
+        if overflow > 0:
+            self.conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY last_used ASC LIMIT ?)",
+                (overflow,)
+            )
+        self.conn.commit()
+        return max(overflow, 0)
+
+    def delete(self, key):
+        self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+        self.conn.commit()
+
+    def clear(self):
+        self.conn.execute("DELETE FROM responses")
+        self.conn.commit()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+class ResponseCache:
+    """TTL + LRU cache in front of the tutor model calls."""
+
+    def __init__(self, backend=None, ttl=DEFAULT_TTL):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def get(self, query, chapter="", topic=""):
+        """Return a cached response dict, or None on miss/expiry."""
+        key = make_cache_key(query, chapter, topic)
+        with self.lock:
+            entry = self.backend.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+
+            stored_at, value = entry
+            if time.time() - stored_at > self.ttl:
+                self.backend.delete(key)
+                self.stats["expirations"] += 1
+                self.stats["misses"] += 1
+                return None
+
+            self.stats["hits"] += 1
+            return value
+
+    def set(self, query, chapter, topic, value):
+        """Store a successful response."""
+        key = make_cache_key(query, chapter, topic)
+        with self.lock:
+            self.stats["evictions"] += self.backend.set(key, value, time.time())
+
+    def clear(self):
+        with self.lock:
+            self.backend.clear()
+
+    def get_stats(self):
+        """Return hit/miss/eviction counters for tuning TTL and size."""
+        with self.lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                "backend": type(self.backend).__name__,
+                "entries": len(self.backend),
+                "ttl": self.ttl,
+                "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+                **self.stats
+            }
+
+
+def create_cache_from_env():
+    """Build the cache selected by TUTOR_CACHE_BACKEND."""
+    backend_name = os.getenv('TUTOR_CACHE_BACKEND', 'memory').lower()
+    if backend_name == 'sqlite':
+        try:
+            return ResponseCache(SQLiteBackend())
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not open SQLite cache, using memory: {e}")
+    return ResponseCache(MemoryBackend())
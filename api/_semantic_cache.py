@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Semantic Near-Duplicate Answer Cache
+MinHash + LSH index over previously answered tutor questions.
+
+Exact-key caching (see _response_cache.py) misses paraphrases such as
+"how do I do compound interest" vs "compound interest formula?". This cache
+shingles each question, builds a MinHash signature, and buckets signatures
+with locality-sensitive hashing so lookups only compare against a handful of
+candidates from the same chapter and topic. No network or model calls are needed.
+
+Numbers are not paraphrasable: "$1000 at 5%" and "$2000 at 5%" look alike
+but have different answers. A match therefore also needs exactly the same
+signed numbers, in the same order, as the stored question, the same negation
+words ("rolling a 6" vs "not rolling a 6"), and the same words either side of
+"to"/"than" ("fahrenheit to celsius" vs "celsius to fahrenheit").
+"""
+
+import os
+import re
+import hashlib
+import threading
+from collections import OrderedDict, defaultdict
+
+from _response_cache import STOPWORDS
+
+NUM_PERMUTATIONS = 64
+NUM_BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // NUM_BANDS
+DEFAULT_THRESHOLD = float(os.getenv('TUTOR_SEMANTIC_THRESHOLD', 0.6))
+DEFAULT_MAX_PER_CHAPTER = int(os.getenv('TUTOR_SEMANTIC_MAX_PER_CHAPTER', 1000))
+
+NEGATIONS = {'not', 'no', 'never', 'without', 'none', 'neither', 'nor', 'cannot'}
+PIVOTS = {'to', 'into', 'than'}
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def _permutation_params(count):
+    """Deterministic (a, b) pairs so signatures are stable across processes."""
+    params = []
+    for i in range(count):
+        digest = hashlib.blake2b(f"minhash-{i}".encode('utf-8'), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], 'little') % _MERSENNE_PRIME or 1
+        b = int.from_bytes(digest[8:], 'little') % _MERSENNE_PRIME
+        params.append((a, b))
+    return params
+
+
+_PERMUTATIONS = _permutation_params(NUM_PERMUTATIONS)
+
+
+def shingle(text):
+    """Word unigrams + bigrams and character trigrams of the meaningful words."""
+    words = [w for w in re.findall(r"[a-z0-9]+", text.lower()) if w not in STOPWORDS]
+    shingles = set(words)
+    shingles.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    for word in words:
+        padded = f"#{word}#"
+        shingles.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return shingles
+
+
+def numeric_tokens(text):
+    """The numbers in a question, in order and with their sign; a cached answer only fits the same numbers."""
+    return tuple(re.findall(r"(?<![\w.])-?\d+(?:\.\d+)?|\d+(?:\.\d+)?", text.replace(',', '')))
+
+
+def negation_words(text):
+    """The negations in a question, in order; "n't" counts as "not"."""
+    words = re.findall(r"[a-z]+(?:n't)?", text.lower().replace("\u2019", "'"))
+    return tuple('not' if w.endswith("n't") else w for w in words if w in NEGATIONS or w.endswith("n't"))
+
+
+def direction_words(text):
+    """The words right before and after each "to"/"than", so the direction of a conversion or comparison counts."""
+    words = [w for w in re.findall(r"[a-z]+|\d+", text.lower()) if w not in ('a', 'an', 'the')]
+    content = lambda w: w.isalpha() and w not in STOPWORDS and w not in PIVOTS
+    return tuple(
+        (before, after)
+        for before, word, after in zip(words, words[1:], words[2:])
+        if word in PIVOTS and content(before) and content(after)
+    )
+
+
+def match_key(text):
+    """What must be identical, not just similar, for a stored answer to fit a question."""
+    return numeric_tokens(text), negation_words(text), direction_words(text)
+
+
+def minhash_signature(shingles):
+    """Compute a MinHash signature for a set of shingles."""
+    if not shingles:
+        return None
+    hashed = [
+        int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest(), 'little')
+        for s in shingles
+    ]
+    return tuple(
+        min((a * h + b) % _MERSENNE_PRIME & _MAX_HASH for h in hashed)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def estimate_similarity(sig_a, sig_b):
+    """Fraction of matching MinHash slots, an estimate of Jaccard similarity."""
+    matches = sum(1 for x, y in zip(sig_a, sig_b) if x == y)
+    return matches / len(sig_a)
+
+
+def _band_keys(signature):
+    for band in range(NUM_BANDS):
+        start = band * ROWS_PER_BAND
+        yield band, signature[start:start + ROWS_PER_BAND]
+
+
+class _ChapterIndex:
+    """LSH buckets and stored answers for a single chapter."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # entry_id -> (signature, key, question, answer)
+        self.buckets = defaultdict(set)
+        self.next_id = 0
+
+    def add(self, signature, key, question, answer):
+        entry_id = self.next_id
+        self.next_id += 1
+        self.entries[entry_id] = (signature, key, question, answer)
+        for band_key in _band_keys(signature):
+            self.buckets[band_key].add(entry_id)
+
+        evicted = 0
+        while len(self.entries) > self.max_entries:
+            old_id, (old_sig, _, _, _) = self.entries.popitem(last=False)
+            for band_key in _band_keys(old_sig):
+                bucket = self.buckets.get(band_key)
+                if bucket is not None:
+                    bucket.discard(old_id)
+                    if not bucket:
+                        del self.buckets[band_key]
+            evicted += 1
+        return evicted
+
+    def best_match(self, signature, key):
+        candidates = set()
+        for band_key in _band_keys(signature):
+            candidates.update(self.buckets.get(band_key, ()))
+
+        best = None
+        best_score = 0.0
+        for entry_id in candidates:
+            stored_sig, stored_key, question, answer = self.entries[entry_id]
+            if stored_key != key:
+                continue
+            score = estimate_similarity(signature, stored_sig)
+            if score > best_score:
+                best, best_score = (question, answer), score
+        return best, best_score, len(candidates)
+
+
+def _index_key(chapter, topic):
+    chapter, topic = str(chapter), str(topic or '').strip().lower()
+    return f"{chapter}/{topic}" if topic else chapter
+
+
+class SemanticCache:
+    """Near-duplicate answer cache, bucketed by chapter and topic."""
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, max_per_chapter=DEFAULT_MAX_PER_CHAPTER):
+        self.threshold = threshold
+        self.max_per_chapter = max_per_chapter
+        self.chapters = {}
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "candidates_checked": 0}
+
+    def lookup(self, question, chapter, topic=''):
+        """Return (answer, matched_question, similarity) or None."""
+        signature = minhash_signature(shingle(question))
+        with self.lock:
+            index = self.chapters.get(_index_key(chapter, topic))
+            if signature is None or index is None:
+                self.stats["misses"] += 1
+                return None
+
+            match, score, checked = index.best_match(signature, match_key(question))
+            self.stats["candidates_checked"] += checked
+            if match is None or score < self.threshold:
+                self.stats["misses"] += 1
+                return None
+
+            self.stats["hits"] += 1
+            matched_question, answer = match
+            return answer, matched_question, score
+
+    def add(self, question, chapter, answer, topic=''):
+        """Index an answered question under its chapter and topic."""
+        signature = minhash_signature(shingle(question))
+        if signature is None:
+            return
+        key = _index_key(chapter, topic)
+        with self.lock:
+            index = self.chapters.get(key)
+            if index is None:
+                index = self.chapters[key] = _ChapterIndex(self.max_per_chapter)
+            self.stats["evictions"] += index.add(signature, match_key(question), question, answer)
+
+    def get_stats(self):
+        with self.lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                "threshold": self.threshold,
+                "entries": {chapter: len(index.entries) for chapter, index in self.chapters.items()},
+                "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+                **self.stats
+            }
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Single-Flight Request Coalescing
+Concurrent identical tutor questions share one upstream model call.
+
+When a whole class asks the same thing right after a lecture, the first
+request (the leader) calls the model and everyone who arrives while it is
+still running waits for that result instead of starting their own call.
+
+- do(): for JSON answers. Waiters get the leader's result, or its exception.
+- stream(): for streamed answers. A background thread drains the model
+  stream into a shared buffer. Every subscriber, including the leader,
+  replays the chunks already buffered and then follows the live stream.
+  A late joiner still gets the whole answer.
+
+Keys come from _response_cache.make_cache_key, so "identical" means the same
+normalized query, chapter and topic.
+"""
+
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _Stream:
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.chunks = []
+        self.finished = False
+        self.error = None
+
+    def publish(self, chunk):
+        with self.cond:
+            self.chunks.append(chunk)
+            self.cond.notify_all()
+
+    def finish(self, error=None):
+        with self.cond:
+            self.finished = True
+            self.error = error
+            self.cond.notify_all()
+
+    def subscribe(self):
+        """Yield every chunk from the start; re-raise the upstream error at the end."""
+        position = 0
+        while True:
+            with self.cond:
+                while position >= len(self.chunks) and not self.finished:
+                    self.cond.wait()
+                new_chunks = self.chunks[position:]
+                position = len(self.chunks)
+                finished, error = self.finished, self.error
+            yield from new_chunks
+            if finished:
+                if error is not None:
+                    raise error
+                return
+
+
+class SingleFlight:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.streams = {}
+        self.stats = {"calls": 0, "collapsed": 0, "streams": 0, "stream_collapsed": 0}
+
+    def do(self, key, fn):
+        """Return fn(), sharing one execution among concurrent callers with the same key."""
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = _Call()
+                self.stats["calls"] += 1
+            else:
+                self.stats["collapsed"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.done.set()
+        return call.result
+
+    def stream(self, key, start):
+        """Subscribe to the shared stream of start()'s chunks.
+
+        Returns (chunk iterator, is_leader). Only the leader's stream is
+        started; the leader is the one that should store the final answer.
+        """
+        with self.lock:
+            flight = self.streams.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.streams[key] = _Stream()
+                self.stats["streams"] += 1
+            else:
+                self.stats["stream_collapsed"] += 1
+
+        if leader:
+            threading.Thread(target=self._pump, args=(key, flight, start), daemon=True).start()
+        return flight.subscribe(), leader
+
+    def _pump(self, key, flight, start):
+        error = None
+        try:
+            for chunk in start():
+                flight.publish(chunk)
+        except Exception as e:
+            error = e
+        finally:
+            with self.lock:
+                self.streams.pop(key, None)
+            flight.finish(error)
+
+    def get_stats(self):
+        """Leader calls vs collapsed waiters, plus what's in flight right now."""
+        with self.lock:
+            requests = self.stats["calls"] + self.stats["collapsed"] + self.stats["streams"] + self.stats["stream_collapsed"]
+            collapsed = self.stats["collapsed"] + self.stats["stream_collapsed"]
+            return {
+                "in_flight": len(self.calls) + len(self.streams),
+                "collapse_rate": round(collapsed / requests, 4) if requests else 0.0,
+                **self.stats
+            }
@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+"""
+Statistics Engine (MAT 143 Chapter 11)
+Exact descriptive statistics and normal probabilities for datasets pasted
+into a question, without a model call.
+
+Datasets are read as a stream of NumPy chunks, so memory stays bounded even
+with millions of values:
+- RunningStats keeps count, mean, variance, min and max in one pass. It uses
+  Welford's update, and combines whole chunks with Chan's parallel formula.
+- QuantileSketch holds the values exactly up to STATS_EXACT_LIMIT, so small
+  class datasets get the textbook median. Past that limit it switches to a
+  compacting sketch that stores at most a few thousand values per level.
+- z_scores() standardizes a whole array at once.
+- normal_cdf() looks areas up in a standard normal table (z from -4 to 4 in
+  steps of 0.01) that is built once at import. It interpolates between
+  rows, so there are no per-call erf calls.
+"""
+
+import math
+import os
+import re
+
+import numpy as np
+
+EXACT_LIMIT = int(os.getenv('STATS_EXACT_LIMIT', 100_000))
+SKETCH_CAPACITY = int(os.getenv('STATS_SKETCH_CAPACITY', 2048))
+CHUNK_SIZE = 65_536
+CHUNK_CHARS = 1 << 20
+MIN_DATASET = 3
+LIST_VALUES_LIMIT = 30
+
+# Standard normal table: area to the left of each z
+NORMAL_Z = np.round(np.arange(-400, 401) / 100, 2)
+NORMAL_CDF = 0.5 * (1 + np.array([math.erf(z / math.sqrt(2)) for z in NORMAL_Z]))
+
+NUMBER = r'-?\d[\d,]*(?:\.\d+)?|-?\.\d+'
+DATA_NUMBER = r'(?<![\w.$-])\$?-?(?:\d+(?:\.\d+)?|\.\d+)(?![\d%A-Za-z])'
+DATA_SEPARATOR = r'[\s,;]+(?:and\s+)?'
+YEAR_RUN_CHARS = 200
+DATA_CUE = (r'(?:\bdata(?:\s*set)?|\bscores?|\bvalues?|\bnumbers?|\bobservations?|\bmeasurements?|\bsample|\blist)'
+            r'\s*(?:are|were|is|of)?\s*:?\s*$|:\s*$')
+DATASET = re.compile(rf'{DATA_NUMBER}(?:{DATA_SEPARATOR}{DATA_NUMBER}){{{MIN_DATASET - 1},}}')
+# "The average of 4 scores is 85 ... what is the fourth?" works back from a mean; it is not a dataset to describe
+GIVEN_AVERAGE = rf'(?:\bmean|\baverage)\b[^.?!]*?\b(?:is|was|be|=|equals?|needs? to be)\s+(?:{NUMBER})|\b(?:an?|the) (?:mean|average) of\s+(?:{NUMBER})\s*(?:[.?!]|$)'
+MISSING_VALUE = (r'\bwhat (?:is|was|must|should|would|does|do)\b[^.?!]*?\bthe (?:\w+th|third|second|last|other|missing)(?: (?:one|value|score|number|grade|test|exam|quiz))?\s*\?'
+                 r'|\bwhat (?:must|should|would)\b[^.?!]*?\bbe\s*\?'
+                 r'|\b(?:missing|needed|unknown) (?:value|score|number|grade|term)')
+
+MEAN = rf'(?:\bmean|\baverage|μ|\bmu\b)\s*(?:of|is|=|:)?\s*({NUMBER})'
+STANDARD_DEVIATION = rf'(?:standard deviation|std\.?\s*dev\.?|\bsd\b|\bs\.d\.|σ|\bsigma\b)\s*(?:of|is|=|:)?\s*({NUMBER})'
+BOUND_PREFIX = r'\s*(?:a |an )?(?:(?:score|value|height|weight) of\s*)?(?:z\s*=\s*|z of\s*)?'
+BETWEEN = rf'between{BOUND_PREFIX}({NUMBER})\s*(?:and|&|-|to)\s*(?:z\s*=\s*)?({NUMBER})'
+BELOW = (r'(?:below|under|at most|to the left of|(?:less|fewer|lower|shorter|lighter|younger|smaller|cheaper)\s+than|<=?|≤)'
+         rf'{BOUND_PREFIX}({NUMBER})')
+ABOVE = (r'(?:above|over|at least|exceeds?|to the right of|(?:greater|more|higher|taller|longer|heavier|older|larger|bigger)\s+than|>=?|≥)'
+         rf'{BOUND_PREFIX}({NUMBER})')
+PERCENTILE = r'(\d+(?:\.\d+)?)\s*(?:st|nd|rd|th)?\s+percentile'
+# "2 standard deviations above the mean" gives a z, not a raw bound; the area rules for that are left to the model
+SD_DISTANCE = r'(?:within |\d\s*)standard deviations? (?:above|below|from|away|of)'
+NORMAL_CUES = r'normal|bell[\s-]*curve|probability|percent|proportion|fraction|\bp\s*\(|\barea\b|\bz\b|percentile'
+
+
+# ---------------------------------------------------------------------------
+# Streaming accumulators
+# ---------------------------------------------------------------------------
+
+class RunningStats:
+    """One-pass count, mean, variance, min and max (Welford / Chan et al.)."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # sum of squared deviations from the running mean
+        self.min = math.inf
+        self.max = -math.inf
+        self.total = 0.0
+
+    def push(self, x):
+        """Add one value (Welford's update)."""
+        x = float(x)
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        self.total += x
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+
+    def update(self, values):
+        """Add a whole array: its own mean and M2 in NumPy, then one combine step."""
+        values = np.asarray(values, dtype=float).ravel()
+        if values.size == 0:
+            return self
+        batch_mean = values.mean()
+        batch_m2 = float(np.square(values - batch_mean).sum())
+        self._combine(values.size, batch_mean, batch_m2, float(values.min()), float(values.max()), float(values.sum()))
+        return self
+
+    def merge(self, other):
+        """Fold in another accumulator, e.g. one filled by a different worker."""
+        if other.count:
+            self._combine(other.count, other.mean, other.m2, other.min, other.max, other.total)
+        return self
+
+    def _combine(self, count, mean, m2, low, high, total):
+        combined = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / combined
+        self.m2 += m2 + delta * delta * self.count * count / combined
+        self.count = combined
+        self.min = min(self.min, low)
+        self.max = max(self.max, high)
+        self.total += total
+
+    @property
+    def variance(self):
+        """Sample variance s² (divides by n - 1)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        """Sample standard deviation s."""
+        return math.sqrt(self.variance)
+
+    @property
+    def population_variance(self):
+        return self.m2 / self.count if self.count else 0.0
+
+    @property
+    def population_std(self):
+        return math.sqrt(self.population_variance)
+
+
+class QuantileSketch:
+    """Median and quantiles in bounded memory.
+
+    Values are kept exactly until there are more than `exact_limit` of them.
+    After that they feed a stack of compactors. When a level holds
+    `capacity` values, it is sorted, and every other value (random offset)
+    moves up a level with twice the weight. Memory grows only with the
+    number of levels, which is log2(n / capacity).
+    """
+
+    def __init__(self, exact_limit=EXACT_LIMIT, capacity=SKETCH_CAPACITY, seed=0):
+        self.exact_limit = exact_limit
+        self.capacity = max(capacity, 2)
+        self.count = 0
+        self._exact = []
+        self._exact_size = 0
+        self._exact_sorted = False
+        self._levels = None
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def exact(self):
+        return self._levels is None
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        self.count += values.size
+        if self._levels is None:
+            self._exact.append(values)
+            self._exact_size += values.size
+            self._exact_sorted = False
+            if self._exact_size <= self.exact_limit:
+                return self
+            values = np.concatenate(self._exact)
+            self._exact = None
+            self._levels = []
+        self._compact(values)
+        return self
+
+    def _compact(self, values, level=0):
+        while values.size:
+            if level == len(self._levels):
+                self._levels.append(np.empty(0))
+            buffer = np.concatenate([self._levels[level], values])
+            if buffer.size < self.capacity:
+                self._levels[level] = buffer
+                return
+            buffer.sort()
+            if buffer.size % 2:
+                # An odd value out stays behind at this level
+                keep = int(self._rng.integers(buffer.size))
+                self._levels[level] = buffer[keep:keep + 1]
+                buffer = np.delete(buffer, keep)
+            else:
+                self._levels[level] = np.empty(0)
+            values = buffer[int(self._rng.integers(2))::2]
+            level += 1
+
+    def values(self):
+        """All values, sorted, while the sketch is still exact; otherwise None."""
+        if self._levels is not None:
+            return None
+        if not self._exact_sorted:
+            # concatenate copies, so chunks that are views of the caller's data are never sorted in place
+            self._exact = [np.sort(np.concatenate(self._exact)) if self._exact else np.empty(0)]
+            self._exact_sorted = True
+        return self._exact[0]
+
+    def quantile(self, q):
+        """q-th quantile (0..1): linear interpolation when exact, weighted rank when sketched."""
+        exact = self.values()
+        if exact is not None:
+            return float(np.quantile(exact, q)) if exact.size else math.nan
+        items = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(level.size, 2.0 ** h) for h, level in enumerate(self._levels)])
+        order = np.argsort(items, kind='stable')
+        cumulative = np.cumsum(weights[order])
+        rank = q * cumulative[-1]
+        return float(items[order][min(np.searchsorted(cumulative, rank), items.size - 1)])
+
+    def median(self):
+        return self.quantile(0.5)
+
+    def stored(self):
+        """How many values the sketch is holding right now."""
+        if self._levels is None:
+            return self._exact_size
+        return sum(level.size for level in self._levels)
+
+
+def z_scores(values, mean, std):
+    """z = (x - mean) / std for a whole array at once."""
+    if std <= 0:
+        raise ValueError("standard deviation must be positive")
+    return (np.asarray(values, dtype=float) - mean) / std
+
+
+def z_score_batches(chunks, mean, std):
+    """Standardize a stream of chunks without holding the whole dataset."""
+    for chunk in chunks:
+        yield z_scores(chunk, mean, std)
+
+
+# ---------------------------------------------------------------------------
+# Normal distribution
+# ---------------------------------------------------------------------------
+
+def normal_cdf(z):
+    """Area to the left of z under the standard normal curve (table lookup, interpolated)."""
+    return np.interp(z, NORMAL_Z, NORMAL_CDF)
+
+
+def normal_probability(low=None, high=None, mean=0.0, std=1.0):
+    """P(low < X < high) for X ~ N(mean, std); None means unbounded on that side."""
+    left = normal_cdf((low - mean) / std) if low is not None else 0.0
+    right = normal_cdf((high - mean) / std) if high is not None else 1.0
+    return float(right - left)
+
+
+def z_for_area(area):
+    """z with the given area to its left (inverse table lookup)."""
+    if not 0 < area < 1:
+        raise ValueError("area must be between 0 and 1")
+    return float(np.interp(area, NORMAL_CDF, NORMAL_Z))
+
+
+# ---------------------------------------------------------------------------
+# Datasets
+# ---------------------------------------------------------------------------
+
+def describe_stream(chunks, exact_limit=EXACT_LIMIT):
+    """Summary of a dataset given as an iterable of arrays, in bounded memory."""
+    stats = RunningStats()
+    sketch = QuantileSketch(exact_limit=exact_limit)
+    for chunk in chunks:
+        stats.update(chunk)
+        sketch.update(chunk)
+    if stats.count == 0:
+        raise ValueError("the dataset is empty")
+
+    mode = None
+    values = sketch.values()
+    if values is not None:
+        unique, counts = np.unique(values, return_counts=True)
+        if counts.max() > 1:
+            mode = unique[counts == counts.max()].tolist()
+    return {
+        "count": stats.count,
+        "sum": stats.total,
+        "mean": stats.mean,
+        "median": sketch.median(),
+        "mode": mode,
+        "min": stats.min,
+        "max": stats.max,
+        "range": stats.max - stats.min,
+        "squared_deviations": stats.m2,
+        "variance": stats.variance,
+        "std": stats.std,
+        "population_std": stats.population_std,
+        "exact": sketch.exact,
+        "values": values if values is not None and values.size <= LIST_VALUES_LIMIT else None
+    }
+
+
+def describe(values):
+    """Summary of an in-memory array, fed through the same streaming path."""
+    values = np.asarray(values, dtype=float).ravel()
+    return describe_stream(values[i:i + CHUNK_SIZE] for i in range(0, values.size, CHUNK_SIZE))
+
+
+def _looks_like_years(match):
+    """A short run of whole numbers between 1800 and 2199, like "2020, 2021, and 2022"."""
+    if match.end() - match.start() > YEAR_RUN_CHARS:
+        return False
+    numbers = re.findall(DATA_NUMBER, match.group())
+    return all(re.fullmatch(r'1[89]\d\d|2[01]\d\d', number) for number in numbers)
+
+
+def _follows_data_cue(text, match):
+    return re.search(DATA_CUE, text[max(0, match.start() - 40):match.start()].lower()) is not None
+
+
+def find_dataset(text):
+    """The dataset in the text, as a regex match of at least MIN_DATASET numbers, or None.
+
+    Runs that look like years are skipped. If more than one run is left,
+    the one right after a data cue ("data", "scores", "values", ":") is the
+    dataset. When no run has a cue, or several do, the question is
+    ambiguous and the result is None.
+    """
+    runs = [match for match in DATASET.finditer(text) if not _looks_like_years(match)]
+    if len(runs) > 1:
+        runs = [match for match in runs if _follows_data_cue(text, match)]
+    return runs[0] if len(runs) == 1 else None
+
+
+def dataset_chunks(text, match, chunk_chars=CHUNK_CHARS):
+    """Numbers of a dataset match as float arrays, parsed about chunk_chars of text at a time."""
+    start, end = match.span()
+    while start < end:
+        stop = end
+        if start + chunk_chars < end:
+            # Cut after a separator so no number is split across two chunks
+            stop = max(text.rfind(mark, start, start + chunk_chars) for mark in ' ,;\n\t') + 1
+            if stop <= start:
+                stop = end
+        piece = text[start:stop]
+        for mark in (',', ';', '$', 'and'):
+            piece = piece.replace(mark, ' ')
+        yield np.array(piece.split(), dtype=float)
+        start = stop
+
+
+# ---------------------------------------------------------------------------
+# Worked solutions (same shape as _calculator.py solutions)
+# ---------------------------------------------------------------------------
+
+def _fmt(value, places=4):
+    text = f"{value:,.{places}f}".rstrip('0').rstrip('.')
+    return '0' if text in ('-0', '') else text
+
+
+def _number(text):
+    return float(text.replace(',', ''))
+
+
+def _take(pattern, text):
+    match = re.search(pattern, text)
+    return _number(match.group(1)) if match else None
+
+
+def solve_normal(question):
+    """Normal-curve area or percentile question, or None."""
+    text = question.lower().replace('−', '-')
+    if not re.search(NORMAL_CUES, text) or re.search(SD_DISTANCE, text):
+        return None
+    mean = _take(MEAN, text)
+    std = _take(STANDARD_DEVIATION, text)
+    if mean is None or std is None:
+        if not re.search(r'\bz\b|standard normal', text):
+            return None
+        mean, std = 0.0, 1.0
+    if std <= 0:
+        return None
+    standard = (mean, std) == (0.0, 1.0)
+    variable = "z" if standard else "X"
+    steps = [] if standard else [f"Identify the values: mean μ = {_fmt(mean)}, standard deviation σ = {_fmt(std)}"]
+
+    def standardize(x):
+        z = (x - mean) / std
+        if not standard:
+            steps.append(f"Standardize {_fmt(x)}: z = ({_fmt(x)} - {_fmt(mean)}) ÷ {_fmt(std)} = {_fmt(z, 2)}")
+        area = float(normal_cdf(z))
+        steps.append(f"Normal table: area to the left of z = {_fmt(z, 2)} is {area:.4f}")
+        return area
+
+    percentile = re.search(PERCENTILE, text)
+    between = re.search(BETWEEN, text)
+    below = re.search(BELOW, text)
+    above = re.search(ABOVE, text)
+    if percentile:
+        area = float(percentile.group(1)) / 100
+        z = z_for_area(area)
+        x = mean + z * std
+        name = percentile.group(0)
+        steps.append(f"The {name} has {area:.4f} of the area to its left")
+        steps.append(f"Normal table in reverse: z = {_fmt(z, 2)}")
+        if not standard:
+            steps.append(f"Convert back: x = μ + zσ = {_fmt(mean)} + {_fmt(z, 2)} × {_fmt(std)} = {_fmt(x, 2)}")
+        return _normal_solution(steps, f"The {name} is {variable} ≈ {_fmt(x, 2)}",
+                                "x = μ + zσ")
+    if between:
+        low, high = sorted((_number(between.group(1)), _number(between.group(2))))
+        right, left = standardize(high), standardize(low)
+        probability = normal_probability(low, high, mean, std)
+        steps.append(f"Area between = {right:.4f} - {left:.4f} = {probability:.4f}")
+        event = f"{_fmt(low)} < {variable} < {_fmt(high)}"
+    elif below and above:
+        # Two bounds: 'at least 70 and less than 90' is an interval, 'above 130 or below 70' two tails
+        low, high = _number(above.group(1)), _number(below.group(1))
+        joined = text[min(below.end(), above.end()):max(below.start(), above.start())]
+        if re.search(r'\bor\b', joined) and high < low:
+            left_tail = standardize(high)
+            right_tail = 1 - standardize(low)
+            probability = left_tail + right_tail
+            steps.append(f"Area in both tails = {left_tail:.4f} + (1 - {1 - right_tail:.4f}) = {probability:.4f}")
+            event = f"{variable} < {_fmt(high)} or {variable} > {_fmt(low)}"
+        elif re.search(r'\b(?:and|but)\b', joined) and low < high:
+            right, left = standardize(high), standardize(low)
+            probability = right - left
+            steps.append(f"Area between = {right:.4f} - {left:.4f} = {probability:.4f}")
+            event = f"{_fmt(low)} < {variable} < {_fmt(high)}"
+        else:
+            return None
+    elif below:
+        bound = _number(below.group(1))
+        probability = standardize(bound)
+        event = f"{variable} < {_fmt(bound)}"
+    elif above:
+        bound = _number(above.group(1))
+        left = standardize(bound)
+        probability = 1 - left
+        steps.append(f"Area to the right = 1 - {left:.4f} = {probability:.4f}")
+        event = f"{variable} > {_fmt(bound)}"
+    else:
+        return None
+    return _normal_solution(steps, f"P({event}) ≈ {probability:.4f}, about {_fmt(probability * 100, 2)}%",
+                            "z = (x - μ) / σ, then the area under the normal curve")
+
+
+def _normal_solution(steps, answer, formula):
+    return {
+        "kind": "normal",
+        "title": "Normal Distribution",
+        "formula": formula,
+        "steps": steps,
+        "answer": answer,
+        "tip": "Sketch the bell curve and shade the area you want. The table always gives the area to the LEFT of z."
+    }
+
+
+def solve_dataset(question):
+    """Descriptive statistics for a dataset pasted into the question, or None."""
+    if re.search(GIVEN_AVERAGE, question, re.IGNORECASE) or re.search(MISSING_VALUE, question, re.IGNORECASE):
+        return None
+    match = find_dataset(question)
+    if match is None:
+        return None
+    summary = describe_stream(dataset_chunks(question, match))
+    n = summary["count"]
+    values = summary["values"]
+    steps = [f"Data, sorted (n = {n}): " + ", ".join(_fmt(v) for v in values) if values is not None
+             else f"n = {n:,} values, read in one streaming pass"]
+    steps.append(f"Mean: x̄ = Σx ÷ n = {_fmt(summary['sum'])} ÷ {n:,} = {_fmt(summary['mean'])}")
+    if summary["exact"]:
+        if n % 2:
+            steps.append(f"Median: the middle value (position {(n + 1) // 2}) = {_fmt(summary['median'])}")
+        elif values is not None:
+            steps.append(f"Median: average of the two middle values {_fmt(values[n // 2 - 1])} and {_fmt(values[n // 2])} = {_fmt(summary['median'])}")
+        else:
+            steps.append(f"Median: average of the two middle values = {_fmt(summary['median'])}")
+        mode = summary["mode"]
+        steps.append(f"Mode: {', '.join(_fmt(v) for v in mode)}" if mode else "Mode: none (no value repeats)")
+    else:
+        steps.append(f"Median ≈ {_fmt(summary['median'])} (estimated from a bounded-memory sketch of the sorted data)")
+    steps.append(f"Range: max - min = {_fmt(summary['max'])} - {_fmt(summary['min'])} = {_fmt(summary['range'])}")
+    if n > 1:
+        steps.append(f"Sum of squared deviations: Σ(x - x̄)² = {_fmt(summary['squared_deviations'])}")
+        steps.append(f"Sample variance: s² = {_fmt(summary['squared_deviations'])} ÷ ({n:,} - 1) = {_fmt(summary['variance'])}")
+        steps.append(f"Sample standard deviation: s = √{_fmt(summary['variance'])} = {_fmt(summary['std'])}")
+        steps.append(f"(Population standard deviation: σ = √(Σ(x - μ)² ÷ n) = {_fmt(summary['population_std'])})")
+        if values is not None and summary["std"] > 0 and re.search(r'z[\s-]*scores?|standard scores?', question.lower()):
+            z = z_scores(values, summary["mean"], summary["std"])
+            steps.append("z-scores (x - x̄) ÷ s: " + ", ".join(f"{_fmt(v)} → {_fmt(s, 2)}" for v, s in zip(values, z)))
+
+    population = re.search(r'\bpopulation\b', question.lower())
+    spread = (f"σ = {_fmt(summary['population_std'])}" if population
+              else f"s = {_fmt(summary['std'])}") if n > 1 else "no spread (one value)"
+    median = ("median = " if summary["exact"] else "median ≈ ") + _fmt(summary["median"])
+    return {
+        "kind": "statistics",
+        "title": "Descriptive Statistics",
+        "formula": "x̄ = Σx ÷ n,  s = √(Σ(x - x̄)² ÷ (n - 1))",
+        "steps": steps,
+        "answer": f"mean = {_fmt(summary['mean'])}, {median}, {spread}",
+        "tip": "Mean gets pulled by outliers, median stays stable. Compare them to see if the data is skewed."
+    }
+
+
+def solve_statistics(question):
+    """Worked Chapter 11 solution for a question with its own numbers, or None."""
+    try:
+        return solve_normal(question) or solve_dataset(question)
+    except (ValueError, ZeroDivisionError, OverflowError):
+        return None
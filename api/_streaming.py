@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Server-Sent Events Streaming Helpers
+Forward model tokens to the browser as they arrive instead of waiting for the
+full completion.
+
+Event stream format:
+- event: token   data: {"text": "..."}          one per model text delta
+- event: done    data: {full response object}   final answer, same shape as JSON mode
+- event: error   data: {"error": true, ...}     stream broke after tokens were sent
+
+If the model call fails before the first token, the caller's fallback
+response is sent as the "done" event so the page renders the usual help HTML.
+"""
+
+import json
+import time
+import threading
+from collections import deque
+from datetime import datetime
+
+MODEL = "claude-3-sonnet-20240229"
+
+_lock = threading.Lock()
+_recent_first_token_ms = deque(maxlen=500)
+_stats = {"streams": 0, "completed": 0, "fallbacks": 0, "errors": 0}
+
+
+def wants_stream(body, accept_header=""):
+    """True when the client asked for a streamed response."""
+    return bool(body.get('stream')) or 'text/event-stream' in (accept_header or '')
+
+
+def sse_event(event, data):
+    """Encode one SSE event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode('utf-8')
+
+
+def stream_model_text(client, prompt, max_tokens=1000):
+    """Yield text deltas from a streamed messages.create call."""
+    events = client.messages.create(
+        model=MODEL,
+        max_tokens=max_tokens,
+        messages=[{"role": "user", "content": prompt}],
+        stream=True
+    )
+    for event in events:
+        if event.type == 'content_block_delta':
+            text = getattr(event.delta, 'text', None)
+            if text:
+                yield text
+
+
+def sse_response(chunks, fallback, metadata, on_complete=None):
+    """Turn text chunks into SSE events, recording time to first token.
+
+    chunks: iterator of text deltas (may raise at any point)
+    fallback: response dict to send if nothing has been streamed yet
+    metadata: extra fields merged into the final "done" payload
+    on_complete: called with the final payload after a successful stream
+    """
+    with _lock:
+        _stats["streams"] += 1
+
+    started = time.perf_counter()
+    first_token_ms = None
+    parts = []
+    try:
+        for text in chunks:
+            if first_token_ms is None:
+                first_token_ms = (time.perf_counter() - started) * 1000
+                with _lock:
+                    _recent_first_token_ms.append(first_token_ms)
+            parts.append(text)
+            yield sse_event('token', {"text": text})
+    except Exception as e:
+        if first_token_ms is None:
+            with _lock:
+                _stats["fallbacks"] += 1
+            yield sse_event('done', fallback)
+        else:
+            with _lock:
+                _stats["errors"] += 1
+            yield sse_event('error', {
+                "error": True,
+                "message": f"AI service error: {str(e)}",
+                "timestamp": datetime.now().isoformat()
+            })
+        return
+
+    payload = {
+        "error": False,
+        "response": "".join(parts),
+        "timestamp": datetime.now().isoformat(),
+        "first_token_ms": round(first_token_ms or 0.0, 1),
+        **metadata
+    }
+    with _lock:
+        _stats["completed"] += 1
+    if on_complete is not None:
+        on_complete(payload)
+    yield sse_event('done', payload)
+
+
+def stream_stats():
+    """Return stream counters and time-to-first-token percentiles."""
+    with _lock:
+        samples = sorted(_recent_first_token_ms)
+        stats = dict(_stats)
+
+    def percentile(p):
+        if not samples:
+            return None
+        return round(samples[min(len(samples) - 1, int(p * len(samples)))], 1)
+
+    stats["first_token_ms"] = {"p50": percentile(0.5), "p95": percentile(0.95), "samples": len(samples)}
+    return stats
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Voting Methods Engine (MAT 143 Chapter 13)
+Plurality, Borda count, plurality with elimination (instant runoff) and
+pairwise comparison, computed from a preference schedule.
+
+Raw ballots are compressed once into a preference schedule: each unique
+ranking and how many voters cast it. Every method then works on the
+schedule, so the cost depends on the number of unique rankings rather than
+the number of ballots. A million ballots over four candidates is at most 64
+rankings. Ballot arrays are compressed with NumPy by packing each row into a
+single integer and running np.unique on the result.
+
+Rankings may be partial. Unranked candidates score no Borda points, lose
+head-to-head to every candidate the voter did rank, and a ballot whose
+candidates have all been eliminated is exhausted.
+"""
+
+import re
+from collections import Counter
+
+import numpy as np
+
+METHODS = ('plurality', 'borda', 'irv', 'pairwise')
+
+METHOD_NAMES = {
+    'plurality': "Plurality",
+    'borda': "Borda Count",
+    'irv': "Plurality with Elimination",
+    'pairwise': "Pairwise Comparison"
+}
+
+_SEPARATOR = re.compile(r'\s*(?:>|,|;|→)\s*')
+_COUNT_FIRST = re.compile(r'^\s*(\d+)\s*(?:x|×|voters?|ballots?|people|votes?)?\s*[:\-=]?\s*(.+?)\s*$', re.IGNORECASE)
+_COUNT_LAST = re.compile(r'^\s*(.+?)\s*[:\-=(]\s*(\d+)\s*(?:x|voters?|ballots?|people|votes?)?\s*\)?\s*$', re.IGNORECASE)
+# 'ABC 5': the count follows the ranking after plain whitespace
+_COUNT_TRAILING = re.compile(r'^\s*(.+?)\s+(\d+)\s*(?:x|voters?|ballots?|people|votes?)?\s*$', re.IGNORECASE)
+_NUMBERED_NAME = re.compile(r'\s\d+$')
+_COMPACT = re.compile(r'^[A-Z]{2,}$')
+
+
+class PreferenceSchedule:
+    """Unique rankings with voter counts.
+
+    candidates  candidate names; a ranking refers to them by index
+    rankings    int array (unique rankings x number of candidates), most preferred first,
+                padded with -1 when a ballot ranks fewer candidates
+    counts      int64 array of voters per ranking
+    """
+
+    def __init__(self, candidates, rankings, counts):
+        self.candidates = list(candidates)
+        self.rankings = np.asarray(rankings, dtype=np.int64).reshape(len(counts), len(self.candidates))
+        self.counts = np.asarray(counts, dtype=np.int64)
+        n = len(self.candidates)
+        # positions[u, c]: place of candidate c on ranking u (n when unranked)
+        self.positions = np.full((len(self.counts), n), n, dtype=np.int64)
+        rows, places = np.nonzero(self.rankings >= 0)
+        self.positions[rows, self.rankings[rows, places]] = places
+
+    @classmethod
+    def from_ballots(cls, ballots, candidates=None):
+        """Compress ballots (sequences of candidate names, or 'A>B>C' strings)."""
+        tally = Counter(tuple(_split_ranking(ballot)) if isinstance(ballot, str) else tuple(ballot) for ballot in ballots)
+        return cls.from_counts(tally.items(), candidates)
+
+    @classmethod
+    def from_counts(cls, schedule, candidates=None):
+        """Build from (ranking, count) pairs, e.g. a preference table typed in by hand."""
+        merged = Counter()
+        for ranking, count in schedule:
+            ranking = tuple(_split_ranking(ranking)) if isinstance(ranking, str) else tuple(ranking)
+            if len(set(ranking)) != len(ranking):
+                raise ValueError(f"ranking lists a candidate twice: {' > '.join(map(str, ranking))}")
+            if int(count) != count or count < 0:
+                raise ValueError("counts must be whole numbers of voters")
+            if ranking and count:
+                merged[ranking] += int(count)
+        if not merged:
+            raise ValueError("no ballots to count")
+        if candidates is None:
+            candidates = sorted({name for ranking in merged for name in ranking}, key=str)
+        index = {name: i for i, name in enumerate(candidates)}
+        unknown = {name for ranking in merged for name in ranking} - set(index)
+        if unknown:
+            raise ValueError(f"unknown candidates: {', '.join(sorted(map(str, unknown)))}")
+        n = len(candidates)
+        rankings = np.full((len(merged), n), -1, dtype=np.int64)
+        for row, ranking in enumerate(merged):
+            rankings[row, :len(ranking)] = [index[name] for name in ranking]
+        return cls(candidates, rankings, list(merged.values()))
+
+    @classmethod
+    def from_array(cls, ballots, candidates=None):
+        """Compress an int array of ballots (one row per voter, candidate indexes, -1 padding)."""
+        ballots = np.asarray(ballots, dtype=np.int64)
+        n = ballots.shape[1] if candidates is None else len(candidates)
+        if candidates is None:
+            candidates = [chr(ord('A') + i) if n <= 26 else f"C{i + 1}" for i in range(n)]
+        width = ballots.shape[1]
+        if (n + 1) ** width < 2 ** 62:
+            # Pack each row into one integer (base n+1 digits) so np.unique sorts scalars, not rows
+            weights = (n + 1) ** np.arange(width - 1, -1, -1, dtype=np.int64)
+            codes, counts = np.unique((ballots + 1) @ weights, return_counts=True)
+            digits = (codes[:, None] // weights) % (n + 1) - 1
+            rankings = np.full((len(codes), n), -1, dtype=np.int64)
+            rankings[:, :width] = digits
+        else:
+            unique_rows, counts = np.unique(ballots, axis=0, return_counts=True)
+            rankings = np.full((len(unique_rows), n), -1, dtype=np.int64)
+            rankings[:, :width] = unique_rows
+        return cls(candidates, rankings, counts)
+
+    @property
+    def voters(self):
+        return int(self.counts.sum())
+
+    def table(self):
+        """Preference table rows, most common ranking first."""
+        order = np.argsort(-self.counts, kind='stable')
+        return [{"ranking": [self.candidates[c] for c in self.rankings[u] if c >= 0], "count": int(self.counts[u])}
+                for u in order]
+
+    # -- methods -------------------------------------------------------------
+
+    def first_choice_tally(self, active=None):
+        """First-choice votes per candidate among `active` ones (bool mask); also the exhausted count."""
+        n = len(self.candidates)
+        if active is None:
+            firsts = self.rankings[:, 0]
+        else:
+            # Best-placed active candidate on each ranking
+            masked = np.where(active[None, :], self.positions, n)
+            best = masked.min(axis=1)
+            firsts = np.where(best < n, masked.argmin(axis=1), -1)
+        ranked = firsts >= 0
+        tally = np.bincount(firsts[ranked], weights=self.counts[ranked], minlength=n).astype(np.int64)
+        return tally, int(self.counts[~ranked].sum())
+
+    def plurality(self):
+        tally, _ = self.first_choice_tally()
+        winners = _leaders(tally)
+        top = int(tally.max())
+        steps = [
+            "Count only each voter's first choice",
+            "First-place votes: " + ", ".join(f"{self.candidates[i]} = {int(v)}" for i, v in _ranked_items(tally)),
+        ]
+        majority = top * 2 > self.voters
+        steps.append(f"{self._names(winners)} {'has' if len(winners) == 1 else 'have'} the most first-place votes ({top} of {self.voters})"
+                     + (", which is also a majority" if majority else ", but not a majority"))
+        return self._result('plurality', winners, steps,
+                            tally=self._by_name(tally), majority=majority)
+
+    def borda(self):
+        n = len(self.candidates)
+        # First place earns n points, last place 1, unranked 0
+        points = np.where(self.positions < n, n - self.positions, 0)
+        scores = self.counts @ points
+        winners = _leaders(scores)
+        steps = [f"With {n} candidates, 1st place earns {n} points, 2nd earns {n - 1}, ... last earns 1"]
+        for i, score in _ranked_items(scores):
+            by_place = [int(self.counts[self.positions[:, i] == place].sum()) for place in range(n)]
+            terms = " + ".join(f"{votes}×{n - place}" for place, votes in enumerate(by_place) if votes)
+            steps.append(f"{self.candidates[i]}: {terms or '0'} = {int(score)} points")
+        steps.append(f"Most points: {self._names(winners)} with {int(scores.max())}")
+        return self._result('borda', winners, steps, scores=self._by_name(scores))
+
+    def irv(self):
+        """Plurality with elimination: drop the last-place candidate(s) until someone has a majority."""
+        n = len(self.candidates)
+        active = np.ones(n, dtype=bool)
+        rounds = []
+        steps = []
+        winners = []
+        while True:
+            tally, exhausted = self.first_choice_tally(active)
+            counted = self.voters - exhausted
+            needed = counted // 2 + 1
+            record = {
+                "round": len(rounds) + 1,
+                "tally": {self.candidates[i]: int(tally[i]) for i in np.flatnonzero(active)},
+                "exhausted": exhausted,
+                "majority_needed": needed
+            }
+            rounds.append(record)
+            standing = ", ".join(f"{name} = {votes}" for name, votes in sorted(record["tally"].items(), key=lambda item: -item[1]))
+            steps.append(f"Round {record['round']}: {standing}" + (f" ({exhausted} exhausted)" if exhausted else "")
+                         + f"; majority is {needed}")
+
+            leader = int(np.argmax(np.where(active, tally, -1)))
+            if tally[leader] >= needed:
+                winners = [leader]
+                steps.append(f"{self.candidates[leader]} has a majority ({int(tally[leader])} of {counted}) and wins")
+                break
+            lowest = tally[active].min()
+            eliminated = [i for i in np.flatnonzero(active) if tally[i] == lowest]
+            if len(eliminated) == active.sum():
+                winners = eliminated
+                steps.append(f"Every remaining candidate is tied: {self._names(winners)}")
+                break
+            active[eliminated] = False
+            record["eliminated"] = [self.candidates[i] for i in eliminated]
+            steps.append(f"Eliminate {self._names(eliminated)} (fewest first-place votes: {int(lowest)}); "
+                         "their ballots move to the next choice still in the race")
+            if active.sum() == 1:
+                winners = list(np.flatnonzero(active))
+                steps.append(f"{self.candidates[winners[0]]} is the only candidate left and wins")
+                break
+        return self._result('irv', winners, steps, rounds=rounds)
+
+    def pairwise_matrix(self):
+        """matrix[i][j] = voters ranking candidate i above candidate j."""
+        n = len(self.candidates)
+        matrix = np.zeros((n, n), dtype=np.int64)
+        for i in range(n):
+            matrix[i] = self.counts @ (self.positions[:, i, None] < self.positions)
+        return matrix
+
+    def pairwise(self):
+        """Every head-to-head matchup: a win is 1 point, a tie is ½ point each."""
+        n = len(self.candidates)
+        matrix = self.pairwise_matrix()
+        points = np.zeros(n)
+        matchups = []
+        steps = [f"{n} candidates make n(n-1)/2 = {n * (n - 1) // 2} head-to-head matchups"]
+        for i in range(n):
+            for j in range(i + 1, n):
+                a, b = self.candidates[i], self.candidates[j]
+                a_votes, b_votes = int(matrix[i, j]), int(matrix[j, i])
+                if a_votes > b_votes:
+                    points[i] += 1
+                    winner = a
+                elif b_votes > a_votes:
+                    points[j] += 1
+                    winner = b
+                else:
+                    points[i] += 0.5
+                    points[j] += 0.5
+                    winner = None
+                matchups.append({"candidates": [a, b], "votes": [a_votes, b_votes], "winner": winner})
+                steps.append(f"{a} vs {b}: {a_votes} to {b_votes}, " + (f"{winner} gets 1 point" if winner else "tie, ½ point each"))
+        winners = _leaders(points)
+        condorcet = [i for i in range(n) if all(matrix[i, j] > matrix[j, i] for j in range(n) if j != i)]
+        steps.append("Points: " + ", ".join(f"{self.candidates[i]} = {_half(points[i])}" for i, _ in _ranked_items(points)))
+        if condorcet:
+            steps.append(f"{self.candidates[condorcet[0]]} beats every other candidate head to head (Condorcet winner)")
+        else:
+            steps.append("No candidate beats every other candidate head to head, so there is no Condorcet winner")
+        return self._result('pairwise', winners, steps, matchups=matchups,
+                            points={self.candidates[i]: float(points[i]) for i in range(n)},
+                            condorcet_winner=self.candidates[condorcet[0]] if condorcet else None)
+
+    def run(self, method):
+        method = method.lower().replace('-', '_').replace(' ', '_')
+        aliases = {'instant_runoff': 'irv', 'plurality_with_elimination': 'irv', 'condorcet': 'pairwise',
+                   'pairwise_comparison': 'pairwise', 'borda_count': 'borda'}
+        method = aliases.get(method, method)
+        if method not in METHODS:
+            raise ValueError(f"method must be one of: {', '.join(METHODS)}")
+        return getattr(self, method)()
+
+    def run_all(self):
+        return {method: self.run(method) for method in METHODS}
+
+    # -- helpers -------------------------------------------------------------
+
+    def _names(self, indexes):
+        return " and ".join(self.candidates[i] for i in indexes)
+
+    def _by_name(self, values):
+        return {self.candidates[i]: int(v) for i, v in enumerate(values)}
+
+    def _result(self, method, winners, steps, **details):
+        names = [self.candidates[i] for i in winners]
+        return {
+            "method": method,
+            "title": METHOD_NAMES[method],
+            "winner": names[0] if len(names) == 1 else None,
+            "winners": names,
+            "voters": self.voters,
+            "unique_rankings": len(self.counts),
+            "steps": steps,
+            **details
+        }
+
+
+def _leaders(values):
+    values = np.asarray(values)
+    return [int(i) for i in np.flatnonzero(values == values.max())]
+
+
+def _ranked_items(values):
+    return sorted(enumerate(values), key=lambda item: -item[1])
+
+
+def _half(value):
+    return str(int(value)) if value == int(value) else f"{int(value)}½"
+
+
+# ---------------------------------------------------------------------------
+# Parsing pasted ballots
+# ---------------------------------------------------------------------------
+
+def _split_ranking(text):
+    text = text.strip()
+    if _COMPACT.match(text):
+        return list(text)
+    return [name for name in _SEPARATOR.split(text) if name]
+
+
+def parse_ballot_lines(text):
+    """(ranking, count) pairs from pasted lines; lines that aren't ballots are skipped.
+
+    Accepts '12: A > B > C', 'A, B, C - 12', 'ABC 5', '8 voters: B > A > C',
+    a bare 'A > B > C' (one voter) or compact 'ABC' (single-letter candidates).
+    A number after plain whitespace is only read as the count when the other
+    candidate names aren't numbered ('Option 1 > Option 2' is one voter).
+    """
+    schedule = []
+    for line in text.splitlines():
+        line = line.strip().strip('•*-').strip()
+        if not line:
+            continue
+        count = 1
+        body = line
+        match = _COUNT_FIRST.match(line)
+        if match:
+            count, body = int(match.group(1)), match.group(2)
+        else:
+            match = _COUNT_LAST.match(line)
+            if match is None:
+                match = _COUNT_TRAILING.match(line)
+                # 'Option 1 > Option 2': the trailing number is part of the name
+                if match and any(_NUMBERED_NAME.search(name) for name in _split_ranking(match.group(1))):
+                    match = None
+            if match and not _SEPARATOR.search(match.group(1)[-1:]):
+                body, count = match.group(1), int(match.group(2))
+        if not (_SEPARATOR.search(body) or _COMPACT.match(body)):
+            continue
+        ranking = _split_ranking(body)
+        if len(ranking) >= 2 and all(re.match(r"^[\w][\w .'&-]{0,40}$", name) for name in ranking):
+            schedule.append((ranking, count))
+    return schedule
+
+
+def schedule_from_text(text):
+    """PreferenceSchedule from pasted ballots, or None if fewer than two ballot lines were found."""
+    lines = parse_ballot_lines(text)
+    # Prose like "Hello, world" parses as a ballot; real candidates show up on more than one line
+    seen = Counter(name for ranking, _ in lines for name in set(ranking))
+    lines = [(ranking, count) for ranking, count in lines if all(seen[name] > 1 for name in ranking)]
+    if len(lines) < 2:
+        return None
+    return PreferenceSchedule.from_counts(lines)
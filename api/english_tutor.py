@@ -5,10 +5,14 @@ Serverless function for Vercel deployment
 """
 
 import os
+import sys
 import json
-import anthropic
 from datetime import datetime
 
+# Shared helpers live next to the endpoints in api/
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _client_pool import get_client
+
 def handler(request, context):
     """Vercel serverless function handler."""
     
@@ -127,7 +131,7 @@ def handler(request, context):
 
 def generate_writing_coach_response(query, assignment_type, topic, api_key):
     """Generate AI writing coach response."""
-    client = anthropic.Anthropic(api_key=api_key)
+    client = get_client(api_key)
     
     # Course structure for ENG 111
     assignments = {
@@ -4,17 +4,43 @@ Enhanced AI Tutor with Comprehensive Course Knowledge
 This AI tutor is trained on ALL course materials and provides specific, accurate help.
 """
 
+import asyncio
 import json
+import os
 import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from flask import Flask, request, jsonify
+from html import escape
 from pathlib import Path
 
+# Shared helpers live next to the endpoints in api/
+sys.path.insert(0, str(Path(__file__).parent))
+from _semantic_cache import SemanticCache
+from _knowledge_index import INDEX_KEY, KnowledgeIndex, StoredKnowledgeIndex
+from _kb_binary import open_kb
+from _apportionment import apportion, compare_methods
+from _voting import PreferenceSchedule, schedule_from_text
+from _statistics import solve_statistics
+
 app = Flask(__name__)
 
 # Load the enhanced knowledge base with comprehensive notes and tutorials
 def load_knowledge_base():
     """Load the enhanced knowledge base with comprehensive notes and tutorials."""
     try:
+        # Prefer the compact binary build, which is memory-mapped and decoded lazily
+        knowledge_path = Path("../ai_knowledge_base_enhanced.kbin")
+        if not knowledge_path.exists():
+            knowledge_path = Path("ai_knowledge_base_enhanced.kbin")
+        
+        if knowledge_path.exists():
+            try:
+                # Only while it still matches the JSON it was built from
+                return open_kb(knowledge_path, source=knowledge_path.with_suffix('.json'))
+            except ValueError as e:
+                print(f"⚠️ Skipping {knowledge_path}, loading the JSON instead: {e}")
+        
         # Try enhanced knowledge base first
         knowledge_path = Path("../ai_knowledge_base_enhanced.json")
         if not knowledge_path.exists():
@@ -46,6 +72,93 @@ def load_knowledge_base():
 
 KNOWLEDGE_BASE = load_knowledge_base()
 
+# Keyword tables used to identify topics and route questions
+MATH_TOPIC_KEYWORDS = {
+    'interest': ['interest', 'compound', 'simple', 'apy', 'investment'],
+    'proportion': ['proportion', 'ratio', 'cross multiply', 'percent'],
+    'probability': ['probability', 'expected value', 'odds', 'chance'],
+    'statistics': ['mean', 'median', 'standard deviation', 'z-score', 'normal'],
+    'voting': ['voting', 'plurality', 'majority', 'borda', 'election'],
+    'apportionment': ['apportionment', 'quota', 'divisor', 'hamilton'],
+    'conversion': ['convert', 'metric', 'temperature', 'measurement'],
+    'linear': ['linear', 'slope', 'function', 'equation'],
+    'exponential': ['exponential', 'growth', 'decay']
+}
+
+MATH_CHAPTER_MAPPING = {
+    'interest': 'chapter_6',
+    'proportion': 'chapter_4', 
+    'probability': 'chapter_10',
+    'statistics': 'chapter_11',
+    'voting': 'chapter_13',
+    'apportionment': 'chapter_13',
+    'conversion': 'chapter_7',
+    'linear': 'chapter_5',
+    'exponential': 'chapter_5'
+}
+
+WRITING_TOPIC_KEYWORDS = {
+    'essay_structure': ['structure', 'organize', 'outline', 'introduction', 'conclusion'],
+    'compare_contrast': ['compare', 'contrast', 'similarity', 'difference'],
+    'citations': ['cite', 'citation', 'mla', 'quote', 'source'],
+    'plagiarism': ['plagiarism', 'cheat', 'copy', 'original'],
+    'revision': ['revise', 'edit', 'improve', 'draft'],
+    'thesis': ['thesis', 'argument', 'main idea', 'claim'],
+    'brainstorm': ['brainstorm', 'ideas', 'topic', 'start']
+}
+
+ROUTING_KEYWORDS = {
+    'math': ['formula', 'calculate', 'solve', 'math', 'percent', 'interest', 'probability'],
+    'writing': ['essay', 'write', 'citation', 'thesis', 'paragraph']
+}
+
+class KeywordMatcher:
+    """Keyword table compiled once into a single regex.
+    
+    Matching keeps the substring semantics of `keyword in text`: a zero-width
+    lookahead finds keywords at every position (including overlapping ones),
+    and a keyword that is a prefix of a longer keyword also credits its
+    topics whenever the longer one matches at the same position.
+    """
+    
+    def __init__(self, table):
+        self.topic_order = list(table)
+        keyword_topics = {}
+        for topic, keywords in table.items():
+            for keyword in keywords:
+                keyword_topics.setdefault(keyword, set()).add(topic)
+        
+        self.keyword_topics = {}
+        for keyword in keyword_topics:
+            topics = set()
+            for other, other_topics in keyword_topics.items():
+                if keyword.startswith(other):
+                    topics |= other_topics
+            self.keyword_topics[keyword] = topics
+        
+        alternation = '|'.join(re.escape(k) for k in sorted(keyword_topics, key=len, reverse=True))
+        self.pattern = re.compile(f'(?=({alternation}))')
+    
+    def match(self, text):
+        """Find all topics in one pass.
+        
+        Returns (topics in table order, {topic: weight}, [(topic, keyword, position)]).
+        A topic's weight is the total length of its matched keywords.
+        """
+        weights = {}
+        hits = []
+        for m in self.pattern.finditer(text):
+            keyword = m.group(1)
+            for topic in self.keyword_topics[keyword]:
+                weights[topic] = weights.get(topic, 0) + len(keyword)
+                hits.append((topic, keyword, m.start()))
+        topics = [topic for topic in self.topic_order if topic in weights]
+        return topics, weights, hits
+
+MATH_TOPIC_MATCHER = KeywordMatcher(MATH_TOPIC_KEYWORDS)
+WRITING_TOPIC_MATCHER = KeywordMatcher(WRITING_TOPIC_KEYWORDS)
+ROUTING_MATCHER = KeywordMatcher(ROUTING_KEYWORDS)
+
 class EnhancedMathTutor:
     """AI Math Tutor with comprehensive course knowledge."""
     
@@ -54,53 +167,50 @@ class EnhancedMathTutor:
         self.formulas = self.knowledge.get('formulas', {})
         self.concepts = self.knowledge.get('concepts', {})
         self.examples = self.knowledge.get('examples', {})
+        self._stored_index = knowledge_base.get(INDEX_KEY)  # prebuilt in the .kbin, absent from the JSON
+        self._index = None
+    
+    @property
+    def index(self):
+        """Inverted index over the math knowledge: the .kbin's prebuilt copy, else built on first use."""
+        if self._index is None:
+            if self._stored_index is not None:
+                self._index = StoredKnowledgeIndex(self._stored_index)
+            else:
+                self._index = KnowledgeIndex.from_math_knowledge(self.knowledge)
+        return self._index
     
-    def get_help(self, question, chapter=None):
+    def get_help(self, question, chapter=None, calculation=None):
         """Provide comprehensive help based on the question."""
         question_lower = question.lower()
         
         # Identify the topic
         topic_info = self.identify_topic(question_lower, chapter)
         
+        # Worked numbers for questions that bring their own data
+        if calculation is None:
+            calculation = self.calculate(question, topic_info)
+        
         # Get relevant formulas and concepts
         relevant_content = self.get_relevant_content(topic_info)
         
         # Generate response
-        response = self.generate_response(question, topic_info, relevant_content)
+        response = self.generate_response(question, topic_info, relevant_content, calculation)
         
         return response
     
+    def calculate(self, question, topic_info):
+        """Exact Chapter 11 answer (dataset summary or normal area) computed locally, or None."""
+        if 'statistics' in topic_info['topics']:
+            return solve_statistics(question)
+        return None
+    
     def identify_topic(self, question_lower, chapter):
         """Identify what mathematical topic the question is about."""
-        topics = {
-            'interest': ['interest', 'compound', 'simple', 'apy', 'investment'],
-            'proportion': ['proportion', 'ratio', 'cross multiply', 'percent'],
-            'probability': ['probability', 'expected value', 'odds', 'chance'],
-            'statistics': ['mean', 'median', 'standard deviation', 'z-score', 'normal'],
-            'voting': ['voting', 'plurality', 'majority', 'borda', 'election'],
-            'apportionment': ['apportionment', 'quota', 'divisor', 'hamilton'],
-            'conversion': ['convert', 'metric', 'temperature', 'measurement'],
-            'linear': ['linear', 'slope', 'function', 'equation'],
-            'exponential': ['exponential', 'growth', 'decay']
-        }
-        
-        identified_topics = []
-        for topic, keywords in topics.items():
-            if any(keyword in question_lower for keyword in keywords):
-                identified_topics.append(topic)
+        identified_topics, weights, matches = MATH_TOPIC_MATCHER.match(question_lower)
         
         # Map to chapters
-        chapter_mapping = {
-            'interest': 'chapter_6',
-            'proportion': 'chapter_4', 
-            'probability': 'chapter_10',
-            'statistics': 'chapter_11',
-            'voting': 'chapter_13',
-            'apportionment': 'chapter_13',
-            'conversion': 'chapter_7',
-            'linear': 'chapter_5',
-            'exponential': 'chapter_5'
-        }
+        chapter_mapping = MATH_CHAPTER_MAPPING
         
         if chapter:
             chapter_key = f"chapter_{chapter}"
@@ -110,64 +220,50 @@ class EnhancedMathTutor:
         return {
             'topics': identified_topics,
             'chapter': chapter_key,
-            'primary_topic': identified_topics[0] if identified_topics else 'general'
+            'primary_topic': identified_topics[0] if identified_topics else 'general',
+            'weights': weights,
+            'matches': matches
         }
     
     def get_relevant_content(self, topic_info):
         """Get relevant formulas and concepts for the topic."""
         chapter = topic_info['chapter']
         
-        relevant_formulas = []
-        relevant_concepts = []
-        study_guides = []
-        schedules = []
-        assignments = []
-        
-        # Get formulas for the specific chapter
-        if chapter in self.formulas:
-            relevant_formulas = self.formulas[chapter]
+        # Search with the topic names plus the keywords that identified them
+        query_terms = list(topic_info['topics'])
+        query_terms += [keyword for _, keyword, _ in topic_info.get('matches', [])]
         
-        # Also check related chapters and general formulas
-        for key, formulas in self.formulas.items():
-            for topic in topic_info['topics']:
-                matching_formulas = [f for f in formulas if topic.lower() in f.lower()]
-                relevant_formulas.extend(matching_formulas)
+        # Formulas for the specific chapter first, then the best matches from any chapter
+        relevant_formulas = self.index.group_texts('formula', chapter)
+        if query_terms:
+            relevant_formulas += [text for text, _ in self.index.search(query_terms, 'formula', limit=10)]
         
         # Get concepts
-        if chapter in self.concepts:
-            relevant_concepts = self.concepts[chapter]
+        relevant_concepts = self.index.group_texts('concept', chapter)
         
-        # Get study guides
-        study_guides_data = self.knowledge.get('study_guides', {})
-        for key, content in study_guides_data.items():
-            if any(topic in content.lower() for topic in topic_info['topics']):
-                study_guides.append(content[:500])  # First 500 chars
+        study_guides = []
+        assignments = []
+        if query_terms:
+            study_guides = [text[:500] for text, _ in self.index.search(query_terms, 'study_guide', limit=3)]  # First 500 chars
+            assignments = [text[:400] for text, _ in self.index.search(query_terms, 'assignment', limit=2)]  # First 400 chars
         
         # Get schedules
-        schedules_data = self.knowledge.get('schedules', {})
-        for key, content in schedules_data.items():
-            schedules.append(content[:300])  # First 300 chars
+        schedules = [text[:300] for text in self.index.kind_texts('schedule')[:2]]  # First 300 chars
         
-        # Get assignments
-        assignments_data = self.knowledge.get('assignments', {})
-        for key, content in assignments_data.items():
-            if any(topic in content.lower() for topic in topic_info['topics']):
-                assignments.append(content[:400])  # First 400 chars
-        
-        # Remove duplicates
-        relevant_formulas = list(set(relevant_formulas))
-        relevant_concepts = list(set(relevant_concepts))
+        # Remove duplicates, keeping rank order
+        relevant_formulas = list(dict.fromkeys(relevant_formulas))
+        relevant_concepts = list(dict.fromkeys(relevant_concepts))
         
         return {
             'formulas': relevant_formulas[:10],  # Limit to top 10
             'concepts': relevant_concepts[:5],    # Limit to top 5
-            'study_guides': study_guides[:3],     # Limit to top 3
-            'schedules': schedules[:2],           # Limit to top 2
-            'assignments': assignments[:2],       # Limit to top 2
+            'study_guides': study_guides,         # Top 3
+            'schedules': schedules,               # Top 2
+            'assignments': assignments,           # Top 2
             'chapter': chapter
         }
     
-    def generate_response(self, question, topic_info, relevant_content):
+    def generate_response(self, question, topic_info, relevant_content, calculation=None):
         """Generate a comprehensive response."""
         response_parts = []
         
@@ -180,6 +276,10 @@ class EnhancedMathTutor:
             topics_str = ", ".join(topic_info['topics']).title()
             response_parts.append(f'<p>This looks like a question about: <strong>{topics_str}</strong></p>')
         
+        # Worked solution computed from the question's own numbers
+        if calculation:
+            response_parts.append(self.calculation_html(calculation))
+        
         # Relevant formulas
         if relevant_content['formulas']:
             response_parts.append('<div class="bg-blue-50 border border-blue-200 p-4 rounded-lg">')
@@ -231,6 +331,15 @@ class EnhancedMathTutor:
         
         return "\\n".join(response_parts)
     
+    def calculation_html(self, calculation):
+        """Render a worked solution as a step-by-step card."""
+        steps = ''.join(f'<li>{escape(step)}</li>' for step in calculation['steps'])
+        return f'''<div class="bg-green-50 border border-green-200 p-4 rounded-lg">
+                    <h5 class="font-semibold text-green-800 mb-2">🧮 {escape(calculation['title'])}: <span class="font-mono text-sm">{escape(calculation['formula'])}</span></h5>
+                    <ol class="list-decimal list-inside text-sm space-y-1">{steps}</ol>
+                    <p class="mt-2 text-green-800"><strong>✅ Answer:</strong> {escape(calculation['answer'])}</p>
+                   </div>'''
+    
     def clean_formula(self, formula):
         """Clean up extracted formulas for display."""
         # Remove HTML and excess whitespace
@@ -335,24 +444,13 @@ class EnhancedEnglishTutor:
     
     def identify_writing_topic(self, question_lower):
         """Identify what writing topic the question is about."""
-        topics = {
-            'essay_structure': ['structure', 'organize', 'outline', 'introduction', 'conclusion'],
-            'compare_contrast': ['compare', 'contrast', 'similarity', 'difference'],
-            'citations': ['cite', 'citation', 'mla', 'quote', 'source'],
-            'plagiarism': ['plagiarism', 'cheat', 'copy', 'original'],
-            'revision': ['revise', 'edit', 'improve', 'draft'],
-            'thesis': ['thesis', 'argument', 'main idea', 'claim'],
-            'brainstorm': ['brainstorm', 'ideas', 'topic', 'start']
-        }
-        
-        identified_topics = []
-        for topic, keywords in topics.items():
-            if any(keyword in question_lower for keyword in keywords):
-                identified_topics.append(topic)
+        identified_topics, weights, matches = WRITING_TOPIC_MATCHER.match(question_lower)
         
         return {
             'topics': identified_topics,
-            'primary_topic': identified_topics[0] if identified_topics else 'general'
+            'primary_topic': identified_topics[0] if identified_topics else 'general',
+            'weights': weights,
+            'matches': matches
         }
     
     def generate_writing_response(self, question, topic_info):
@@ -496,66 +594,272 @@ class EnhancedEnglishTutor:
 math_tutor = EnhancedMathTutor(KNOWLEDGE_BASE)
 english_tutor = EnhancedEnglishTutor(KNOWLEDGE_BASE)
 
+# Paraphrased math questions reuse the answer built for the first one
+semantic_cache = SemanticCache()
+
+def answer_question(question, chapter='', context='general'):
+    """Route a question to the right tutor and build the JSON payload."""
+    if not question.strip():
+        return {
+            'answer': '<p>Please ask me a specific question and I\'ll be happy to help! 🤖</p>',
+            'success': True
+        }
+    
+    # Route to appropriate tutor
+    route_topics = ROUTING_MATCHER.match(question.lower())[0]
+    if context == 'math-tutorial' or 'math' in route_topics:
+        topic_info = math_tutor.identify_topic(question.lower(), chapter)
+        chapter_key = topic_info['chapter']
+        # A computed answer belongs to these exact numbers, so it is never shared with a paraphrase
+        calculation = math_tutor.calculate(question, topic_info)
+        cacheable = chapter_key != 'general' and calculation is None
+        similar = semantic_cache.lookup(question, chapter_key, topic_info['primary_topic']) if cacheable else None
+        if similar is not None:
+            return {'answer': similar[0], 'success': True, 'cached': True}
+        
+        response = math_tutor.get_help(question, chapter, calculation)
+        if cacheable:
+            semantic_cache.add(question, chapter_key, response, topic_info['primary_topic'])
+    elif context == 'writing-help' or 'writing' in route_topics:
+        response = english_tutor.get_help(question, context)
+    else:
+        # General helpful response
+        response = f'''
+        <div class="space-y-3">
+            <p><strong>I'm here to help you with both math and writing!</strong> 📚✍️</p>
+            <p>Your question: "{question}"</p>
+            <div class="grid grid-cols-2 gap-4">
+                <div class="bg-blue-50 p-3 rounded">
+                    <h6 class="font-semibold text-blue-800">Math Help</h6>
+                    <p class="text-sm text-blue-700">Ask about formulas, calculations, or specific math problems</p>
+                </div>
+                <div class="bg-green-50 p-3 rounded">
+                    <h6 class="font-semibold text-green-800">Writing Help</h6>
+                    <p class="text-sm text-green-700">Ask about essays, citations, or writing process</p>
+                </div>
+            </div>
+            <p>Can you tell me more specifically what you need help with? I have comprehensive knowledge of all your course materials! 🎯</p>
+        </div>
+        '''
+    
+    return {'answer': response, 'success': True}
+
+def error_payload(error):
+    """Friendly payload returned when answering a question fails."""
+    return {
+        'answer': '<p>I had a small hiccup, but I\'m still here to help! Please try asking your question again. 🤖✨</p>',
+        'error': str(error),
+        'success': False
+    }
+
+def health_payload():
+    """Knowledge base and cache status for the health check."""
+    return {
+        'status': 'healthy',
+        'knowledge_loaded': len(KNOWLEDGE_BASE.get('math', {}).get('formulas', {})) > 0,
+        'formulas_count': sum(len(formulas) for formulas in KNOWLEDGE_BASE.get('math', {}).get('formulas', {}).values()),
+        'semantic_cache': semantic_cache.get_stats()
+    }
+
+def apportionment_payload(data):
+    """Apportion seats for a JSON request; returns (payload, HTTP status).
+    
+    Body: {"states": {"name": population, ...}} or {"populations": [...], "names": [...]},
+    plus "seats" and "method" (hamilton, jefferson, adams, webster,
+    huntington_hill, or "all" to compare every method).
+    """
+    try:
+        states = data.get('states')
+        if isinstance(states, dict):
+            names, populations = list(states), list(states.values())
+        else:
+            names, populations = data.get('names'), data.get('populations')
+        seats = data.get('seats')
+        method = data.get('method', 'all')
+        if method == 'all':
+            result = compare_methods(populations, seats, names)
+        else:
+            result = apportion(populations, seats, method, names)
+        return {'success': True, 'result': result}, 200
+    except (TypeError, ValueError) as e:
+        return {'success': False, 'error': str(e)}, 400
+
+def voting_payload(data):
+    """Count a Chapter 13 election for a JSON request; returns (payload, HTTP status).
+    
+    Body: {"ballots": [["A", "B", "C"], "B>C>A", ...]},
+    {"schedule": [{"ranking": "A>B>C", "count": 14}, ...]} or {"text": pasted ballot lines},
+    plus "method" (plurality, borda, irv, pairwise, or "all").
+    """
+    try:
+        if data.get('schedule') is not None:
+            schedule = PreferenceSchedule.from_counts((row['ranking'], row['count']) for row in data['schedule'])
+        elif data.get('ballots') is not None:
+            schedule = PreferenceSchedule.from_ballots(data['ballots'])
+        else:
+            schedule = schedule_from_text(data.get('text') or '')
+            if schedule is None:
+                raise ValueError("send ballots, a schedule, or text with at least two ballot lines")
+        method = data.get('method', 'all')
+        result = schedule.run_all() if method == 'all' else schedule.run(method)
+        return {'success': True, 'candidates': schedule.candidates, 'schedule': schedule.table(), 'result': result}, 200
+    except (KeyError, TypeError, ValueError) as e:
+        return {'success': False, 'error': str(e)}, 400
+
 @app.route('/api/ai-tutor', methods=['POST'])
 def enhanced_ai_tutor():
     """Enhanced AI tutor endpoint with comprehensive knowledge."""
     try:
         data = request.json
-        question = data.get('question', '')
-        chapter = data.get('chapter', '')
-        context = data.get('context', 'general')
-        
-        if not question.strip():
-            return jsonify({
-                'answer': '<p>Please ask me a specific question and I\'ll be happy to help! 🤖</p>',
-                'success': True
-            })
-        
-        # Route to appropriate tutor
-        if context == 'math-tutorial' or any(word in question.lower() for word in ['formula', 'calculate', 'solve', 'math', 'percent', 'interest', 'probability']):
-            response = math_tutor.get_help(question, chapter)
-        elif context == 'writing-help' or any(word in question.lower() for word in ['essay', 'write', 'citation', 'thesis', 'paragraph']):
-            response = english_tutor.get_help(question, context)
-        else:
-            # General helpful response
-            response = f'''
-            <div class="space-y-3">
-                <p><strong>I'm here to help you with both math and writing!</strong> 📚✍️</p>
-                <p>Your question: "{question}"</p>
-                <div class="grid grid-cols-2 gap-4">
-                    <div class="bg-blue-50 p-3 rounded">
-                        <h6 class="font-semibold text-blue-800">Math Help</h6>
-                        <p class="text-sm text-blue-700">Ask about formulas, calculations, or specific math problems</p>
-                    </div>
-                    <div class="bg-green-50 p-3 rounded">
-                        <h6 class="font-semibold text-green-800">Writing Help</h6>
-                        <p class="text-sm text-green-700">Ask about essays, citations, or writing process</p>
-                    </div>
-                </div>
-                <p>Can you tell me more specifically what you need help with? I have comprehensive knowledge of all your course materials! 🎯</p>
-            </div>
-            '''
-        
-        return jsonify({'answer': response, 'success': True})
+        return jsonify(answer_question(
+            data.get('question', ''),
+            data.get('chapter', ''),
+            data.get('context', 'general')
+        ))
     
     except Exception as e:
-        return jsonify({
-            'answer': '<p>I had a small hiccup, but I\'m still here to help! Please try asking your question again. 🤖✨</p>',
-            'error': str(e),
-            'success': False
-        })
+        return jsonify(error_payload(e))
+
+@app.route('/api/apportionment', methods=['POST'])
+def apportionment():
+    """Chapter 13 apportionment calculator with step-by-step tables."""
+    payload, status = apportionment_payload(request.get_json(silent=True) or {})
+    return jsonify(payload), status
+
+@app.route('/api/voting', methods=['POST'])
+def voting():
+    """Chapter 13 voting methods calculator with round-by-round steps."""
+    payload, status = voting_payload(request.get_json(silent=True) or {})
+    return jsonify(payload), status
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint."""
-    return jsonify({
-        'status': 'healthy',
-        'knowledge_loaded': len(KNOWLEDGE_BASE.get('math', {}).get('formulas', {})) > 0,
-        'formulas_count': sum(len(formulas) for formulas in KNOWLEDGE_BASE.get('math', {}).get('formulas', {}).values())
+    return jsonify(health_payload())
+
+# ---------------------------------------------------------------------------
+# ASGI serving mode
+#
+# Run with:  uvicorn enhanced_ai_tutor:asgi_app --workers 1
+#
+# The tutors are plain synchronous Python, so each request is handed to a
+# bounded thread pool and awaited. The event loop stays free to accept new
+# connections while answers are being built, and a slow request no longer
+# holds a whole worker.
+# ---------------------------------------------------------------------------
+
+ASGI_MAX_THREADS = int(os.getenv('AI_TUTOR_MAX_THREADS', 32))
+ASGI_MAX_BODY_BYTES = 64 * 1024
+
+# Calculator endpoints: path -> function(data) returning (payload, status)
+ASGI_TOOLS = {
+    '/api/apportionment': apportionment_payload,
+    '/api/voting': voting_payload
+}
+
+_asgi_executor = ThreadPoolExecutor(max_workers=ASGI_MAX_THREADS, thread_name_prefix='ai-tutor')
+
+async def _read_body(receive):
+    """Collect the request body from ASGI receive events."""
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return None
+        chunk = message.get('body', b'')
+        size += len(chunk)
+        if size > ASGI_MAX_BODY_BYTES:
+            raise ValueError("Request body too large")
+        chunks.append(chunk)
+        if not message.get('more_body'):
+            return b''.join(chunks)
+
+async def _send_json(send, payload, status=200):
+    body = json.dumps(payload).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode('ascii'))
+        ]
     })
+    await send({'type': 'http.response.body', 'body': body})
+
+async def _handle_lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            _asgi_executor.shutdown(wait=False)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+async def asgi_app(scope, receive, send):
+    """ASGI entry point serving /api/ai-tutor, the calculator tools and /health without blocking the loop."""
+    if scope['type'] == 'lifespan':
+        await _handle_lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+    
+    path = scope.get('path', '')
+    method = scope.get('method', 'GET')
+    
+    if path == '/health':
+        if method != 'GET':
+            await _send_json(send, {'error': 'Method not allowed'}, status=405)
+            return
+        await _send_json(send, health_payload())
+        return
+    
+    if path != '/api/ai-tutor' and path not in ASGI_TOOLS:
+        await _send_json(send, {'error': 'Not found'}, status=404)
+        return
+    if method != 'POST':
+        await _send_json(send, {'error': 'Method not allowed'}, status=405)
+        return
+    
+    if path in ASGI_TOOLS:
+        try:
+            body = await _read_body(receive)
+            if body is None:
+                return
+            data = json.loads(body or b'{}')
+        except ValueError as e:
+            await _send_json(send, {'success': False, 'error': str(e)}, status=400)
+            return
+        loop = asyncio.get_running_loop()
+        payload, status = await loop.run_in_executor(_asgi_executor, ASGI_TOOLS[path], data)
+        await _send_json(send, payload, status=status)
+        return
+    
+    try:
+        body = await _read_body(receive)
+        if body is None:
+            return  # client went away
+        data = json.loads(body or b'{}')
+        loop = asyncio.get_running_loop()
+        payload = await loop.run_in_executor(
+            _asgi_executor,
+            answer_question,
+            data.get('question', ''),
+            data.get('chapter', ''),
+            data.get('context', 'general')
+        )
+    except Exception as e:
+        payload = error_payload(e)
+    
+    await _send_json(send, payload)
 
 if __name__ == '__main__':
     print(f"🤖 Enhanced AI Tutor starting...")
     print(f"📊 Loaded {sum(len(formulas) for formulas in KNOWLEDGE_BASE.get('math', {}).get('formulas', {}).values())} formulas")
     print(f"🔬 Covering {len(KNOWLEDGE_BASE.get('math', {}).get('formulas', {}))} chapters")
-    app.run(debug=True, port=5001)  # Different port to avoid conflicts
\ No newline at end of file
+    if '--asgi' in sys.argv:
+        import uvicorn
+        uvicorn.run(asgi_app, port=5001)
+    else:
+        app.run(debug=True, port=5001)  # Different port to avoid conflicts
@@ -5,15 +5,99 @@ Serverless function for Vercel deployment
 """
 
 import os
+import sys
 import json
 from http.server import BaseHTTPRequestHandler
 from datetime import datetime
+from urllib.parse import parse_qs, urlsplit
 
 try:
     import anthropic
 except ImportError:
     anthropic = None
 
+# Shared helpers live next to the endpoints in api/
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _calculator import solve, solution_html, calculator_stats
+from _client_pool import get_client, pool_stats
+from _response_cache import create_cache_from_env, make_cache_key
+from _semantic_cache import SemanticCache
+from _single_flight import SingleFlight
+from _streaming import wants_stream, sse_event, sse_response, stream_model_text, stream_stats
+
+# Course structure
+CHAPTERS = {
+    1: "Thinking Mathematically, Estimating, Problem Solving",
+    4: "Proportions, Percentages, and Ratios",
+    5: "Linear and Exponential Functions",
+    6: "Personal Finance (Interest, Saving, Borrowing)",
+    7: "Measurement and Conversions",
+    10: "Probability and Expected Value",
+    11: "Statistics and Data Analysis",
+    13: "Voting Methods and Apportionment"
+}
+
+# Module-level so cached answers survive across warm invocations
+response_cache = create_cache_from_env()
+semantic_cache = SemanticCache()
+# Concurrent identical questions share one model call
+single_flight = SingleFlight()
+
+
+def is_course_chapter(chapter):
+    """True when the request names one of the MAT 143 chapters."""
+    return str(chapter).strip().isdigit() and int(chapter) in CHAPTERS
+
+
+def calculation_response(query, chapter, topic):
+    """Answer a plain numeric question locally with worked steps; None if it isn't one."""
+    solution = solve(query)
+    if solution is None:
+        return None
+    return {
+        "error": False,
+        "response": solution_html(query, solution),
+        "timestamp": datetime.now().isoformat(),
+        "chapter": chapter,
+        "topic": topic,
+        "calculated": True,
+        "formula": solution["formula"],
+        "answer": solution["answer"]
+    }
+
+
+def find_cached_response(query, chapter, topic):
+    """Look up an exact or near-duplicate answer; None on miss."""
+    response = response_cache.get(query, chapter, topic)
+    if response is not None:
+        return dict(response, cached=True)
+    
+    # Paraphrases of an answered question within the same chapter and topic
+    similar = semantic_cache.lookup(query, chapter, topic) if is_course_chapter(chapter) else None
+    if similar is not None:
+        answer, matched_query, similarity = similar
+        return dict(answer, cached=True, matched_query=matched_query,
+                    similarity=round(similarity, 3))
+    return None
+
+
+def remember_response(query, chapter, topic, response):
+    """Store a successful answer in both caches."""
+    response_cache.set(query, chapter, topic, response)
+    if is_course_chapter(chapter):
+        semantic_cache.add(query, chapter, response, topic)
+
+
+def answer_query(query, chapter, topic, api_key):
+    """Generate an answer, coalescing with any identical request already in flight."""
+    def generate():
+        response = generate_tutor_response(query, chapter, topic, api_key)
+        if not response.get("error"):
+            remember_response(query, chapter, topic, response)
+        return response
+    
+    return single_flight.do(make_cache_key(query, chapter, topic), generate)
+
 class handler(BaseHTTPRequestHandler):
     """Vercel serverless function handler."""
     
@@ -37,6 +121,20 @@ class handler(BaseHTTPRequestHandler):
             chapter = body.get('chapter', '')
             topic = body.get('topic', '')
             
+            # Plain computations (I=Prt, z-scores, ...) never need the model
+            response = calculation_response(query, chapter, topic)
+            if response is not None:
+                if wants_stream(body, self.headers.get('Accept', '')):
+                    self.send_event_stream(query, chapter, topic, None, response=response)
+                    return
+                
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                self.wfile.write(json.dumps(response).encode('utf-8'))
+                return
+            
             # Get API key
             api_key = os.getenv('ANTHROPIC_API_KEY')
             if not api_key or not anthropic:
@@ -84,6 +182,10 @@ class handler(BaseHTTPRequestHandler):
                     "fallback": True
                 }
                 
+                if wants_stream(body, self.headers.get('Accept', '')):
+                    self.send_event_stream(query, chapter, topic, api_key, response=response_data)
+                    return
+                
                 self.send_response(200)
                 self.send_header('Content-Type', 'application/json')
                 self.send_header('Access-Control-Allow-Origin', '*')
@@ -91,8 +193,16 @@ class handler(BaseHTTPRequestHandler):
                 self.wfile.write(json.dumps(response_data).encode('utf-8'))
                 return
             
-            # Generate response
-            response = generate_tutor_response(query, chapter, topic, api_key)
+            # Serve repeated questions from the cache
+            response = find_cached_response(query, chapter, topic)
+            
+            if wants_stream(body, self.headers.get('Accept', '')):
+                self.send_event_stream(query, chapter, topic, api_key, response=response)
+                return
+            
+            if response is None:
+                # Generate response (or join an identical one in flight)
+                response = answer_query(query, chapter, topic, api_key)
             
             self.send_response(200)
             self.send_header('Content-Type', 'application/json')
@@ -102,32 +212,7 @@ class handler(BaseHTTPRequestHandler):
             
         except Exception as e:
             # Return a helpful fallback response instead of error
-            response_data = {
-                "error": False,
-                "response": f"""
-                <strong>Question: "{query}"</strong><br><br>
-                
-                <div style="background-color: #fec6c0; border-left: 4px solid #fd5441; padding: 12px; border-radius: 4px;">
-                <strong>⚠️ Temporary Service Issue</strong><br>
-                The AI tutor is experiencing a temporary issue. Don't worry - here are alternative resources!
-                </div><br>
-                
-                <strong>📚 Alternative Resources:</strong><br>
-                • <a href="formula_lookup.html" style="color: #399d3c; font-weight: 500;">Formula Lookup</a> - Quick reference for all formulas<br>
-                • <a href="tutor.html" style="color: #399d3c; font-weight: 500;">Chapter Pages</a> - Detailed explanations & examples<br>
-                • <a href="https://learn.hawkeslearning.com/" target="_blank" style="color: #399d3c; font-weight: 500;">Hawkes Learning</a> - Interactive practice & video tutorials<br><br>
-                
-                <strong>🎯 Study Strategy:</strong><br>
-                1. Review the relevant chapter page for formulas and examples<br>
-                2. Try practice problems in Hawkes Learning<br>
-                3. Use the formula lookup for quick reference<br>
-                4. If still stuck, reach out during office hours
-                """,
-                "timestamp": datetime.now().isoformat(),
-                "chapter": chapter,
-                "topic": topic,
-                "fallback": True
-            }
+            response_data = service_issue_response(query, chapter, topic)
             
             self.send_response(200)
             self.send_header('Content-Type', 'application/json')
@@ -135,32 +220,99 @@ class handler(BaseHTTPRequestHandler):
             self.end_headers()
             self.wfile.write(json.dumps(response_data).encode('utf-8'))
     
+    def send_event_stream(self, query, chapter, topic, api_key, response=None):
+        """Stream the answer as Server-Sent Events.
+        
+        A ready-made response (cache hit or setup fallback) is sent as a
+        single "done" event; otherwise tokens are forwarded as they arrive.
+        Identical questions streaming at the same time share one model
+        stream, and only the request that started it stores the answer.
+        """
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        
+        if response is not None:
+            events = [sse_event('done', response)]
+        else:
+            chunks, leader = single_flight.stream(
+                make_cache_key(query, chapter, topic),
+                lambda: stream_tutor_text(query, chapter, topic, api_key)
+            )
+            events = sse_response(
+                chunks,
+                fallback=service_issue_response(query, chapter, topic),
+                metadata={"chapter": chapter, "topic": topic},
+                on_complete=(lambda payload: remember_response(query, chapter, topic, payload)) if leader else None
+            )
+        
+        for event in events:
+            self.wfile.write(event)
+            self.wfile.flush()
+    
     def do_GET(self):
         """Handle GET requests."""
+        # GET /api/tutor?stats=1 reports pool counters for latency tuning
+        if 'stats' in parse_qs(urlsplit(self.path).query, keep_blank_values=True):
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(json.dumps({
+                "error": False,
+                "client_pool": pool_stats(),
+                "response_cache": response_cache.get_stats(),
+                "semantic_cache": semantic_cache.get_stats(),
+                "streaming": stream_stats(),
+                "single_flight": single_flight.get_stats(),
+                "calculator": calculator_stats(),
+                "timestamp": datetime.now().isoformat()
+            }).encode('utf-8'))
+            return
+        
         self.send_response(405)
         self.send_header('Content-Type', 'application/json')
         self.send_header('Access-Control-Allow-Origin', '*')
         self.end_headers()
         self.wfile.write(json.dumps({
             "error": True,
-            "message": "Method not allowed. Use POST to /api/tutor"
+            "message": "Method not allowed. Use POST to /api/tutor (or GET /api/tutor?stats=1)"
         }).encode('utf-8'))
 
-def generate_tutor_response(query, chapter, topic, api_key):
-    """Generate AI tutor response."""
-    client = anthropic.Anthropic(api_key=api_key)
-    
-    # Course structure
-    chapters = {
-        1: "Thinking Mathematically, Estimating, Problem Solving",
-        4: "Proportions, Percentages, and Ratios",
-        5: "Linear and Exponential Functions",
-        6: "Personal Finance (Interest, Saving, Borrowing)",
-        7: "Measurement and Conversions",
-        10: "Probability and Expected Value",
-        11: "Statistics and Data Analysis",
-        13: "Voting Methods and Apportionment"
+def service_issue_response(query, chapter, topic):
+    """Fallback answer shown when the AI service fails."""
+    return {
+        "error": False,
+        "response": f"""
+        <strong>Question: "{query}"</strong><br><br>
+        
+        <div style="background-color: #fec6c0; border-left: 4px solid #fd5441; padding: 12px; border-radius: 4px;">
+        <strong>⚠️ Temporary Service Issue</strong><br>
+        The AI tutor is experiencing a temporary issue. Don't worry - here are alternative resources!
+        </div><br>
+        
+        <strong>📚 Alternative Resources:</strong><br>
+        • <a href="formula_lookup.html" style="color: #399d3c; font-weight: 500;">Formula Lookup</a> - Quick reference for all formulas<br>
+        • <a href="tutor.html" style="color: #399d3c; font-weight: 500;">Chapter Pages</a> - Detailed explanations & examples<br>
+        • <a href="https://learn.hawkeslearning.com/" target="_blank" style="color: #399d3c; font-weight: 500;">Hawkes Learning</a> - Interactive practice & video tutorials<br><br>
+        
+        <strong>🎯 Study Strategy:</strong><br>
+        1. Review the relevant chapter page for formulas and examples<br>
+        2. Try practice problems in Hawkes Learning<br>
+        3. Use the formula lookup for quick reference<br>
+        4. If still stuck, reach out during office hours
+        """,
+        "timestamp": datetime.now().isoformat(),
+        "chapter": chapter,
+        "topic": topic,
+        "fallback": True
     }
+
+def build_tutor_prompt(query, chapter, topic):
+    """Build the tutoring prompt for a student question."""
+    chapters = CHAPTERS
     
     # Build context
     context = ""
@@ -193,6 +345,17 @@ Please provide:
 Be patient, clear, and encouraging. Use simple language and provide concrete examples.
 Keep responses concise but thorough (max 500 words).
 """
+    return prompt
+
+def stream_tutor_text(query, chapter, topic, api_key):
+    """Yield the tutor answer text as the model produces it."""
+    client = get_client(api_key)
+    yield from stream_model_text(client, build_tutor_prompt(query, chapter, topic))
+
+def generate_tutor_response(query, chapter, topic, api_key):
+    """Generate AI tutor response."""
+    client = get_client(api_key)
+    prompt = build_tutor_prompt(query, chapter, topic)
     
     try:
         response = client.messages.create(
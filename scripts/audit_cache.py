@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Incremental Audit Cache
+Remembers per-page audit results keyed on the page's content hash, so the
+checkers only re-audit pages that actually changed.
+
+Each tool (accessibility, links, ...) gets its own section in
+.audit_cache.json under the audited base directory. A section is thrown
+away whenever the tool's rule-set fingerprint changes: the fingerprint
+covers the source of every rule class and the checker's thresholds, so
+editing a rule invalidates old findings without anyone bumping a version.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import time
+from pathlib import Path
+
+CACHE_FILENAME = ".audit_cache.json"
+CACHE_VERSION = 1
+
+
+def content_digest(text):
+    return hashlib.sha256(text.encode('utf-8', errors='surrogatepass')).hexdigest()
+
+
+def ruleset_fingerprint(*parts):
+    """Hash of rule classes (their source code) and any JSON-serializable settings."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if inspect.isclass(part) or inspect.isfunction(part):
+            try:
+                digest.update(inspect.getsource(part).encode('utf-8'))
+            except (OSError, TypeError):
+                digest.update(part.__qualname__.encode('utf-8'))
+        elif hasattr(part, '__dict__') and not isinstance(part, type):
+            # Rule instance: its class source plus its configuration
+            digest.update(inspect.getsource(type(part)).encode('utf-8'))
+            digest.update(json.dumps(vars(part), sort_keys=True, default=str).encode('utf-8'))
+        else:
+            digest.update(json.dumps(part, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+class AuditCache:
+    """Per-tool {relative path: {'hash', 'results', 'checked_at'}} store.
+
+    enabled=False neither reads nor writes the cache file. reuse=False is a
+    refresh: nothing cached is returned, but the fresh results are saved.
+    """
+
+    def __init__(self, base_dir, tool, fingerprint, enabled=True, reuse=True):
+        self.base_dir = Path(base_dir)
+        self.path = self.base_dir / CACHE_FILENAME
+        self.tool = tool
+        self.fingerprint = fingerprint
+        self.enabled = enabled
+        self.reuse = reuse
+        self.stats = {"hits": 0, "misses": 0}
+        self.data = {"version": CACHE_VERSION, "tools": {}}
+        if enabled and self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get("version") == CACHE_VERSION:
+                    self.data = data
+            except (OSError, ValueError):
+                pass
+
+        section = self.data["tools"].get(tool)
+        if not section or section.get("fingerprint") != fingerprint:
+            section = {"fingerprint": fingerprint, "files": {}}
+        self.files = section["files"]
+        self.seen = set()
+
+    def key(self, file_path):
+        try:
+            return os.path.relpath(file_path, self.base_dir)
+        except ValueError:
+            return str(file_path)
+
+    def get(self, file_path, digest):
+        """Cached results for this exact content, or None."""
+        key = self.key(file_path)
+        self.seen.add(key)
+        entry = self.files.get(key) if self.enabled and self.reuse else None
+        if entry and entry["hash"] == digest:
+            self.stats["hits"] += 1
+            return entry["results"]
+        self.stats["misses"] += 1
+        return None
+
+    def entry(self, file_path):
+        return self.files.get(self.key(file_path))
+
+    def put(self, file_path, digest, results, checked_at=None):
+        key = self.key(file_path)
+        self.seen.add(key)
+        self.files[key] = {"hash": digest, "results": results, "checked_at": checked_at or time.time()}
+
+    def save(self):
+        """Write the cache, dropping pages that weren't part of this run."""
+        if not self.enabled:
+            return
+        self.data["tools"][self.tool] = {
+            "fingerprint": self.fingerprint,
+            "files": {key: entry for key, entry in self.files.items() if key in self.seen}
+        }
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Apportionment Benchmark
+Compares api/_apportionment.py with a naive pure-Python version of the
+textbook procedure. The naive version loops over the states in Python and
+looks for the modified divisor by trial and error: it starts at the
+standard divisor, steps in whichever direction fixes the total, and
+shrinks the step each time it overshoots.
+
+Both implementations must agree on every allocation before any timing is
+reported, and the modified divisor shown to students must reproduce it.
+
+Usage: python scripts/benchmark_apportionment.py [states] [seats]
+    states  number of states (default: 50, 500, 5000, 50000)
+    seats   house size (default: 10 per state)
+"""
+
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "api"))
+from _apportionment import METHODS, apportion, divisor_method, hamilton, round_quotas
+
+RUNS = 5
+SEED = 143
+
+
+def naive_round(quota, method):
+    if method == 'jefferson':
+        return math.floor(quota)
+    if method == 'adams':
+        return math.ceil(quota)
+    if method == 'webster':
+        return math.floor(quota + 0.5)
+    lower = math.floor(quota)
+    return lower + 1 if quota >= math.sqrt(lower * (lower + 1)) else lower
+
+
+def naive_apportion(populations, seats, method):
+    """The procedure as taught: loops over states, divisor found by trial and error."""
+    standard_divisor = sum(populations) / seats
+    if method == 'hamilton':
+        quotas = [p / standard_divisor for p in populations]
+        allocation = [math.floor(q) for q in quotas]
+        leftover = seats - sum(allocation)
+        by_remainder = sorted(range(len(quotas)), key=lambda i: -(quotas[i] - allocation[i]))
+        for i in by_remainder[:leftover]:
+            allocation[i] += 1
+        return allocation
+
+    divisor = standard_divisor
+    step = standard_divisor / 100
+    direction = 0
+    for _ in range(100000):
+        allocation = [naive_round(p / divisor, method) for p in populations]
+        total = sum(allocation)
+        if total == seats:
+            return allocation
+        new_direction = 1 if total > seats else -1
+        if direction and new_direction != direction:
+            step /= 2
+        direction = new_direction
+        divisor += direction * step
+    raise RuntimeError(f"{method}: no divisor found")
+
+
+def random_states(count, seed=SEED):
+    rng = random.Random(seed)
+    # Log-uniform populations: a few big states and many small ones, like the census
+    return [round(10 ** rng.uniform(4.5, 7.5)) for _ in range(count)]
+
+
+def best_time(fn, runs=RUNS):
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - started)
+    return min(times), result
+
+
+def main():
+    sizes = [int(sys.argv[1])] if len(sys.argv) > 1 else [50, 500, 5000, 50000]
+    print(f"📊 Apportionment benchmark (best of {RUNS})")
+    print(f"{'states':>8}{'seats':>8}  {'method':<17}{'naive loop':>12}{'allocation':>12}{'speedup':>10}{'with table':>12}")
+    for count in sizes:
+        seats = int(sys.argv[2]) if len(sys.argv) > 2 else 10 * count
+        populations = random_states(count)
+        for method in METHODS:
+            naive_seconds, expected = best_time(lambda: naive_apportion(populations, seats, method))
+            if method == 'hamilton':
+                engine_seconds, (allocation, _) = best_time(lambda: hamilton(populations, seats))
+            else:
+                engine_seconds, (allocation, _) = best_time(lambda: divisor_method(populations, seats, method))
+            table_seconds, result = best_time(lambda: apportion(populations, seats, method))
+            if allocation.tolist() != expected or result["table"]["seats"] != expected:
+                print(f"❌ {method}: allocations differ for {count} states")
+                sys.exit(1)
+            divisor = result.get("modified_divisor")
+            if divisor is not None and round_quotas(np.array(populations) / divisor, method).astype(int).tolist() != expected:
+                print(f"❌ {method}: modified divisor {divisor} does not reproduce the allocation for {count} states")
+                sys.exit(1)
+            print(f"{count:>8}{seats:>8}  {method:<17}{naive_seconds * 1000:>9.2f} ms{engine_seconds * 1000:>9.2f} ms"
+                  f"{naive_seconds / max(engine_seconds, 1e-9):>9.1f}x{table_seconds * 1000:>9.2f} ms")
+    print("\n✅ Engine and naive loop agree on every allocation, and every modified divisor reproduces it")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Knowledge Base Loading Benchmark
+Compares cold-start time and memory of the JSON knowledge base against the
+memory-mapped .kbin build used by api/enhanced_ai_tutor.py.
+
+Each measurement runs in a fresh Python process so nothing is warm.
+Usage: python scripts/benchmark_kb_loading.py [scale]
+    scale  repeat the knowledge base content N times to simulate growth (default 1)
+"""
+
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+API_DIR = ROOT / "api"
+RUNS = 5
+
+sys.path.insert(0, str(API_DIR))
+from _kb_binary import write_kb
+
+# Load the knowledge base and answer one typical lookup, then report
+# elapsed seconds and peak RSS (ru_maxrss is KB on Linux, bytes on macOS).
+CHILD_CODE = r'''
+import json, resource, sys, time
+sys.path.insert(0, {api_dir!r})
+started = time.perf_counter()
+if {fmt!r} == 'json':
+    with open({path!r}, 'r', encoding='utf-8') as f:
+        kb = json.load(f)
+else:
+    from _kb_binary import open_kb
+    # Checked against its JSON, as load_knowledge_base does
+    kb = open_kb({path!r}, source={source!r})
+formulas = kb.get('math', {{}}).get('formulas', {{}})
+first = next(iter(formulas.values()), None)
+elapsed = time.perf_counter() - started
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform == 'darwin':
+    rss //= 1024
+print(json.dumps({{"seconds": elapsed, "rss_kb": rss}}))
+'''
+
+BASELINE_CODE = r'''
+import json, resource, sys
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform == 'darwin':
+    rss //= 1024
+print(json.dumps({"seconds": 0.0, "rss_kb": rss}))
+'''
+
+
+def find_source_json():
+    """Locate the enhanced knowledge base the API would load."""
+    for candidate in [
+        ROOT / "ai_knowledge_base_enhanced.json",
+        ROOT / "docs" / "archive" / "ai_knowledge_base_enhanced.json"
+    ]:
+        if candidate.exists():
+            return candidate
+    raise FileNotFoundError("ai_knowledge_base_enhanced.json not found")
+
+
+def scale_knowledge_base(kb, scale):
+    """Repeat every section `scale` times under suffixed keys."""
+    if scale <= 1:
+        return kb
+
+    def grow(section):
+        if not isinstance(section, dict):
+            return section
+        grown = {}
+        for key, value in section.items():
+            for i in range(scale):
+                grown[f"{key}_{i}" if i else key] = value
+        return grown
+
+    return {top: {name: grow(section) for name, section in value.items()} if isinstance(value, dict) else value
+            for top, value in kb.items()}
+
+
+def run_child(code):
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return json.loads(output.stdout)
+
+
+def measure(fmt, path):
+    code = CHILD_CODE.format(api_dir=str(API_DIR), fmt=fmt, path=str(path), source=str(path.with_suffix('.json')))
+    runs = [run_child(code) for _ in range(RUNS)]
+    runs.sort(key=lambda r: r["seconds"])
+    return runs[len(runs) // 2]
+
+
+def main():
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    source = find_source_json()
+    with open(source, 'r', encoding='utf-8') as f:
+        kb = scale_knowledge_base(json.load(f), scale)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = Path(tmp) / "kb.json"
+        kbin_path = Path(tmp) / "kb.kbin"
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(kb, f, ensure_ascii=False)
+        write_kb(kb, kbin_path, source=json_path)
+
+        baseline = run_child(BASELINE_CODE)["rss_kb"]
+        results = {fmt: measure(fmt, path) for fmt, path in [('json', json_path), ('kbin', kbin_path)]}
+        sizes = {'json': json_path.stat().st_size, 'kbin': kbin_path.stat().st_size}
+
+    print(f"📊 Knowledge base loading benchmark (source: {source.name}, scale x{scale}, median of {RUNS})")
+    print(f"{'format':<8}{'file size':>14}{'load + lookup':>16}{'RSS over python':>18}")
+    for fmt, result in results.items():
+        print(f"{fmt:<8}{sizes[fmt] / 1024:>11.1f} KB{result['seconds'] * 1000:>13.2f} ms"
+              f"{(result['rss_kb'] - baseline) / 1024:>15.2f} MB")
+
+    ratio = results['json']['seconds'] / max(results['kbin']['seconds'], 1e-9)
+    print(f"\n⚡ json.load takes {ratio:.1f}x the time of the .kbin load (includes importing the reader)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Voting Methods Benchmark
+Counts a synthetic election with api/_voting.py and with a naive per-ballot
+loop, checks that both agree, and reports the timings.
+
+The synthetic profile draws ballots from all rankings of the candidates with
+Zipf-like popularity, and cuts a share of them short (partial rankings), so
+every method has realistic ties, exhausted ballots and several IRV rounds.
+
+Usage: python scripts/benchmark_voting.py [ballots] [candidates]
+    ballots     number of voters (default 1,000,000)
+    candidates  number of candidates (default 5)
+"""
+
+import itertools
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "api"))
+from _voting import METHODS, PreferenceSchedule
+
+SEED = 143
+TRUNCATED_SHARE = 0.2
+
+
+def synthetic_ballots(voters, candidates, seed=SEED):
+    """int array (voters x candidates) of rankings, -1 after a ballot's last choice."""
+    rng = np.random.default_rng(seed)
+    rankings = np.array(list(itertools.permutations(range(candidates))), dtype=np.int64)
+    popularity = 1.0 / np.arange(1, len(rankings) + 1)
+    rng.shuffle(popularity)
+    ballots = rankings[rng.choice(len(rankings), size=voters, p=popularity / popularity.sum())]
+    truncated = rng.random(voters) < TRUNCATED_SHARE
+    lengths = rng.integers(1, candidates, size=voters)
+    columns = np.arange(candidates)[None, :]
+    ballots[truncated[:, None] & (columns >= lengths[:, None])] = -1
+    return ballots
+
+
+# ---------------------------------------------------------------------------
+# Naive reference: one Python loop over every ballot per count
+# ---------------------------------------------------------------------------
+
+def naive_plurality(ballots, n):
+    tally = [0] * n
+    for ballot in ballots:
+        tally[ballot[0]] += 1
+    return tally
+
+
+def naive_borda(ballots, n):
+    scores = [0] * n
+    for ballot in ballots:
+        for place, candidate in enumerate(ballot):
+            scores[candidate] += n - place
+    return scores
+
+
+def naive_irv(ballots, n):
+    active = set(range(n))
+    rounds = []
+    while True:
+        tally = {c: 0 for c in active}
+        exhausted = 0
+        for ballot in ballots:
+            for candidate in ballot:
+                if candidate in active:
+                    tally[candidate] += 1
+                    break
+            else:
+                exhausted += 1
+        rounds.append(tally)
+        needed = (len(ballots) - exhausted) // 2 + 1
+        leader = max(tally, key=tally.get)
+        if tally[leader] >= needed:
+            return rounds, [leader]
+        lowest = min(tally.values())
+        eliminated = {c for c, votes in tally.items() if votes == lowest}
+        if eliminated == active:
+            return rounds, sorted(active)
+        active -= eliminated
+        if len(active) == 1:
+            return rounds, sorted(active)
+
+
+def naive_pairwise(ballots, n):
+    matrix = [[0] * n for _ in range(n)]
+    for ballot in ballots:
+        ranked = list(ballot)
+        unranked = [c for c in range(n) if c not in ranked]
+        for place, candidate in enumerate(ranked):
+            for other in ranked[place + 1:] + unranked:
+                matrix[candidate][other] += 1
+    return matrix
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def main():
+    voters = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    array = synthetic_ballots(voters, n)
+    ballots = [[int(c) for c in row if c >= 0] for row in array]
+
+    compress_seconds, schedule = timed(lambda: PreferenceSchedule.from_array(array))
+    print(f"📊 Voting benchmark: {voters:,} ballots, {n} candidates, "
+          f"{len(schedule.counts)} unique rankings (compressed in {compress_seconds * 1000:.1f} ms)")
+    print(f"{'method':<12}{'naive loop':>14}{'schedule':>12}{'speedup':>10}")
+
+    naive = {
+        'plurality': lambda: naive_plurality(ballots, n),
+        'borda': lambda: naive_borda(ballots, n),
+        'irv': lambda: naive_irv(ballots, n),
+        'pairwise': lambda: naive_pairwise(ballots, n)
+    }
+    for method in METHODS:
+        naive_seconds, expected = timed(naive[method])
+        engine_seconds, result = timed(lambda: schedule.run(method))
+        names = schedule.candidates
+        if method == 'plurality':
+            agree = list(result['tally'].values()) == expected
+        elif method == 'borda':
+            agree = list(result['scores'].values()) == expected
+        elif method == 'irv':
+            rounds, winners = expected
+            agree = ([{names[c]: v for c, v in sorted(r.items())} for r in rounds] == [r['tally'] for r in result['rounds']]
+                     and [names[c] for c in winners] == result['winners'])
+        else:
+            agree = schedule.pairwise_matrix().tolist() == expected
+        if not agree:
+            print(f"❌ {method}: schedule result differs from the naive count")
+            sys.exit(1)
+        print(f"{method:<12}{naive_seconds * 1000:>11.1f} ms{engine_seconds * 1000:>9.2f} ms"
+              f"{naive_seconds / max(engine_seconds, 1e-9):>9.0f}x")
+
+    print("\n✅ Schedule results match the naive per-ballot counts (compression is paid once for all methods)")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,137 +6,40 @@ Validates WCAG 2.1 AA compliance, color contrast, and ADHD-friendly design patte
 
 import os
 import re
+import sys
 import json
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional
 import colorsys
 
-class AccessibilityChecker:
-    def __init__(self, base_dir="."):
-        self.base_dir = Path(base_dir)
-        self.results = {
-            'contrast_issues': [],
-            'adhd_issues': [],
-            'accessibility_issues': [],
-            'summary': {}
-        }
-        
-        # WCAG 2.1 AA contrast ratios
-        self.contrast_requirements = {
-            'normal_text': 4.5,  # AA standard
-            'large_text': 3.0,   # AA standard for 18pt+ or 14pt+ bold
-            'ui_components': 3.0  # UI components and graphical objects
-        }
-        
-        # ADHD-friendly design patterns to check
-        self.adhd_patterns = {
-            'max_paragraph_length': 150,  # characters
-            'max_line_length': 75,        # characters
-            'min_heading_spacing': 2,     # lines between headings and content
-            'max_text_block_length': 500  # characters without breaks
-        }
+import audit_cache
+import color_engine
+import html_document
+from rule_engine import Rule, RuleEngine
 
-    def find_html_files(self):
-        """Find all HTML files in the project."""
-        html_files = []
-        for pattern in ['*.html', '**/*.html']:
-            html_files.extend(self.base_dir.glob(pattern))
-        return [f for f in html_files if f.is_file()]
 
-    def hex_to_rgb(self, hex_color: str) -> Tuple[int, int, int]:
-        """Convert hex color to RGB tuple."""
-        hex_color = hex_color.lstrip('#')
-        if len(hex_color) == 3:
-            hex_color = ''.join([c*2 for c in hex_color])
-        return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+# Bump when issue formats change in ways the rule fingerprint can't see
+RULESET_VERSION = 1
 
-    def rgb_to_relative_luminance(self, rgb: Tuple[int, int, int]) -> float:
-        """Calculate relative luminance of an RGB color."""
-        def linearize(c):
-            c = c / 255.0
-            return c / 12.92 if c <= 0.03928 else ((c + 0.055) / 1.055) ** 2.4
-        
-        r, g, b = [linearize(c) for c in rgb]
-        return 0.2126 * r + 0.7152 * g + 0.0722 * b
 
-    def calculate_contrast_ratio(self, color1: str, color2: str) -> float:
-        """Calculate contrast ratio between two colors."""
-        try:
-            rgb1 = self.hex_to_rgb(color1)
-            rgb2 = self.hex_to_rgb(color2)
-            
-            lum1 = self.rgb_to_relative_luminance(rgb1)
-            lum2 = self.rgb_to_relative_luminance(rgb2)
-            
-            lighter = max(lum1, lum2)
-            darker = min(lum1, lum2)
-            
-            return (lighter + 0.05) / (darker + 0.05)
-        except:
-            return 0.0
+def page_css(page, index, token):
+    """CSS carried by an element: a <style> body and/or a style="" attribute."""
+    css = []
+    if token.tag == 'style':
+        css.append(page.document.inner_source(index))
+    if token.attrs.get('style'):
+        css.append(token.attrs['style'])
+    return css
 
-    def extract_css_colors(self, content: str) -> List[Dict]:
-        """Extract color information from CSS content."""
-        colors = []
-        
-        # Find color declarations
-        color_patterns = [
-            r'color\s*:\s*([^;]+)',
-            r'background-color\s*:\s*([^;]+)',
-            r'background\s*:\s*([^;]+)',
-            r'border-color\s*:\s*([^;]+)',
-            r'--[^:]+:\s*([^;]+)'
-        ]
-        
-        for pattern in color_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            for match in matches:
-                # Extract hex colors
-                hex_colors = re.findall(r'#([0-9a-fA-F]{3,6})', match)
-                for hex_color in hex_colors:
-                    colors.append({
-                        'type': 'hex',
-                        'value': f'#{hex_color}',
-                        'context': match.strip()
-                    })
-        
-        return colors
 
-    def extract_text_styles(self, html_content: str) -> List[Dict]:
-        """Extract text styling information from HTML."""
-        text_styles = []
-        
-        # Find text elements with styling
-        text_patterns = [
-            r'<(\w+)[^>]*class="([^"]*)"[^>]*>([^<]+)</\1>',
-            r'<(\w+)[^>]*style="([^"]*)"[^>]*>([^<]+)</\1>'
-        ]
-        
-        for pattern in text_patterns:
-            matches = re.findall(pattern, html_content, re.IGNORECASE | re.DOTALL)
-            for tag, styling, text in matches:
-                if len(text.strip()) > 0:
-                    text_styles.append({
-                        'tag': tag,
-                        'styling': styling,
-                        'text': text.strip(),
-                        'length': len(text.strip())
-                    })
-        
-        return text_styles
+class KnownContrastPairsRule(Rule):
+    """Design palette pairs known to fall below WCAG AA (reported for every page)."""
 
-    def check_contrast_issues(self, html_file: Path):
-        """Check for contrast issues in an HTML file."""
-        try:
-            with open(html_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except:
-            return
-        
-        # Extract CSS colors
-        css_colors = self.extract_css_colors(content)
-        
+    category = 'contrast_issues'
+
+    def __init__(self, checker):
         # Common problematic color combinations
         problematic_combinations = [
             ('#ffffff', '#faf7f0'),  # White on cream
@@ -144,165 +47,321 @@ class AccessibilityChecker:
             ('#ffffff', '#e2e8f0'),  # White on light blue-gray
             ('#000000', '#2d3748'),  # Black on dark gray (might be too close)
         ]
-        
+        required = checker.contrast_requirements['normal_text']
+        self.failing = []
         for fg_color, bg_color in problematic_combinations:
-            contrast_ratio = self.calculate_contrast_ratio(fg_color, bg_color)
-            
-            if contrast_ratio < self.contrast_requirements['normal_text']:
-                self.results['contrast_issues'].append({
-                    'file': str(html_file),
+            contrast_ratio = checker.calculate_contrast_ratio(fg_color, bg_color)
+            if contrast_ratio < required:
+                self.failing.append({
                     'issue': 'Low contrast',
                     'foreground': fg_color,
                     'background': bg_color,
                     'contrast_ratio': round(contrast_ratio, 2),
-                    'required_ratio': self.contrast_requirements['normal_text'],
+                    'required_ratio': required,
                     'severity': 'high' if contrast_ratio < 3.0 else 'medium'
                 })
 
-    def check_adhd_accessibility(self, html_file: Path):
-        """Check for ADHD accessibility issues."""
-        try:
-            with open(html_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except:
-            return
-        
-        # Extract text content
-        text_styles = self.extract_text_styles(content)
-        
-        # Check for long paragraphs
-        for text_style in text_styles:
-            text = text_style['text']
+    def finish(self, page):
+        for issue in self.failing:
+            page.report(self.category, {'file': str(page.file_path), **issue})
+
+
+class LongTextRule(Rule):
+    """ADHD: paragraphs and text blocks that are too long to scan."""
+
+    category = 'adhd_issues'
+
+    def __init__(self, checker):
+        self.max_paragraph_length = checker.adhd_patterns['max_paragraph_length']
+        self.max_text_block_length = checker.adhd_patterns['max_text_block_length']
+
+    def finish(self, page):
+        for block in page.document.text_blocks():
+            if block.tag in html_document.HEADING_TAGS:
+                continue
+            text = block.text
             
             # Check paragraph length
-            if len(text) > self.adhd_patterns['max_paragraph_length']:
-                self.results['adhd_issues'].append({
-                    'file': str(html_file),
+            if len(text) > self.max_paragraph_length:
+                page.report(self.category, {
+                    'file': str(page.file_path),
                     'issue': 'Long paragraph',
                     'text_preview': text[:100] + '...' if len(text) > 100 else text,
                     'length': len(text),
-                    'max_recommended': self.adhd_patterns['max_paragraph_length'],
+                    'max_recommended': self.max_paragraph_length,
+                    'section': ' > '.join(block.headings),
                     'severity': 'medium'
                 })
             
             # Check for long text blocks without breaks
-            if len(text) > self.adhd_patterns['max_text_block_length']:
-                # Count line breaks and headings
-                line_breaks = text.count('\n') + text.count('<br>')
+            if len(text) > self.max_text_block_length:
+                # Count line breaks (<br> comes through as a newline)
+                line_breaks = text.count('\n')
                 if line_breaks < 3:  # Not enough breaks
-                    self.results['adhd_issues'].append({
-                        'file': str(html_file),
+                    page.report(self.category, {
+                        'file': str(page.file_path),
                         'issue': 'Large text block without breaks',
                         'text_preview': text[:100] + '...' if len(text) > 100 else text,
                         'length': len(text),
                         'line_breaks': line_breaks,
+                        'section': ' > '.join(block.headings),
                         'severity': 'high'
                     })
 
-    def check_accessibility_patterns(self, html_file: Path):
-        """Check for general accessibility issues."""
-        try:
-            with open(html_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except:
+
+class ImageAltRule(Rule):
+    category = 'accessibility_issues'
+    tags = ('img',)
+
+    def element(self, page, index, token):
+        if not token.attrs.get('alt', '').strip():
+            page.report(self.category, {
+                'file': str(page.file_path),
+                'issue': 'Missing alt text',
+                'image_src': token.attrs.get('src', ''),
+                'severity': 'high'
+            })
+
+
+class HeadingOrderRule(Rule):
+    category = 'accessibility_issues'
+    tags = html_document.HEADING_TAGS
+
+    def start(self, page):
+        page.state[self.name] = None
+
+    def element(self, page, index, token):
+        level = int(token.tag[1])
+        previous = page.state[self.name]
+        if previous is not None and level - previous > 1:
+            page.report(self.category, {
+                'file': str(page.file_path),
+                'issue': 'Skipped heading level',
+                'current_level': previous,
+                'next_level': level,
+                'severity': 'medium'
+            })
+        page.state[self.name] = level
+
+
+class FormLabelRule(Rule):
+    """Text inputs need their own <label for="id"> or an aria label."""
+
+    category = 'accessibility_issues'
+    tags = ('input', 'label')
+
+    def start(self, page):
+        page.state[self.name] = {'inputs': [], 'labelled_ids': set()}
+
+    def element(self, page, index, token):
+        state = page.state[self.name]
+        if token.tag == 'label':
+            if token.attrs.get('for'):
+                state['labelled_ids'].add(token.attrs['for'])
+        elif token.attrs.get('type', 'text').lower() in ['text', 'email', 'password', 'number']:
+            state['inputs'].append(token)
+
+    def finish(self, page):
+        state = page.state[self.name]
+        for field in state['inputs']:
+            if field.attrs.get('id') in state['labelled_ids'] or field.attrs.get('aria-label') or field.attrs.get('aria-labelledby'):
+                continue
+            page.report(self.category, {
+                'file': str(page.file_path),
+                'issue': 'Form input without label',
+                'input_type': field.attrs.get('type', 'text'),
+                'severity': 'high'
+            })
+
+
+class DesignFontRule(Rule):
+    """Pages that set fonts should use Vend Sans."""
+
+    category = 'accessibility_issues'
+    tags = ('style',)
+    attributes = ('style',)
+
+    def start(self, page):
+        page.state[self.name] = []
+
+    def element(self, page, index, token):
+        page.state[self.name].extend(page_css(page, index, token))
+
+    def finish(self, page):
+        css = '\n'.join(page.state[self.name])
+        lowered = css.lower()
+        if 'font-family' not in lowered or 'vend sans' in lowered or 'vend-sans' in lowered:
             return
-        
-        # Check for missing alt text on images
-        img_pattern = r'<img[^>]*src="([^"]*)"[^>]*(?:alt="([^"]*)")?[^>]*>'
-        img_matches = re.findall(img_pattern, content, re.IGNORECASE)
-        
-        for src, alt in img_matches:
-            if not alt or alt.strip() == '':
-                self.results['accessibility_issues'].append({
-                    'file': str(html_file),
-                    'issue': 'Missing alt text',
-                    'image_src': src,
-                    'severity': 'high'
+        for font in re.findall(r'font-family\s*:\s*([^;]+)', css, re.IGNORECASE):
+            if 'vend' not in font.lower():
+                page.report(self.category, {
+                    'file': str(page.file_path),
+                    'issue': 'Font not compliant with design system',
+                    'current_font': font.strip(),
+                    'expected_font': 'Vend Sans',
+                    'severity': 'low'
                 })
+
+
+class HardcodedColorRule(Rule):
+    """Colors should come from design tokens, not hex literals."""
+
+    category = 'accessibility_issues'
+    tags = ('style',)
+    attributes = ('style',)
+    color_pattern = re.compile(r'color\s*:\s*([^;]+)', re.IGNORECASE)
+
+    def element(self, page, index, token):
+        for css in page_css(page, index, token):
+            for color in self.color_pattern.findall(css):
+                if re.match(r'#[0-9a-fA-F]{3,6}', color.strip()):
+                    page.report(self.category, {
+                        'file': str(page.file_path),
+                        'issue': 'Hardcoded color instead of design token',
+                        'color': color.strip(),
+                        'severity': 'low'
+                    })
+
+
+class AccessibilityChecker:
+    def __init__(self, base_dir="."):
+        self.base_dir = Path(base_dir)
+        self.results = {
+            'contrast_issues': [],
+            'adhd_issues': [],
+            'accessibility_issues': [],
+            'summary': {}
+        }
         
-        # Check for proper heading hierarchy
-        heading_pattern = r'<h([1-6])[^>]*>([^<]+)</h[1-6]>'
-        headings = re.findall(heading_pattern, content, re.IGNORECASE)
+        # WCAG 2.1 AA contrast ratios
+        self.contrast_requirements = {
+            'normal_text': 4.5,  # AA standard
+            'large_text': 3.0,   # AA standard for 18pt+ or 14pt+ bold
+            'ui_components': 3.0  # UI components and graphical objects
+        }
         
-        if headings:
-            levels = [int(h[0]) for h in headings]
-            # Check for skipped heading levels
-            for i in range(len(levels) - 1):
-                if levels[i+1] - levels[i] > 1:
-                    self.results['accessibility_issues'].append({
-                        'file': str(html_file),
-                        'issue': 'Skipped heading level',
-                        'current_level': levels[i],
-                        'next_level': levels[i+1],
-                        'severity': 'medium'
-                    })
+        # ADHD-friendly design patterns to check
+        self.adhd_patterns = {
+            'max_paragraph_length': 150,  # characters
+            'max_line_length': 75,        # characters
+            'min_heading_spacing': 2,     # lines between headings and content
+            'max_text_block_length': 500  # characters without breaks
+        }
         
-        # Check for form labels
-        input_pattern = r'<input[^>]*type="([^"]*)"[^>]*>'
-        inputs = re.findall(input_pattern, content, re.IGNORECASE)
+        # Token palette luminance is computed once and shared by every rule
+        self.colors = color_engine.default_engine()
         
-        for input_type in inputs:
-            if input_type.lower() in ['text', 'email', 'password', 'number']:
-                # Check if there's a corresponding label
-                if not re.search(r'<label[^>]*for="[^"]*"[^>]*>', content, re.IGNORECASE):
-                    self.results['accessibility_issues'].append({
-                        'file': str(html_file),
-                        'issue': 'Form input without label',
-                        'input_type': input_type,
-                        'severity': 'high'
-                    })
+        # Every rule runs in the same single pass over each page
+        self.engine = RuleEngine(self.build_rules())
+
+    def build_rules(self):
+        """Rules run by run_check; add new checks here."""
+        return [
+            KnownContrastPairsRule(self),
+            LongTextRule(self),
+            ImageAltRule(),
+            HeadingOrderRule(),
+            FormLabelRule(),
+            DesignFontRule(),
+            HardcodedColorRule()
+        ]
 
-    def check_design_system_compliance(self, html_file: Path):
-        """Check compliance with the design system requirements."""
+    def audit_file(self, html_file: Path):
+        """Run every rule over one file; returns {category: [issues]}."""
         try:
-            with open(html_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            document = html_document.load_document(html_file)
         except:
-            return
-        
-        # Check for Vend Sans font usage (as specified in rules)
-        if 'font-family' in content.lower():
-            if 'vend sans' not in content.lower() and 'vend-sans' not in content.lower():
-                # Check if it's using the correct font
-                font_matches = re.findall(r'font-family\s*:\s*([^;]+)', content, re.IGNORECASE)
-                for font in font_matches:
-                    if 'vend' not in font.lower():
-                        self.results['accessibility_issues'].append({
-                            'file': str(html_file),
-                            'issue': 'Font not compliant with design system',
-                            'current_font': font.strip(),
-                            'expected_font': 'Vend Sans',
-                            'severity': 'low'
-                        })
-        
-        # Check for proper color usage (should use design tokens)
-        color_pattern = r'color\s*:\s*([^;]+)'
-        colors = re.findall(color_pattern, content, re.IGNORECASE)
-        
-        for color in colors:
-            # Check for hardcoded colors instead of design tokens
-            if re.match(r'#[0-9a-fA-F]{3,6}', color.strip()):
-                self.results['accessibility_issues'].append({
-                    'file': str(html_file),
-                    'issue': 'Hardcoded color instead of design token',
-                    'color': color.strip(),
-                    'severity': 'low'
-                })
+            return {}
+        return self.engine.run(document, html_file)
+
+    def check_file(self, html_file: Path):
+        """Audit one file and merge the issues into self.results."""
+        self.merge_issues(self.audit_file(html_file))
+
+    def merge_issues(self, issues):
+        for category, category_issues in issues.items():
+            self.results[category].extend(category_issues)
+
+    def find_html_files(self):
+        """Find all HTML files in the project."""
+        return html_document.find_html_files(self.base_dir)
 
-    def run_check(self):
-        """Run the complete accessibility check."""
+    def hex_to_rgb(self, hex_color: str) -> Tuple[int, int, int]:
+        """Convert hex color to RGB tuple."""
+        rgb = color_engine.parse_color(hex_color if hex_color.startswith('#') else '#' + hex_color)
+        if rgb is None:
+            raise ValueError(f"Invalid hex color: {hex_color}")
+        return rgb
+
+    def rgb_to_relative_luminance(self, rgb: Tuple[int, int, int]) -> float:
+        """Calculate relative luminance of an RGB color (memoized)."""
+        return color_engine.rgb_luminance(tuple(rgb))
+
+    def calculate_contrast_ratio(self, color1: str, color2: str) -> float:
+        """Calculate contrast ratio between two colors."""
+        return color_engine.contrast_ratio(color1, color2)
+
+    def ruleset_fingerprint(self):
+        """Changes whenever a rule, its settings or RULESET_VERSION changes."""
+        return audit_cache.ruleset_fingerprint(RULESET_VERSION, page_css, *self.engine.rules)
+
+    def run_check(self, workers=1, incremental=True):
+        """Run the complete accessibility check.
+        
+        With workers > 1 files are audited in a process pool; results are
+        merged in file order, so reports match a serial run. With
+        incremental=True pages whose content hasn't changed since the last
+        run reuse their cached findings (see audit_cache.py); a full run
+        audits every page and refreshes the cache with the results.
+        """
         print("♿ Starting accessibility check for Kristina's Academic Success Dashboard")
         print("=" * 70)
         
         html_files = self.find_html_files()
         print(f"📄 Found {len(html_files)} HTML files to check")
         
-        for html_file in html_files:
-            print(f"🔍 Checking {html_file.name}...")
-            self.check_contrast_issues(html_file)
-            self.check_adhd_accessibility(html_file)
-            self.check_accessibility_patterns(html_file)
-            self.check_design_system_compliance(html_file)
+        cache = audit_cache.AuditCache(self.base_dir, 'accessibility', self.ruleset_fingerprint(), reuse=incremental)
+        file_issues = [None] * len(html_files)
+        digests = [None] * len(html_files)
+        pending = []
+        for i, html_file in enumerate(html_files):
+            try:
+                digests[i] = audit_cache.content_digest(html_document.load_document(html_file).source)
+            except Exception:
+                pending.append(i)
+                continue
+            cached = cache.get(html_file, digests[i])
+            if cached is None:
+                pending.append(i)
+            else:
+                # Cached findings carry the path from the run that produced them
+                file_issues[i] = {category: [{**issue, 'file': str(html_file)} for issue in issues]
+                                  for category, issues in cached.items()}
+        if incremental:
+            print(f"♻️  {len(html_files) - len(pending)} unchanged files reuse cached results, {len(pending)} to audit")
+        
+        pending_files = [html_files[i] for i in pending]
+        if workers > 1 and len(pending_files) > 1:
+            print(f"⚡ Auditing with {workers} worker processes")
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(str(self.base_dir),)) as pool:
+                chunksize = max(1, len(pending_files) // (workers * 4))
+                for i, (issues, timings) in zip(pending, pool.map(_audit_in_worker, pending_files, chunksize=chunksize)):
+                    print(f"🔍 Checked {html_files[i].name}")
+                    file_issues[i] = issues
+                    self.engine.merge_timings(timings)
+        else:
+            for i in pending:
+                print(f"🔍 Checking {html_files[i].name}...")
+                file_issues[i] = dict(self.audit_file(html_files[i]))
+        
+        for i in pending:
+            if digests[i] is not None:
+                cache.put(html_files[i], digests[i], file_issues[i])
+        cache.save()
+        
+        # Merge in file order so cached, serial and parallel runs agree
+        for issues in file_issues:
+            self.merge_issues(issues)
         
         # Generate summary
         total_issues = (len(self.results['contrast_issues']) + 
@@ -315,7 +374,9 @@ class AccessibilityChecker:
             'adhd_issues': len(self.results['adhd_issues']),
             'accessibility_issues': len(self.results['accessibility_issues']),
             'total_issues': total_issues,
-            'check_time': datetime.now().isoformat()
+            'check_time': datetime.now().isoformat(),
+            'rule_timings': self.engine.timing_report(),
+            'cache': dict(cache.stats, enabled=incremental)
         }
         
         # Print results
@@ -341,6 +402,7 @@ class AccessibilityChecker:
                 severity_icon = "🔴" if issue['severity'] == 'high' else "🟡" if issue['severity'] == 'medium' else "🟢"
                 print(f"  {severity_icon} {issue['file']}: {issue['issue']}")
         
+        self.engine.print_timings()
         print(f"\n📊 Total issues found: {total_issues}")
         
         if total_issues == 0:
@@ -480,10 +542,32 @@ class AccessibilityChecker:
             f.write(html_content)
         print(f"📄 HTML report saved to: {report_path}")
 
+# Process pool workers each build their own checker once, then audit files
+# as they are handed out. Rule timings travel back with each file's issues.
+_worker_checker = None
+
+
+def _init_worker(base_dir):
+    global _worker_checker
+    _worker_checker = AccessibilityChecker(base_dir)
+
+
+def _audit_in_worker(html_file):
+    before = {name: dict(timing) for name, timing in _worker_checker.engine.timings.items()}
+    issues = dict(_worker_checker.audit_file(html_file))
+    timings = {name: {'seconds': timing['seconds'] - before[name]['seconds'],
+                      'calls': timing['calls'] - before[name]['calls']}
+               for name, timing in _worker_checker.engine.timings.items()}
+    return issues, timings
+
+
 def main():
     """Main function to run the accessibility checker."""
+    workers = int(os.getenv('A11Y_WORKERS', 1))
+    if '--workers' in sys.argv:
+        workers = int(sys.argv[sys.argv.index('--workers') + 1])
     checker = AccessibilityChecker()
-    results = checker.run_check()
+    results = checker.run_check(workers=workers, incremental='--full' not in sys.argv)
     checker.save_report()
     checker.generate_html_report()
     
@@ -11,25 +11,175 @@ from pathlib import Path
 from datetime import datetime
 import colorsys
 
+import color_engine
+import html_document
+from rule_engine import Rule, RuleEngine
+
+
+class ClassContrastRule(Rule):
+    """An element whose own classes put a light/dark text color on a matching background."""
+
+    category = 'color_contrast'
+    attributes = ('class',)
+
+    # (text class pattern, background keyword, description)
+    problematic_combinations = [
+        # White text on light backgrounds
+        (r'text-white', 'beige', 'White text on light beige background'),
+        (r'text-white', 'cream', 'White text on cream background'),
+        (r'text-white', 'light', 'White text on light background'),
+        (r'text-white', 'yellow', 'White text on yellow background'),
+        (r'text-white', 'orange', 'White text on orange background'),
+        
+        # Light text on light backgrounds
+        (r'text-gray-300', 'light', 'Light gray text on light background'),
+        (r'text-gray-400', 'light', 'Light gray text on light background'),
+        (r'text-gray-500', 'light', 'Medium gray text on light background'),
+        
+        # Dark text on dark backgrounds
+        (r'text-gray-800', 'dark', 'Dark text on dark background'),
+        (r'text-gray-900', 'dark', 'Very dark text on dark background'),
+        (r'text-black', 'dark', 'Black text on dark background'),
+    ]
+
+    def element(self, page, index, token):
+        classes = token.attrs['class'].lower()
+        if 'text-' not in classes or 'bg-' not in classes:
+            return
+        backgrounds = [name for name in classes.split() if 'bg-' in name]
+        for text_class, background, description in self.problematic_combinations:
+            if text_class in classes and any(background in name for name in backgrounds):
+                page.report(self.category, {
+                    'type': 'color_contrast',
+                    'severity': 'high',
+                    'description': description,
+                    'location': f'Line {page.document.line_of(token.start)}: {page.document.raw(token)[:50]}...',
+                    'file': page.file_path.name
+                })
+
+
+class IconLabelRule(Rule):
+    """Icons without aria-labels or alt text (decorative aria-hidden icons are fine)."""
+
+    category = 'icon_accessibility'
+    tags = ('i', 'svg', 'img')
+
+    def element(self, page, index, token):
+        attrs = token.attrs
+        if attrs.get('aria-hidden') == 'true':
+            return
+        if token.tag == 'i' and 'data-lucide' in attrs and not attrs.get('aria-label'):
+            description = 'Icon without aria-label'
+        elif token.tag == 'svg' and not attrs.get('aria-label') and not attrs.get('alt'):
+            description = 'SVG icon without accessibility attributes'
+        elif token.tag == 'img' and 'icon' in attrs.get('src', '') and 'alt' not in attrs:
+            description = 'Icon image without alt text'
+        else:
+            return
+        page.report(self.category, {
+            'type': 'icon_accessibility',
+            'severity': 'medium',
+            'description': description,
+            'location': f'Line {page.document.line_of(token.start)}: {page.document.raw(token)[:50]}...',
+            'file': page.file_path.name
+        })
+
+
+class ColorClassRule(Rule):
+    """Flags every use of a risky color utility class."""
+
+    attributes = ('class',)
+
+    def __init__(self, issue_type, label, problematic_classes):
+        self.name = f'ColorClassRule[{issue_type}]'
+        self.category = issue_type
+        self.label = label
+        self.patterns = [(re.compile(pattern, re.IGNORECASE), description) for pattern, description in problematic_classes]
+
+    def element(self, page, index, token):
+        classes = token.attrs['class']
+        for pattern, description in self.patterns:
+            for match in pattern.findall(classes):
+                page.report(self.category, {
+                    'type': self.category,
+                    'severity': 'medium',
+                    'description': description,
+                    'location': f'{self.label}: {match}',
+                    'file': page.file_path.name
+                })
+
+
+class LightOklchRule(Rule):
+    """Very light OKLCH colors in page CSS."""
+
+    category = 'css_color'
+    tags = ('style',)
+    attributes = ('style',)
+    oklch_pattern = re.compile(r'oklch\([^)]+\)', re.IGNORECASE)
+    # Lightness is the first component: "oklch(0.92 0.02 80)", "oklch(92% ...)" or comma separated
+    lightness_pattern = re.compile(r'oklch\(\s*([0-9.]+)(%?)', re.IGNORECASE)
+
+    def element(self, page, index, token):
+        css = []
+        if token.tag == 'style':
+            css.append(page.document.inner_source(index))
+        if token.attrs.get('style'):
+            css.append(token.attrs['style'])
+        for match in self.oklch_pattern.findall('\n'.join(css)):
+            lightness_match = self.lightness_pattern.match(match)
+            if not lightness_match:
+                continue
+            try:
+                lightness = float(lightness_match.group(1))
+            except ValueError:
+                continue
+            if lightness_match.group(2):
+                lightness /= 100
+            if lightness > 0.8:  # Very light colors
+                page.report(self.category, {
+                    'type': 'css_color',
+                    'severity': 'high',
+                    'description': f'Very light OKLCH color (lightness: {lightness}) - may cause contrast issues',
+                    'location': f'OKLCH value: {match}',
+                    'file': page.file_path.name
+                })
+
+
 class ColorAccessibilityChecker:
     def __init__(self, base_dir="."):
         self.base_dir = Path(base_dir)
         self.issues = []
         self.color_issues = []
         
+        # All color rules run in one pass over each page
+        self.engine = RuleEngine([
+            ClassContrastRule(),
+            IconLabelRule(),
+            ColorClassRule('text_color', 'Text color class', [
+                (r'text-white', 'White text - may have contrast issues'),
+                (r'text-gray-300', 'Very light gray text - low contrast'),
+                (r'text-gray-400', 'Light gray text - may have contrast issues'),
+                (r'text-yellow-300', 'Light yellow text - low contrast'),
+                (r'text-orange-300', 'Light orange text - low contrast'),
+            ]),
+            ColorClassRule('background_color', 'Background color class', [
+                (r'bg-beige', 'Beige background - may cause contrast issues'),
+                (r'bg-cream', 'Cream background - may cause contrast issues'),
+                (r'bg-yellow-100', 'Very light yellow background - low contrast'),
+                (r'bg-orange-100', 'Very light orange background - low contrast'),
+                (r'bg-gray-100', 'Very light gray background - may cause contrast issues'),
+            ]),
+            LightOklchRule()
+        ])
+        
     def find_html_files(self):
         """Find all HTML files to check."""
-        html_files = []
-        for pattern in ['*.html', '**/*.html']:
-            html_files.extend(self.base_dir.glob(pattern))
-        
         # Exclude dist, node_modules, and report files
-        return [f for f in html_files if f.is_file() and not any(part in str(f) for part in ['dist', 'node_modules', 'accessibility_report', 'link_check_report']) and f.name not in ['accessibility_report.html', 'link_check_report.html']]
+        return html_document.find_html_files(self.base_dir, exclude_parts=['dist', 'node_modules', 'accessibility_report', 'link_check_report'], exclude_names=['accessibility_report.html', 'link_check_report.html'])
     
     def hex_to_rgb(self, hex_color):
         """Convert hex color to RGB."""
-        hex_color = hex_color.lstrip('#')
-        return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+        return color_engine.parse_color('#' + hex_color.lstrip('#'))
     
     def rgb_to_hsl(self, rgb):
         """Convert RGB to HSL."""
@@ -37,184 +187,22 @@ class ColorAccessibilityChecker:
         return colorsys.rgb_to_hls(r, g, b)
     
     def get_luminance(self, rgb):
-        """Calculate relative luminance of RGB color."""
-        r, g, b = [x/255.0 for x in rgb]
-        
-        # Apply gamma correction
-        r = r/12.92 if r <= 0.03928 else ((r + 0.055)/1.055) ** 2.4
-        g = g/12.92 if g <= 0.03928 else ((g + 0.055)/1.055) ** 2.4
-        b = b/12.92 if b <= 0.03928 else ((b + 0.055)/1.055) ** 2.4
-        
-        return 0.2126 * r + 0.7152 * g + 0.0722 * b
+        """Calculate relative luminance of RGB color (memoized)."""
+        return color_engine.rgb_luminance(tuple(rgb))
     
     def get_contrast_ratio(self, color1, color2):
         """Calculate contrast ratio between two colors."""
-        lum1 = self.get_luminance(color1)
-        lum2 = self.get_luminance(color2)
-        
-        lighter = max(lum1, lum2)
-        darker = min(lum1, lum2)
-        
-        return (lighter + 0.05) / (darker + 0.05)
-    
-    def check_color_contrast(self, content, file_path):
-        """Check for color contrast issues."""
-        issues = []
-        
-        # Common problematic color combinations
-        problematic_combinations = [
-            # White text on light backgrounds
-            (r'text-white.*bg-[^"]*beige', 'White text on light beige background'),
-            (r'text-white.*bg-[^"]*cream', 'White text on cream background'),
-            (r'text-white.*bg-[^"]*light', 'White text on light background'),
-            (r'text-white.*bg-[^"]*yellow', 'White text on yellow background'),
-            (r'text-white.*bg-[^"]*orange', 'White text on orange background'),
-            
-            # Light text on light backgrounds
-            (r'text-gray-300.*bg-[^"]*light', 'Light gray text on light background'),
-            (r'text-gray-400.*bg-[^"]*light', 'Light gray text on light background'),
-            (r'text-gray-500.*bg-[^"]*light', 'Medium gray text on light background'),
-            
-            # Dark text on dark backgrounds
-            (r'text-gray-800.*bg-[^"]*dark', 'Dark text on dark background'),
-            (r'text-gray-900.*bg-[^"]*dark', 'Very dark text on dark background'),
-            (r'text-black.*bg-[^"]*dark', 'Black text on dark background'),
-        ]
-        
-        for pattern, description in problematic_combinations:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            if matches:
-                for match in matches:
-                    issues.append({
-                        'type': 'color_contrast',
-                        'severity': 'high',
-                        'description': description,
-                        'location': f'Line containing: {match[:50]}...',
-                        'file': file_path.name
-                    })
-        
-        return issues
-    
-    def check_icon_accessibility(self, content, file_path):
-        """Check for icon accessibility issues."""
-        issues = []
-        
-        # Icons without aria-labels or alt text
-        icon_patterns = [
-            (r'<i[^>]*data-lucide="[^"]*"[^>]*(?!.*aria-label)[^>]*>', 'Icon without aria-label'),
-            (r'<svg[^>]*(?!.*aria-label)[^>]*(?!.*alt)[^>]*>', 'SVG icon without accessibility attributes'),
-            (r'<img[^>]*src="[^"]*icon[^"]*"[^>]*(?!.*alt)[^>]*>', 'Icon image without alt text'),
-        ]
-        
-        for pattern, description in icon_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            if matches:
-                for match in matches:
-                    issues.append({
-                        'type': 'icon_accessibility',
-                        'severity': 'medium',
-                        'description': description,
-                        'location': f'Line containing: {match[:50]}...',
-                        'file': file_path.name
-                    })
-        
-        return issues
-    
-    def check_text_colors(self, content, file_path):
-        """Check for problematic text color classes."""
-        issues = []
-        
-        # Problematic text color classes
-        problematic_text_colors = [
-            (r'text-white', 'White text - may have contrast issues'),
-            (r'text-gray-300', 'Very light gray text - low contrast'),
-            (r'text-gray-400', 'Light gray text - may have contrast issues'),
-            (r'text-yellow-300', 'Light yellow text - low contrast'),
-            (r'text-orange-300', 'Light orange text - low contrast'),
-        ]
-        
-        for pattern, description in problematic_text_colors:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            if matches:
-                for match in matches:
-                    issues.append({
-                        'type': 'text_color',
-                        'severity': 'medium',
-                        'description': description,
-                        'location': f'Text color class: {match}',
-                        'file': file_path.name
-                    })
-        
-        return issues
-    
-    def check_background_colors(self, content, file_path):
-        """Check for problematic background color classes."""
-        issues = []
-        
-        # Problematic background color classes
-        problematic_bg_colors = [
-            (r'bg-beige', 'Beige background - may cause contrast issues'),
-            (r'bg-cream', 'Cream background - may cause contrast issues'),
-            (r'bg-yellow-100', 'Very light yellow background - low contrast'),
-            (r'bg-orange-100', 'Very light orange background - low contrast'),
-            (r'bg-gray-100', 'Very light gray background - may cause contrast issues'),
-        ]
-        
-        for pattern, description in problematic_bg_colors:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            if matches:
-                for match in matches:
-                    issues.append({
-                        'type': 'background_color',
-                        'severity': 'medium',
-                        'description': description,
-                        'location': f'Background color class: {match}',
-                        'file': file_path.name
-                    })
-        
-        return issues
-    
-    def check_css_custom_properties(self, content, file_path):
-        """Check for problematic CSS custom properties."""
-        issues = []
-        
-        # Look for OKLCH color values that might have contrast issues
-        oklch_pattern = r'oklch\([^)]+\)'
-        matches = re.findall(oklch_pattern, content, re.IGNORECASE)
-        
-        for match in matches:
-            # Extract lightness value from OKLCH
-            lightness_match = re.search(r'oklch\(([^,]+),', match)
-            if lightness_match:
-                try:
-                    lightness = float(lightness_match.group(1))
-                    if lightness > 0.8:  # Very light colors
-                        issues.append({
-                            'type': 'css_color',
-                            'severity': 'high',
-                            'description': f'Very light OKLCH color (lightness: {lightness}) - may cause contrast issues',
-                            'location': f'OKLCH value: {match}',
-                            'file': file_path.name
-                        })
-                except ValueError:
-                    pass
-        
-        return issues
+        return color_engine.contrast_ratio(color1, color2)
     
     def check_file(self, file_path):
         """Check a single file for color accessibility issues."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            file_issues = []
+            document = html_document.load_document(file_path)
             
             # Run all checks
-            file_issues.extend(self.check_color_contrast(content, file_path))
-            file_issues.extend(self.check_icon_accessibility(content, file_path))
-            file_issues.extend(self.check_text_colors(content, file_path))
-            file_issues.extend(self.check_background_colors(content, file_path))
-            file_issues.extend(self.check_css_custom_properties(content, file_path))
+            file_issues = []
+            for issues in self.engine.run(document, file_path).values():
+                file_issues.extend(issues)
             
             if file_issues:
                 print(f"🔍 Found {len(file_issues)} color accessibility issues in {file_path.name}")
@@ -233,6 +221,7 @@ class ColorAccessibilityChecker:
             'total_issues': len(self.issues),
             'issues_by_type': {},
             'issues_by_severity': {},
+            'rule_timings': self.engine.timing_report(),
             'issues': self.issues
         }
         
@@ -270,6 +259,9 @@ class ColorAccessibilityChecker:
         with open('color_accessibility_report.json', 'w') as f:
             json.dump(report, f, indent=2)
         
+        # Contrast of every design token pair, for reviewing the palette itself
+        color_engine.default_engine().write_report(color_engine.REPORT_PATH)
+        
         # Print summary
         print("=" * 60)
         print(f"🎨 COLOR ACCESSIBILITY CHECK COMPLETE")
@@ -293,7 +285,9 @@ class ColorAccessibilityChecker:
         else:
             print("🎉 No color accessibility issues found!")
         
+        self.engine.print_timings()
         print(f"\n📄 Detailed report saved to: color_accessibility_report.json")
+        print(f"📄 Token contrast matrix saved to: token_contrast_matrix.json")
         
         return report
 
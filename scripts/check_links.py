@@ -5,19 +5,30 @@ Scans all HTML files for internal and external links and validates their status.
 """
 
 import os
-import re
-import requests
 import time
 from pathlib import Path
 from urllib.parse import urljoin, urlparse
-from concurrent.futures import ThreadPoolExecutor, as_completed
 import json
+import sys
 from datetime import datetime
 
+import audit_cache
+import html_document
+from link_graph import LinkGraph
+from link_engine import AsyncLinkEngine, GLOBAL_LIMIT, PER_HOST_LIMIT, aiohttp
+from link_status_cache import LinkStatusCache
+
+# Bump when the cached per-page link format changes
+LINK_RULESET_VERSION = 1
+
+# How long external link results of an unchanged page are trusted
+EXTERNAL_RESULT_MAX_AGE = float(os.getenv('LINK_CHECK_MAX_AGE_HOURS', 24)) * 3600
+
 class LinkChecker:
-    def __init__(self, base_dir=".", max_workers=10, timeout=10):
+    def __init__(self, base_dir=".", max_workers=GLOBAL_LIMIT, per_host=PER_HOST_LIMIT, timeout=10):
         self.base_dir = Path(base_dir)
-        self.max_workers = max_workers
+        self.max_workers = max_workers  # external requests in flight, across all hosts
+        self.per_host = per_host
         self.timeout = timeout
         self.results = {
             'internal_links': [],
@@ -26,47 +37,35 @@ class LinkChecker:
             'file_links': [],
             'summary': {}
         }
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (compatible; LinkChecker/1.0)'
-        })
+        self.status_cache = LinkStatusCache(self.base_dir)
+        self.graph = None
+        self.engine = None  # long-lived engine behind check_http_link
 
     def find_html_files(self):
         """Find all HTML files in the project."""
-        html_files = []
-        for pattern in ['*.html', '**/*.html']:
-            html_files.extend(self.base_dir.glob(pattern))
-        return [f for f in html_files if f.is_file()]
+        return html_document.find_html_files(self.base_dir)
 
     def extract_links_from_html(self, html_file):
         """Extract all links from an HTML file."""
         try:
-            with open(html_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except UnicodeDecodeError:
-            try:
-                with open(html_file, 'r', encoding='latin-1') as f:
-                    content = f.read()
-            except:
-                print(f"⚠️  Could not read {html_file}")
-                return []
+            document = html_document.load_document(html_file)
+        except Exception:
+            print(f"⚠️  Could not read {html_file}")
+            return []
 
         links = []
-        
-        # Find href attributes
-        href_pattern = r'href\s*=\s*["\']([^"\']+)["\']'
-        href_matches = re.findall(href_pattern, content, re.IGNORECASE)
-        
-        # Find src attributes (for images, scripts, etc.)
-        src_pattern = r'src\s*=\s*["\']([^"\']+)["\']'
-        src_matches = re.findall(src_pattern, content, re.IGNORECASE)
-        
-        for link in href_matches + src_matches:
-            links.append({
-                'url': link,
-                'file': str(html_file),
-                'type': 'href' if link in href_matches else 'src'
-            })
+        elements = document.elements()
+        
+        # href attributes first, then src (images, scripts, etc.)
+        for attribute in ('href', 'src'):
+            for element in elements:
+                url = element.attrs.get(attribute, '').strip()
+                if url:
+                    links.append({
+                        'url': url,
+                        'file': str(html_file),
+                        'type': attribute
+                    })
         
         return links
 
@@ -106,57 +105,53 @@ class LinkChecker:
         }
 
     def check_file_link(self, link_info):
-        """Check if a file link exists."""
+        """Check if a file link exists (against the link graph's file index)."""
+        if self.graph is None:
+            self.graph = LinkGraph(self.base_dir)
         url = link_info['url']
-        base_file = Path(link_info['file'])
-        
-        # Handle relative paths
-        if url.startswith('/'):
-            # Absolute path from project root
-            file_path = self.base_dir / url.lstrip('/')
-        else:
-            # Relative path from current file
-            file_path = base_file.parent / url
-        
-        # Check if file exists
-        exists = file_path.exists()
+        file_path, exists = self.graph.add_edge(link_info['file'], url)
         
         return {
             'url': url,
             'file': link_info['file'],
             'link_type': link_info['link_type'],
             'exists': exists,
-            'resolved_path': str(file_path),
+            'resolved_path': file_path,
             'status': 'OK' if exists else 'BROKEN'
         }
 
+    def link_engine(self):
+        return AsyncLinkEngine(self.status_cache, global_limit=self.max_workers,
+                               per_host_limit=self.per_host, timeout=self.timeout)
+
     def check_http_link(self, link_info):
-        """Check if an HTTP/HTTPS link is accessible."""
-        url = link_info['url']
-        
-        try:
-            response = self.session.head(url, timeout=self.timeout, allow_redirects=True)
-            status = 'OK' if response.status_code < 400 else 'BROKEN'
-            return {
-                'url': url,
-                'file': link_info['file'],
-                'link_type': link_info['link_type'],
-                'status': status,
-                'status_code': response.status_code,
-                'final_url': response.url
-            }
-        except requests.exceptions.RequestException as e:
-            return {
-                'url': url,
-                'file': link_info['file'],
-                'link_type': link_info['link_type'],
-                'status': 'BROKEN',
-                'error': str(e),
-                'status_code': None
-            }
+        """Check if an HTTP/HTTPS link is accessible (answered from the status cache when fresh).
+
+        Single checks share one engine, so they reuse its connections and
+        limits. Use check_http_links for a batch; call close() when done.
+        """
+        if self.engine is None:
+            self.engine = self.link_engine()
+        return self.engine.check(link_info)
 
-    def run_check(self):
-        """Run the complete link check."""
+    def check_http_links(self, link_infos):
+        """Check a batch of HTTP/HTTPS links concurrently; results in input order."""
+        return self.link_engine().check_all(link_infos)
+
+    def close(self):
+        """Shut down the engine behind check_http_link, if one was started."""
+        if self.engine is not None:
+            self.engine.close()
+            self.engine = None
+
+    def run_check(self, incremental=True):
+        """Run the complete link check.
+        
+        With incremental=True, unchanged pages (same content hash) reuse
+        their extracted links, and their external link results if those are
+        younger than LINK_CHECK_MAX_AGE_HOURS. File links are always
+        re-checked since their targets can disappear without the page changing.
+        """
         print("🔍 Starting link check for Kristina's Academic Success Dashboard")
         print("=" * 60)
         
@@ -164,11 +159,35 @@ class LinkChecker:
         html_files = self.find_html_files()
         print(f"📄 Found {len(html_files)} HTML files to check")
         
-        # Extract all links
+        if not incremental:
+            # --full: ignore (and don't overwrite) the external status cache too
+            self.status_cache = LinkStatusCache(self.base_dir, enabled=False)
+        
+        fingerprint = audit_cache.ruleset_fingerprint(LINK_RULESET_VERSION, LinkChecker.extract_links_from_html, LinkChecker.categorize_link)
+        cache = audit_cache.AuditCache(self.base_dir, 'links', fingerprint, enabled=incremental)
+        
+        # Extract all links (or reuse them for unchanged pages)
         all_links = []
+        page_state = {}  # file -> (digest, links, reusable external results or None, checked_at)
         for html_file in html_files:
-            links = self.extract_links_from_html(html_file)
+            try:
+                digest = audit_cache.content_digest(html_document.load_document(html_file).source)
+            except Exception:
+                digest = None
+            cached = cache.get(html_file, digest) if digest else None
+            if cached is None:
+                links = self.extract_links_from_html(html_file)
+                page_state[str(html_file)] = (digest, links, None, None)
+            else:
+                links = [{**link, 'file': str(html_file)} for link in cached['links']]
+                checked_at = cache.entry(html_file)['checked_at']
+                external = None
+                if time.time() - checked_at < EXTERNAL_RESULT_MAX_AGE:
+                    external = [{**result, 'file': str(html_file)} for result in cached['external']]
+                page_state[str(html_file)] = (digest, links, external, checked_at)
             all_links.extend(links)
+        if incremental:
+            print(f"♻️  {cache.stats['hits']} unchanged pages reuse cached links, {cache.stats['misses']} re-extracted")
         
         print(f"🔗 Found {len(all_links)} total links")
         
@@ -190,32 +209,64 @@ class LinkChecker:
         
         # Check file links
         print("\n📁 Checking file links...")
+        self.graph = LinkGraph(self.base_dir)
+        for html_file in html_files:
+            self.graph.add_page(html_file)
         file_results = []
         for link in file_links:
             result = self.check_file_link(link)
             file_results.append(result)
             if not result['exists']:
                 print(f"  ❌ {result['url']} (in {result['file']})")
+        print(f"  🗺️  {self.graph.stats['lookups']} file links resolved with {self.graph.stats['resolutions']} index lookups")
         
-        # Check external links
+        # Check external links (pages with fresh cached results skip the network)
         print("\n🌐 Checking external links...")
         external_results = []
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_link = {executor.submit(self.check_http_link, link): link for link in external_links}
-            
-            for future in as_completed(future_to_link):
-                result = future.result()
-                external_results.append(result)
-                if result['status'] == 'BROKEN':
-                    error_msg = f" (Error: {result.get('error', 'Unknown')})" if 'error' in result else f" (Status: {result.get('status_code', 'Unknown')})"
-                    print(f"  ❌ {result['url']} (in {result['file']}){error_msg}")
-                else:
-                    print(f"  ✅ {result['url']}")
+        links_to_check = []
+        for link in external_links:
+            if page_state[link['file']][2] is None:
+                links_to_check.append(link)
+        for _, _, reused, _ in page_state.values():
+            external_results.extend(reused or [])
+        if incremental:
+            print(f"  ♻️  {len(external_results)} results reused, {len(links_to_check)} to check")
+        
+        # Each unique URL is checked once, then fanned back out to every page linking to it
+        occurrences = {}
+        for link in links_to_check:
+            occurrences.setdefault(link['url'], []).append(link)
+        def report_result(result):
+            if result['status'] == 'BROKEN':
+                error_msg = f" (Error: {result.get('error', 'Unknown')})" if 'error' in result else f" (Status: {result.get('status_code', 'Unknown')})"
+                print(f"  ❌ {result['url']} (in {len(occurrences[result['url']])} page(s)){error_msg}")
+            else:
+                print(f"  ✅ {result['url']}")
+        
+        engine = self.link_engine()
+        url_results = engine.check_all([links[0] for links in occurrences.values()], on_result=report_result)
+        for result in url_results:
+            for link in occurrences[result['url']]:
+                external_results.append({**result, 'file': link['file'], 'link_type': link['link_type']})
+        self.status_cache.save()
+        if links_to_check:
+            print(f"  🗄️  {len(occurrences)} unique URLs; status cache: {self.status_cache.stats}; requests: {engine.stats}")
+        
+        # Remember each page's links and external results for the next run
+        external_by_page = {}
+        for result in external_results:
+            external_by_page.setdefault(result['file'], []).append(result)
+        for page, (digest, links, reused, checked_at) in page_state.items():
+            if digest:
+                cache.put(page, digest, {'links': links, 'external': external_by_page.get(page, [])},
+                          checked_at=checked_at if reused is not None else None)
+        cache.save()
         
         # Store results
         self.results['file_links'] = file_results
         self.results['external_links'] = external_results
         self.results['internal_links'] = internal_links
+        self.results['link_graph'] = self.graph.report()
         
         # Generate summary
         broken_files = [r for r in file_results if r['status'] == 'BROKEN']
@@ -229,7 +280,11 @@ class LinkChecker:
             'broken_file_links': len(broken_files),
             'broken_external_links': len(broken_external),
             'total_broken': len(broken_files) + len(broken_external),
-            'check_time': datetime.now().isoformat()
+            'orphan_pages': len(self.results['link_graph']['orphan_pages']),
+            'check_time': datetime.now().isoformat(),
+            'cache': dict(cache.stats, enabled=incremental),
+            'status_cache': dict(self.status_cache.stats, enabled=self.status_cache.enabled),
+            'http': dict(engine.stats, engine='aiohttp' if aiohttp is not None else 'requests')
         }
         
         # Print summary
@@ -241,6 +296,7 @@ class LinkChecker:
         print(f"External links: {self.results['summary']['external_links']} ({self.results['summary']['broken_external_links']} broken)")
         print(f"Internal links: {self.results['summary']['internal_links']}")
         print(f"Total broken links: {self.results['summary']['total_broken']}")
+        print(f"Orphan pages (no inbound links): {self.results['summary']['orphan_pages']}")
         
         if self.results['summary']['total_broken'] == 0:
             print("\n🎉 All links are working correctly!")
@@ -345,6 +401,20 @@ class LinkChecker:
         </div>
 """
         
+        # Add orphan pages
+        link_graph = self.results.get('link_graph', {})
+        if link_graph.get('orphan_pages'):
+            html_content += """
+        <h2>🏝️ Orphan Pages</h2>
+        <p>No other page links to these.</p>
+"""
+            for page in link_graph['orphan_pages']:
+                html_content += f"""
+        <div class="link-item">
+            <div class="link-url">{page}</div>
+        </div>
+"""
+        
         # Add working links summary
         working_files = [r for r in self.results['file_links'] if r['status'] == 'OK']
         working_external = [r for r in self.results['external_links'] if r['status'] == 'OK']
@@ -372,7 +442,7 @@ class LinkChecker:
 def main():
     """Main function to run the link checker."""
     checker = LinkChecker()
-    results = checker.run_check()
+    results = checker.run_check(incremental='--full' not in sys.argv)
     checker.save_report()
     checker.generate_html_report()
     
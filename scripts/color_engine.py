@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Design Token Color Engine
+Shared luminance / WCAG contrast math for the accessibility scripts.
+
+The checkers used to re-derive the luminance of the same few palette colors
+thousands of times per run. This module:
+- precomputes luminance for every color token in tokens.json and
+  tokens-new.json (references like {colors.main.white} are resolved)
+- memoizes any other color in a bounded LRU cache
+- builds full foreground x background contrast matrices per token set,
+  vectorized with NumPy when it is installed (plain Python otherwise)
+
+Run it directly to write the token-pair contrast matrix report:
+    python scripts/color_engine.py [output.json]
+"""
+
+import json
+import re
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+ROOT = Path(__file__).parent.parent
+TOKEN_FILES = [ROOT / "tokens.json", ROOT / "tokens-new.json"]
+REPORT_PATH = ROOT / "token_contrast_matrix.json"
+CACHE_SIZE = 4096
+
+# WCAG 2.1 thresholds
+AA_NORMAL = 4.5
+AA_LARGE = 3.0
+AAA_NORMAL = 7.0
+
+_REFERENCE = re.compile(r'^\{([^}]+)\}$')
+_RGB_FUNCTION = re.compile(r'^rgba?\(\s*([\d.]+)[\s,]+([\d.]+)[\s,]+([\d.]+)', re.IGNORECASE)
+
+
+# ---------------------------------------------------------------------------
+# Single colors
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_color(value):
+    """'#fff', '#ffffff', '#ffffff80' or 'rgb(255, 255, 255)' -> (r, g, b) ints, or None.
+
+    Alpha is ignored; contrast is computed for the opaque color.
+    """
+    value = value.strip()
+    if value.startswith('#'):
+        digits = value[1:]
+        if len(digits) in (3, 4):
+            digits = ''.join(c * 2 for c in digits[:3])
+        if len(digits) in (6, 8):
+            try:
+                return tuple(int(digits[i:i + 2], 16) for i in (0, 2, 4))
+            except ValueError:
+                return None
+        return None
+    match = _RGB_FUNCTION.match(value)
+    if match:
+        return tuple(min(255, int(float(component))) for component in match.groups())
+    return None
+
+
+def _linearize(channel):
+    channel = channel / 255.0
+    return channel / 12.92 if channel <= 0.03928 else ((channel + 0.055) / 1.055) ** 2.4
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def rgb_luminance(rgb):
+    """WCAG relative luminance of an (r, g, b) tuple."""
+    r, g, b = (_linearize(c) for c in rgb)
+    return 0.2126 * r + 0.7152 * g + 0.0722 * b
+
+
+def luminance(color):
+    """Relative luminance of a color string or (r, g, b) tuple (None if unparseable)."""
+    rgb = parse_color(color) if isinstance(color, str) else tuple(color)
+    return None if rgb is None else rgb_luminance(rgb)
+
+
+def ratio_from_luminance(lum1, lum2):
+    lighter, darker = (lum1, lum2) if lum1 >= lum2 else (lum2, lum1)
+    return (lighter + 0.05) / (darker + 0.05)
+
+
+def contrast_ratio(color1, color2):
+    """WCAG contrast ratio between two colors (strings or rgb tuples); 0.0 if either is invalid."""
+    lum1 = luminance(color1)
+    lum2 = luminance(color2)
+    if lum1 is None or lum2 is None:
+        return 0.0
+    return ratio_from_luminance(lum1, lum2)
+
+
+def cache_info():
+    return {"parse": parse_color.cache_info()._asdict(), "luminance": rgb_luminance.cache_info()._asdict()}
+
+
+# ---------------------------------------------------------------------------
+# Design tokens
+# ---------------------------------------------------------------------------
+
+def _flatten_colors(node, path, out):
+    if isinstance(node, dict):
+        if 'value' in node and 'type' in node:
+            if node['type'] == 'color' and isinstance(node['value'], str):
+                out['.'.join(path)] = node['value']
+            return
+        for key, value in node.items():
+            _flatten_colors(value, path + [key], out)
+
+
+def load_token_sets(paths=TOKEN_FILES):
+    """{set name: {token path: resolved color value}} for every token file that exists.
+
+    Set names are "<file stem>/<set>", e.g. "tokens/Tokens/Light". References
+    resolve inside their own set first, then the other sets of the same file.
+    """
+    token_sets = {}
+    for path in paths:
+        path = Path(path)
+        if not path.exists():
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        raw_sets = {}
+        for set_name, tree in data.items():
+            if set_name.startswith('$'):
+                continue
+            raw = {}
+            _flatten_colors(tree, [], raw)
+            if raw:
+                raw_sets[set_name] = raw
+
+        for set_name, raw in raw_sets.items():
+            lookup_order = [raw] + [other for name, other in raw_sets.items() if name != set_name]
+            resolved = {}
+            for token, value in raw.items():
+                value = _resolve(value, lookup_order)
+                if value is not None and parse_color(value) is not None:
+                    resolved[token] = value
+            token_sets[f"{path.stem}/{set_name}"] = resolved
+    return token_sets
+
+
+def _resolve(value, lookup_order, depth=0):
+    match = _REFERENCE.match(value.strip())
+    if not match:
+        return value
+    if depth > 10:  # reference cycle
+        return None
+    for tokens in lookup_order:
+        if match.group(1) in tokens:
+            return _resolve(tokens[match.group(1)], lookup_order, depth + 1)
+    return None
+
+
+class ColorEngine:
+    """Token colors with precomputed luminance, plus contrast matrices."""
+
+    def __init__(self, token_files=TOKEN_FILES):
+        self.token_sets = load_token_sets(token_files)
+        self.luminances = {}  # set name -> [luminance] aligned with the set's tokens
+        for set_name, tokens in self.token_sets.items():
+            self.luminances[set_name] = [luminance(value) for value in tokens.values()]
+
+    def contrast_matrix(self, set_name):
+        """(tokens, matrix) where matrix[i][j] is the contrast of token i on token j.
+
+        Returns a NumPy array when NumPy is available, else a list of lists.
+        """
+        tokens = list(self.token_sets[set_name])
+        lums = self.luminances[set_name]
+        if np is not None:
+            values = np.asarray(lums, dtype=float)
+            lighter = np.maximum.outer(values, values)
+            darker = np.minimum.outer(values, values)
+            return tokens, (lighter + 0.05) / (darker + 0.05)
+        return tokens, [[ratio_from_luminance(fg, bg) for bg in lums] for fg in lums]
+
+    def report(self):
+        """Full token-pair contrast matrices with WCAG pass counts, per token set."""
+        report = {"thresholds": {"aa_normal": AA_NORMAL, "aa_large": AA_LARGE, "aaa_normal": AAA_NORMAL},
+                  "vectorized": np is not None, "token_sets": {}}
+        for set_name, colors in self.token_sets.items():
+            tokens, matrix = self.contrast_matrix(set_name)
+            rows = matrix.round(2).tolist() if np is not None else [[round(v, 2) for v in row] for row in matrix]
+            pairs = [(rows[i][j]) for i in range(len(tokens)) for j in range(len(tokens)) if i != j]
+            report["token_sets"][set_name] = {
+                "tokens": tokens,
+                "values": [colors[token] for token in tokens],
+                "matrix": rows,
+                "pairs": len(pairs),
+                "pass_aa_normal": sum(1 for ratio in pairs if ratio >= AA_NORMAL),
+                "pass_aa_large": sum(1 for ratio in pairs if ratio >= AA_LARGE),
+                "pass_aaa_normal": sum(1 for ratio in pairs if ratio >= AAA_NORMAL)
+            }
+        return report
+
+    def write_report(self, path=REPORT_PATH):
+        report = self.report()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        return report
+
+
+_default_engine = None
+
+
+def default_engine():
+    """Process-wide engine for the repo's token files (built on first use)."""
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = ColorEngine()
+    return _default_engine
+
+
+def main():
+    output = Path(sys.argv[1]) if len(sys.argv) > 1 else REPORT_PATH
+    engine = default_engine()
+    report = engine.write_report(output)
+    print(f"🎨 Token contrast matrix ({'NumPy' if np is not None else 'pure Python'})")
+    for set_name, summary in report["token_sets"].items():
+        print(f"  {set_name}: {len(summary['tokens'])} colors, "
+              f"{summary['pass_aa_normal']}/{summary['pairs']} pairs pass AA")
+    print(f"📄 Report saved to: {output}")
+
+
+if __name__ == "__main__":
+    main()
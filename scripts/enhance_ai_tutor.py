@@ -6,9 +6,15 @@ This script enhances the AI tutor with detailed notes, tutorials, and study feat
 
 import json
 import os
+import sys
 from pathlib import Path
 import re
 
+# Binary knowledge base writer lives with the API code
+sys.path.insert(0, str(Path(__file__).parent.parent / "api"))
+from _kb_binary import write_kb
+from _knowledge_index import INDEX_KEY, KnowledgeIndex
+
 def create_enhanced_knowledge_base():
     """Create an enhanced knowledge base with comprehensive notes and tutorials."""
     
@@ -301,6 +307,12 @@ def create_enhanced_knowledge_base():
     with open('ai_knowledge_base_enhanced.json', 'w', encoding='utf-8') as f:
         json.dump(enhanced_knowledge_base, f, indent=2, ensure_ascii=False)
     
+    # Compact, memory-mappable copy for fast cold starts (preferred by the API),
+    # with the search index prebuilt so the first request doesn't build it
+    math_index = KnowledgeIndex.from_math_knowledge(enhanced_knowledge_base.get('math', {}))
+    write_kb({**enhanced_knowledge_base, INDEX_KEY: math_index.to_data()},
+             'ai_knowledge_base_enhanced.kbin', source='ai_knowledge_base_enhanced.json')
+    
     print("✅ Enhanced knowledge base created with comprehensive notes and tutorials!")
     return enhanced_knowledge_base
 
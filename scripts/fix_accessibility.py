@@ -11,6 +11,8 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Tuple
 
+import html_document
+
 class AccessibilityFixer:
     def __init__(self, base_dir="."):
         self.base_dir = Path(base_dir)
@@ -41,17 +43,13 @@ class AccessibilityFixer:
 
     def find_html_files(self):
         """Find all HTML files in the project."""
-        html_files = []
-        for pattern in ['*.html', '**/*.html']:
-            html_files.extend(self.base_dir.glob(pattern))
         # Exclude archived and dist files for now
-        return [f for f in html_files if f.is_file() and not any(part in str(f) for part in ['_archived', 'dist', 'node_modules']) and f.name not in ['accessibility_report.html', 'link_check_report.html']]
+        return html_document.find_html_files(self.base_dir, exclude_parts=['_archived', 'dist', 'node_modules'], exclude_names=['accessibility_report.html', 'link_check_report.html'])
 
     def fix_contrast_issues(self, html_file: Path):
         """Fix contrast issues in an HTML file."""
         try:
-            with open(html_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = html_document.load_document(html_file).source
         except:
             return False
         
@@ -116,8 +114,7 @@ class AccessibilityFixer:
         
         # Write the fixed content back
         if fixes_applied:
-            with open(html_file, 'w', encoding='utf-8') as f:
-                f.write(content)
+            html_document.save_document(html_file, content)
             return True
         
         return False
@@ -125,8 +122,7 @@ class AccessibilityFixer:
     def fix_adhd_accessibility(self, html_file: Path):
         """Fix ADHD accessibility issues by breaking up long text blocks."""
         try:
-            with open(html_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = html_document.load_document(html_file).source
         except:
             return False
         
@@ -211,8 +207,7 @@ class AccessibilityFixer:
         
         # Write the fixed content back
         if fixes_applied:
-            with open(html_file, 'w', encoding='utf-8') as f:
-                f.write(content)
+            html_document.save_document(html_file, content)
             return True
         
         return False
@@ -220,8 +215,7 @@ class AccessibilityFixer:
     def fix_accessibility_patterns(self, html_file: Path):
         """Fix general accessibility issues."""
         try:
-            with open(html_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = html_document.load_document(html_file).source
         except:
             return False
         
@@ -268,8 +262,7 @@ class AccessibilityFixer:
         
         # Write the fixed content back
         if fixes_applied:
-            with open(html_file, 'w', encoding='utf-8') as f:
-                f.write(content)
+            html_document.save_document(html_file, content)
             return True
         
         return False
@@ -10,6 +10,8 @@ import json
 from pathlib import Path
 from datetime import datetime
 
+import html_document
+
 class ComprehensiveAccessibilityFixer:
     def __init__(self, base_dir="."):
         self.base_dir = Path(base_dir)
@@ -50,12 +52,8 @@ class ComprehensiveAccessibilityFixer:
 
     def find_html_files(self):
         """Find all HTML files that need fixing."""
-        html_files = []
-        for pattern in ['*.html', '**/*.html']:
-            html_files.extend(self.base_dir.glob(pattern))
-        
         # Exclude dist, node_modules, and report files
-        return [f for f in html_files if f.is_file() and not any(part in str(f) for part in ['dist', 'node_modules', 'accessibility_report', 'link_check_report']) and f.name not in ['accessibility_report.html', 'link_check_report.html']]
+        return html_document.find_html_files(self.base_dir, exclude_parts=['dist', 'node_modules', 'accessibility_report', 'link_check_report'], exclude_names=['accessibility_report.html', 'link_check_report.html'])
 
     def fix_contrast_issues(self, content):
         """Fix contrast issues by replacing problematic color combinations."""
@@ -261,8 +259,7 @@ class ComprehensiveAccessibilityFixer:
     def fix_file(self, file_path):
         """Fix accessibility issues in a single file."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = html_document.load_document(file_path).source
             
             original_content = content
             total_fixes = 0
@@ -282,8 +279,7 @@ class ComprehensiveAccessibilityFixer:
             
             # Only write if changes were made
             if content != original_content:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                html_document.save_document(file_path, content)
                 
                 self.fixes_applied.append({
                     'file': str(file_path),
@@ -8,6 +8,8 @@ import os
 import re
 from pathlib import Path
 
+import html_document
+
 class HTMLStructureFixer:
     def __init__(self, base_dir="."):
         self.base_dir = Path(base_dir)
@@ -15,12 +17,8 @@ class HTMLStructureFixer:
         
     def find_html_files(self):
         """Find all HTML files that need fixing."""
-        html_files = []
-        for pattern in ['*.html', '**/*.html']:
-            html_files.extend(self.base_dir.glob(pattern))
-        
         # Exclude dist, node_modules, and report files
-        return [f for f in html_files if f.is_file() and not any(part in str(f) for part in ['dist', 'node_modules', 'accessibility_report', 'link_check_report', 'color_accessibility_report']) and f.name not in ['accessibility_report.html', 'link_check_report.html', 'color_accessibility_report.html']]
+        return html_document.find_html_files(self.base_dir, exclude_parts=['dist', 'node_modules', 'accessibility_report', 'link_check_report', 'color_accessibility_report'], exclude_names=['accessibility_report.html', 'link_check_report.html', 'color_accessibility_report.html'])
     
     def fix_malformed_attributes(self, content, file_path):
         """Fix malformed HTML attributes."""
@@ -113,8 +111,7 @@ class HTMLStructureFixer:
     def fix_file(self, file_path):
         """Fix all HTML structure issues in a single file."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = html_document.load_document(file_path).source
             
             original_content = content
             total_fixes = 0
@@ -134,8 +131,7 @@ class HTMLStructureFixer:
             
             # Write back if changes were made
             if content != original_content:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                html_document.save_document(file_path, content)
                 print(f"✅ Fixed {total_fixes} HTML structure issues in {file_path.name}")
                 return total_fixes
             else:
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Shared HTML Document Model
+One read and one parse per file for every check_*.py and fix_*.py tool.
+
+Each script used to glob the tree, open every page and run its own regex
+passes over the raw text. This module does the globbing once, reads each
+file once, and tokenizes it with html.parser into a flat token list that
+keeps source offsets, so rules can look at tags and attributes and fixers
+can still edit the original text in place.
+
+Documents are cached per process keyed on (mtime, size), so when several
+checkers run together (or a fixer re-reads a page it just wrote) nothing is
+parsed twice. save_document() writes through in the encoding the page was
+read with and drops the stale parse. The fix_*.py scripts each run in their
+own process, so run them through run_fixers.py to share one cache.
+"""
+
+import os
+from bisect import bisect_right
+from collections import namedtuple
+from html import unescape
+from html.parser import HTMLParser
+from pathlib import Path
+
+from html_text import TextBlockParser
+
+# kind is one of 'start', 'startend', 'end', 'data', 'comment', 'decl', 'pi'
+Token = namedtuple('Token', ['kind', 'tag', 'attrs', 'start', 'end'])
+
+HEADING_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+
+# Tags that never have a closing tag
+VOID_TAGS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link',
+    'meta', 'param', 'source', 'track', 'wbr'
+}
+
+_stats = {"reads": 0, "parses": 0, "hits": 0, "writes": 0, "tree_scans": 0}
+_documents = {}  # resolved path -> (mtime_ns, size, HTMLDocument)
+_trees = {}  # resolved base dir -> [Path]
+
+
+class _Tokenizer(HTMLParser):
+    """Records every token with absolute start/end offsets."""
+
+    def __init__(self, source):
+        super().__init__(convert_charrefs=False)
+        self.source = source
+        self.line_starts = [0]
+        position = source.find('\n')
+        while position != -1:
+            self.line_starts.append(position + 1)
+            position = source.find('\n', position + 1)
+        self.tokens = []
+
+    def _offset(self):
+        line, column = self.getpos()
+        return self.line_starts[line - 1] + column
+
+    def _closing(self, start, marker):
+        end = self.source.find(marker, start)
+        return len(self.source) if end == -1 else end + len(marker)
+
+    def handle_starttag(self, tag, attrs):
+        start = self._offset()
+        self.tokens.append(Token('start', tag, _attr_dict(attrs), start, start + len(self.get_starttag_text())))
+
+    def handle_startendtag(self, tag, attrs):
+        start = self._offset()
+        self.tokens.append(Token('startend', tag, _attr_dict(attrs), start, start + len(self.get_starttag_text())))
+
+    def handle_endtag(self, tag):
+        start = self._offset()
+        self.tokens.append(Token('end', tag, None, start, self._closing(start, '>')))
+
+    def handle_data(self, data):
+        start = self._offset()
+        self._append_text(start, start + len(data))
+
+    def handle_entityref(self, name):
+        self._append_reference('&' + name)
+
+    def handle_charref(self, name):
+        self._append_reference('&#' + name)
+
+    def _append_reference(self, text):
+        start = self._offset()
+        end = start + len(text)
+        if self.source.startswith(';', end):
+            end += 1
+        self._append_text(start, end)
+
+    def _append_text(self, start, end):
+        # Keep runs of text and entity references as one data token
+        if self.tokens and self.tokens[-1].kind == 'data' and self.tokens[-1].end == start:
+            self.tokens[-1] = self.tokens[-1]._replace(end=end)
+        else:
+            self.tokens.append(Token('data', None, None, start, end))
+
+    def handle_comment(self, data):
+        start = self._offset()
+        self.tokens.append(Token('comment', None, None, start, self._closing(start, '-->')))
+
+    def handle_decl(self, decl):
+        start = self._offset()
+        self.tokens.append(Token('decl', None, None, start, self._closing(start, '>')))
+
+    def handle_pi(self, data):
+        start = self._offset()
+        self.tokens.append(Token('pi', None, None, start, self._closing(start, '>')))
+
+
+def _attr_dict(attrs):
+    """First value wins for repeated attributes, like browsers do. Valueless attributes map to ''."""
+    result = {}
+    for name, value in attrs:
+        if name not in result:
+            result[name] = '' if value is None else value
+    return result
+
+
+class HTMLDocument:
+    """A parsed page: source text, token list and per-tag index."""
+
+    def __init__(self, path, source, encoding='utf-8'):
+        self.path = Path(path)
+        self.source = source
+        self.encoding = encoding
+        self._tokens = None
+        self.line_starts = None
+        self._by_tag = {}
+        self._closing = {}
+        self._text_blocks = None
+
+    @property
+    def tokens(self):
+        """Token list, parsed on first use (fixers that only need .source never pay for it)."""
+        self._ensure_parsed()
+        return self._tokens
+
+    def _ensure_parsed(self):
+        if self._tokens is None:
+            self._parse()
+
+    def _parse(self):
+        tokenizer = _Tokenizer(self.source)
+        tokenizer.feed(self.source)
+        tokenizer.close()
+        self._tokens = tokenizer.tokens
+        self.line_starts = tokenizer.line_starts
+        _stats["parses"] += 1
+
+        open_tags = []
+        for index, token in enumerate(self._tokens):
+            if token.kind in ('start', 'startend'):
+                self._by_tag.setdefault(token.tag, []).append(index)
+                if token.kind == 'start' and token.tag not in VOID_TAGS:
+                    open_tags.append(index)
+            elif token.kind == 'end':
+                # Match the nearest open tag of the same name; anything above it was left unclosed
+                for depth in range(len(open_tags) - 1, -1, -1):
+                    if self._tokens[open_tags[depth]].tag == token.tag:
+                        self._closing[open_tags[depth]] = index
+                        del open_tags[depth:]
+                        break
+
+    # -- lookups -------------------------------------------------------------
+
+    def elements(self, *tags):
+        """Start-tag tokens for the given tags (all tags if none given), in source order."""
+        if not tags:
+            return [token for token in self.tokens if token.kind in ('start', 'startend')]
+        return [self.tokens[index] for index in self.element_indexes(*tags)]
+
+    def element_indexes(self, *tags):
+        """Token indexes of the start tags for the given tags, in source order."""
+        self._ensure_parsed()
+        return sorted(index for tag in tags for index in self._by_tag.get(tag, []))
+
+    def closing_index(self, index):
+        """Token index of the end tag matching the start tag at `index`, or None."""
+        self._ensure_parsed()
+        return self._closing.get(index)
+
+    def raw(self, token):
+        """Original source text of a token (e.g. the full start tag)."""
+        return self.source[token.start:token.end]
+
+    def text(self, token):
+        """Decoded text of a data token."""
+        return unescape(self.source[token.start:token.end])
+
+    def inner_text(self, index):
+        """Visible text between a start tag (by token index) and its closing tag."""
+        end = self.closing_index(index)
+        if end is None:
+            return ''
+        parts = [self.text(token) for token in self.tokens[index + 1:end] if token.kind == 'data']
+        return ' '.join(''.join(parts).split())
+
+    def inner_source(self, index):
+        """Raw source between a start tag (by token index) and its closing tag."""
+        end = self.closing_index(index)
+        if end is None:
+            return ''
+        return self.source[self.tokens[index].end:self.tokens[end].start]
+
+    def classes(self, token):
+        return (token.attrs or {}).get('class', '').split()
+
+    def line_of(self, offset):
+        """1-based line number of a source offset."""
+        self._ensure_parsed()
+        return bisect_right(self.line_starts, offset)
+
+    def text_blocks(self):
+        """Visible text blocks (see html_text), built from the tokens instead of a second parse."""
+        if self._text_blocks is None:
+            parser = TextBlockParser()
+            for token in self.tokens:
+                if token.kind == 'start':
+                    parser.handle_starttag(token.tag, token.attrs)
+                elif token.kind == 'startend':
+                    parser.handle_startendtag(token.tag, token.attrs)
+                elif token.kind == 'end':
+                    parser.handle_endtag(token.tag)
+                elif token.kind == 'data':
+                    parser.handle_data(self.text(token))
+            parser.flush()
+            self._text_blocks = parser.take_blocks()
+        return self._text_blocks
+
+    def style_sources(self):
+        """CSS in the page: <style> bodies and style="" attributes."""
+        sources = [self.inner_source(index) for index in self.element_indexes('style')]
+        sources.extend(token.attrs['style'] for token in self.elements() if token.attrs.get('style'))
+        return sources
+
+
+# ---------------------------------------------------------------------------
+# File access
+# ---------------------------------------------------------------------------
+
+def _read_text(path):
+    """(text, encoding): UTF-8, or Latin-1 for pages that aren't valid UTF-8."""
+    for encoding in ('utf-8', 'latin-1'):
+        try:
+            with open(path, 'r', encoding=encoding) as f:
+                return f.read(), encoding
+        except UnicodeDecodeError:
+            continue
+
+
+def load_document(path):
+    """Read and parse a page, or return the cached parse if the file is unchanged."""
+    key = os.path.abspath(path)
+    stat = os.stat(key)
+    cached = _documents.get(key)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        _stats["hits"] += 1
+        return cached[2]
+
+    source, encoding = _read_text(key)
+    _stats["reads"] += 1
+    document = HTMLDocument(path, source, encoding)
+    _documents[key] = (stat.st_mtime_ns, stat.st_size, document)
+    return document
+
+
+def save_document(path, content, encoding=None):
+    """Write a page and keep the cache in step with what's on disk.
+
+    The page keeps the encoding it was loaded with (UTF-8 for pages that were
+    never loaded), so a Latin-1 page isn't silently transcoded. Characters the
+    encoding can't hold are written as character references.
+    """
+    key = os.path.abspath(path)
+    cached = _documents.pop(key, None)
+    if encoding is None:
+        encoding = cached[2].encoding if cached else 'utf-8'
+    with open(path, 'w', encoding=encoding, errors='xmlcharrefreplace') as f:
+        f.write(content)
+    _stats["writes"] += 1
+    # Parsed lazily on the next load_document
+
+
+def find_html_files(base_dir, exclude_parts=(), exclude_names=()):
+    """All .html files under base_dir (walked once per process), minus exclusions.
+
+    exclude_parts skips any path containing one of the strings;
+    exclude_names skips exact file names.
+    """
+    key = os.path.abspath(base_dir)
+    files = _trees.get(key)
+    if files is None:
+        _stats["tree_scans"] += 1
+        files = sorted(f for f in Path(base_dir).glob('**/*.html') if f.is_file())
+        _trees[key] = files
+    return [f for f in files
+            if not any(part in str(f) for part in exclude_parts) and f.name not in exclude_names]
+
+
+def document_stats():
+    return dict(_stats, cached_documents=len(_documents))
+
+
+def clear_cache():
+    _documents.clear()
+    _trees.clear()
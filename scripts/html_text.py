@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Streaming HTML-to-Text Extractor
+Turns HTML pages into clean text blocks without loading the whole file or
+regex-stripping tags.
+
+Files are read in chunks and fed to html.parser, so memory stays bounded by
+the chunk size plus the largest text block. Each block carries the headings
+it appears under, which keeps "Compound Interest > Example" style context
+for the knowledge base builders. Script, style and template bodies are
+dropped, and entities like &amp; are decoded.
+
+Used by scripts/integrate_course_materials.py, the audit scripts and
+_archived/ai_training_system.py.
+"""
+
+from collections import namedtuple
+from html.parser import HTMLParser
+
+CHUNK_SIZE = 64 * 1024
+MAX_BLOCK_CHARS = 20000  # a block with no tags in it is split past this size
+
+# Elements whose content is never visible text
+SKIP_TAGS = {'script', 'style', 'template', 'noscript', 'svg', 'head'}
+
+# Elements that start a new text block
+BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'body', 'dd', 'details', 'dialog',
+    'div', 'dl', 'dt', 'fieldset', 'figcaption', 'figure', 'footer', 'form',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main', 'nav',
+    'ol', 'p', 'pre', 'section', 'summary', 'table', 'tbody', 'td', 'tfoot',
+    'th', 'thead', 'tr', 'ul', 'button', 'label', 'option'
+}
+
+HEADING_LEVELS = {f'h{level}': level for level in range(1, 7)}
+
+# Internal marker for <br>, turned into "\n" when a block is flushed
+_LINE_BREAK = '\x00'
+
+TextBlock = namedtuple('TextBlock', ['text', 'tag', 'headings'])
+TextBlock.__doc__ = """One run of visible text.
+
+text      whitespace-collapsed text; <br> becomes a newline
+tag       innermost block element the text was in ('p', 'li', 'h2', ...)
+headings  tuple of heading texts above this block, outermost first
+"""
+
+
+class TextBlockParser(HTMLParser):
+    """html.parser subclass that collects TextBlocks as it is fed."""
+
+    def __init__(self, max_block_chars=MAX_BLOCK_CHARS):
+        super().__init__(convert_charrefs=True)
+        self.max_block_chars = max_block_chars
+        self.blocks = []  # completed blocks not yet handed out
+        self.parts = []
+        self.part_chars = 0
+        self.block_stack = []
+        self.skip_depth = 0
+        self.skip_tag = None
+        self.headings = []  # [(level, text)]
+        self.heading_level = None
+
+    # -- tag handling -------------------------------------------------------
+
+    def handle_starttag(self, tag, attrs):
+        if self.skip_depth:
+            if tag == self.skip_tag:
+                self.skip_depth += 1
+                return
+            if not (self.skip_tag == 'head' and tag == 'body'):  # </head> is optional
+                return
+            self.skip_depth = 0
+        if tag in SKIP_TAGS:
+            self.skip_tag = tag
+            self.skip_depth = 1
+            return
+        if tag == 'br':
+            self.parts.append(_LINE_BREAK)
+            return
+        if tag in BLOCK_TAGS:
+            self.flush()
+            self.block_stack.append(tag)
+            if tag in HEADING_LEVELS:
+                self.heading_level = HEADING_LEVELS[tag]
+
+    def handle_startendtag(self, tag, attrs):
+        if tag == 'br' and not self.skip_depth:
+            self.parts.append(_LINE_BREAK)
+        elif tag in BLOCK_TAGS and not self.skip_depth:
+            self.flush()
+
+    def handle_endtag(self, tag):
+        if self.skip_depth:
+            if tag == self.skip_tag:
+                self.skip_depth -= 1
+            return
+        if tag in BLOCK_TAGS:
+            self.flush()
+            if tag in self.block_stack:
+                # Tolerate unclosed children (<li> without </li>, etc.)
+                while self.block_stack and self.block_stack.pop() != tag:
+                    pass
+            if tag in HEADING_LEVELS:
+                self.heading_level = None
+
+    def handle_data(self, data):
+        if self.skip_depth:
+            return
+        self.parts.append(data)
+        self.part_chars += len(data)
+        if self.part_chars > self.max_block_chars:
+            self.flush()
+
+    # -- block assembly -----------------------------------------------------
+
+    def flush(self):
+        """Close the current text run and record it as a block."""
+        if not self.parts:
+            return
+        raw = ''.join(self.parts)
+        self.parts = []
+        self.part_chars = 0
+
+        lines = [' '.join(line.split()) for line in raw.split(_LINE_BREAK)]
+        text = '\n'.join(line for line in lines if line)
+        if not text:
+            return
+
+        tag = self.block_stack[-1] if self.block_stack else None
+        if self.heading_level is not None:
+            # A heading replaces any heading at the same or a deeper level
+            while self.headings and self.headings[-1][0] >= self.heading_level:
+                self.headings.pop()
+            self.blocks.append(TextBlock(text, tag, tuple(h for _, h in self.headings)))
+            self.headings.append((self.heading_level, text))
+        else:
+            self.blocks.append(TextBlock(text, tag, tuple(h for _, h in self.headings)))
+
+    def take_blocks(self):
+        blocks, self.blocks = self.blocks, []
+        return blocks
+
+
+def iter_text_blocks(path=None, html=None, chunk_size=CHUNK_SIZE):
+    """Yield TextBlocks from an HTML file (path=) or an HTML string (html=).
+
+    Files are read chunk by chunk; blocks are yielded as soon as they are
+    complete.
+    """
+    if (path is None) == (html is None):
+        raise TypeError("iter_text_blocks() takes exactly one of path= or html=")
+    if html is not None:
+        return _feed(TextBlockParser(), (html[i:i + chunk_size] for i in range(0, len(html), chunk_size)))
+    return _feed_file(path, chunk_size)
+
+
+def _feed_file(path, chunk_size):
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        yield from _feed(TextBlockParser(), iter(lambda: f.read(chunk_size), ''))
+
+
+def _feed(parser, chunks):
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from parser.take_blocks()
+    parser.close()
+    parser.flush()
+    yield from parser.take_blocks()
+
+
+def html_to_text(path=None, html=None, separator='\n'):
+    """All visible text in a page (path= or html=, as for iter_text_blocks), one block per line by default."""
+    return separator.join(block.text for block in iter_text_blocks(path=path, html=html))
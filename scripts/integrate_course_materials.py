@@ -2,22 +2,42 @@
 """
 Integrate ALL course materials into the AI tutor system.
 This script reads all course materials and creates a comprehensive knowledge base.
+
+Builds are incremental: a manifest of file sizes, mtimes and content hashes is
+kept next to the knowledge base, and only new or changed files are re-read and
+re-extracted. Their sections of the existing knowledge base are patched in place.
+Run with --full to ignore the manifest and rebuild everything.
+
+Extraction runs in a process pool (--workers N, or KB_BUILD_WORKERS; default
+one per CPU). Results are merged in sorted path order, so the output doesn't
+depend on which worker finishes first. --timing prints per-file times.
 """
 
+import hashlib
 import json
 import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import re
 
+from html_text import html_to_text
+
+COURSE_MATERIALS_DIR = Path("course_materials")
+OUTPUT_PATH = Path("ai_knowledge_base_comprehensive.json")
+MANIFEST_PATH = Path(".kb_build_manifest.json")
+MANIFEST_VERSION = 2  # bump when extraction output changes
+
 def extract_content_from_file(file_path):
     """Extract meaningful content from a file."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Remove HTML tags if it's an HTML file
         if file_path.suffix == '.html':
-            content = re.sub(r'<[^>]+>', '', content)
+            # Streamed through html.parser; script/style bodies are dropped
+            content = html_to_text(path=file_path)
+        else:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
         
         # Clean up whitespace
         content = re.sub(r'\s+', ' ', content).strip()
@@ -27,11 +47,37 @@ def extract_content_from_file(file_path):
         print(f"Error reading {file_path}: {e}")
         return ""
 
-def build_comprehensive_knowledge_base():
-    """Build a comprehensive knowledge base from all course materials."""
+def timed_extract(file_path):
+    """Process pool worker: extract one file and time it."""
+    started = time.perf_counter()
+    content = extract_content_from_file(file_path)
+    return content, time.perf_counter() - started
+
+def extract_files(course_materials_dir, relative_paths, workers, file_timings):
+    """Extract many files, in parallel when it pays off.
+    
+    Returns {relative_path: content}; per-file seconds go into file_timings.
+    """
+    paths = [course_materials_dir / relative_path for relative_path in relative_paths]
+    if workers > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+            # map() yields in submission order, which keeps the merge deterministic
+            results = list(pool.map(timed_extract, paths, chunksize=max(1, len(paths) // (workers * 4))))
+    else:
+        results = [timed_extract(path) for path in paths]
     
-    course_materials_dir = Path("course_materials")
-    knowledge_base = {
+    extracted = {}
+    for relative_path, (content, seconds) in zip(relative_paths, results):
+        extracted[relative_path] = content
+        file_timings[relative_path] = seconds
+    return extracted
+
+def default_worker_count():
+    return int(os.getenv('KB_BUILD_WORKERS', os.cpu_count() or 1))
+
+def empty_knowledge_base():
+    """Knowledge base skeleton with every section the tutor expects."""
+    return {
         "math": {
             "formulas": {},
             "concepts": {},
@@ -46,67 +92,201 @@ def build_comprehensive_knowledge_base():
             "citation_guides": {}
         }
     }
+
+def categorize_file(file_path):
+    """Return the (section, category, key) slot a course material file fills."""
+    # Determine category
+    if 'formula' in str(file_path).lower():
+        if 'chapter_6' in str(file_path):
+            return ("math", "formulas", "chapter_6")
+        elif 'chapter_7' in str(file_path):
+            return ("math", "formulas", "chapter_7")
+        elif 'unit_4' in str(file_path):
+            return ("math", "formulas", "unit_4")
+        elif 'unit_1' in str(file_path):
+            return ("math", "formulas", "unit_1")
+        else:
+            return ("math", "formulas", "general")
+    
+    elif 'schedule' in str(file_path).lower():
+        return ("math", "schedules", "fall_2025")
+    
+    elif 'guide' in str(file_path).lower():
+        if 'all_sections' in str(file_path):
+            return ("math", "study_guides", "complete_guide")
+        else:
+            return ("math", "study_guides", "general")
+    
+    elif 'hawkes' in str(file_path).lower():
+        return ("math", "assignments", "hawkes_setup")
+    
+    elif 'resources' in str(file_path).lower():
+        return ("math", "concepts", "chapter_resources")
+    
+    elif 'sample' in str(file_path).lower():
+        return ("math", "assignments", "sample_assignments")
+    
+    else:
+        # General content
+        if 'math' in str(file_path).lower() or 'mat' in str(file_path).lower():
+            return ("math", "concepts", "general")
+        else:
+            return ("english", "writing_guides", "general")
+
+def find_material_files(course_materials_dir):
+    """All .html/.md course materials, in a stable order."""
+    return sorted(
+        file_path for file_path in course_materials_dir.rglob("*")
+        if file_path.is_file() and file_path.suffix in ['.html', '.md']
+    )
+
+def file_digest(file_path):
+    with open(file_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def load_manifest():
+    """Previous build's per-file fingerprints, or an empty manifest."""
+    try:
+        with open(MANIFEST_PATH, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get("version") == MANIFEST_VERSION:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {"version": MANIFEST_VERSION, "files": {}}
+
+def load_previous_knowledge_base():
+    try:
+        with open(OUTPUT_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def build_comprehensive_knowledge_base(full=False, workers=None, timings=None):
+    """Build a comprehensive knowledge base from all course materials.
+    
+    Returns (knowledge_base, manifest, changed) where `changed` lists the
+    files that were re-extracted. If a `timings` dict is passed it is filled
+    with {"stages": {name: seconds}, "files": {path: seconds}}.
+    """
+    course_materials_dir = COURSE_MATERIALS_DIR
+    workers = workers or default_worker_count()
+    if timings is None:
+        timings = {}
+    stage_timings = timings.setdefault("stages", {})
+    file_timings = timings.setdefault("files", {})
+    stage_started = time.perf_counter()
+    
+    manifest = {"version": MANIFEST_VERSION, "files": {}} if full else load_manifest()
+    knowledge_base = None if full else load_previous_knowledge_base()
+    if knowledge_base is None:
+        # Nothing to patch, so every file has to be processed
+        manifest = {"version": MANIFEST_VERSION, "files": {}}
+        knowledge_base = empty_knowledge_base()
     
     if not course_materials_dir.exists():
         print("❌ course_materials directory not found!")
-        return knowledge_base
+        return knowledge_base, manifest, []
     
-    # Process all files in course_materials
-    for file_path in course_materials_dir.rglob("*"):
-        if file_path.is_file() and file_path.suffix in ['.html', '.md']:
-            content = extract_content_from_file(file_path)
-            if not content:
-                continue
-            
-            # Categorize content based on file path and content
-            relative_path = file_path.relative_to(course_materials_dir)
-            path_parts = str(relative_path).split('/')
-            
-            # Determine category
-            if 'formula' in str(file_path).lower():
-                if 'chapter_6' in str(file_path):
-                    knowledge_base["math"]["formulas"]["chapter_6"] = content
-                elif 'chapter_7' in str(file_path):
-                    knowledge_base["math"]["formulas"]["chapter_7"] = content
-                elif 'unit_4' in str(file_path):
-                    knowledge_base["math"]["formulas"]["unit_4"] = content
-                elif 'unit_1' in str(file_path):
-                    knowledge_base["math"]["formulas"]["unit_1"] = content
-                else:
-                    knowledge_base["math"]["formulas"]["general"] = content
-            
-            elif 'schedule' in str(file_path).lower():
-                knowledge_base["math"]["schedules"]["fall_2025"] = content
-            
-            elif 'guide' in str(file_path).lower():
-                if 'all_sections' in str(file_path):
-                    knowledge_base["math"]["study_guides"]["complete_guide"] = content
-                else:
-                    knowledge_base["math"]["study_guides"]["general"] = content
-            
-            elif 'hawkes' in str(file_path).lower():
-                knowledge_base["math"]["assignments"]["hawkes_setup"] = content
-            
-            elif 'resources' in str(file_path).lower():
-                knowledge_base["math"]["concepts"]["chapter_resources"] = content
-            
-            elif 'sample' in str(file_path).lower():
-                knowledge_base["math"]["assignments"]["sample_assignments"] = content
-            
-            else:
-                # General content
-                if 'math' in str(file_path).lower() or 'mat' in str(file_path).lower():
-                    knowledge_base["math"]["concepts"]["general"] = content
-                else:
-                    knowledge_base["english"]["writing_guides"]["general"] = content
+    old_entries = manifest["files"]
+    new_entries = {}
+    changed = []
+    affected_slots = set()
     
-    return knowledge_base
+    # Fingerprint files: stat first, hash only when size/mtime moved
+    for file_path in find_material_files(course_materials_dir):
+        relative_path = file_path.relative_to(course_materials_dir).as_posix()
+        stat = file_path.stat()
+        slot = list(categorize_file(file_path))
+        entry = old_entries.get(relative_path)
+        
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns and entry["slot"] == slot:
+            new_entries[relative_path] = entry
+            continue
+        
+        digest = file_digest(file_path)
+        if entry and entry["sha256"] == digest and entry["slot"] == slot:
+            new_entries[relative_path] = dict(entry, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            continue
+        
+        new_entries[relative_path] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": digest,
+            "slot": slot,
+            "empty": False
+        }
+        changed.append(relative_path)
+        affected_slots.add(tuple(slot))
+        if entry:
+            affected_slots.add(tuple(entry["slot"]))
+    
+    # Deleted files free up their slot
+    for relative_path, entry in old_entries.items():
+        if relative_path not in new_entries:
+            affected_slots.add(tuple(entry["slot"]))
+    stage_timings["scan"] = time.perf_counter() - stage_started
+    
+    # Extract the new/changed files
+    stage_started = time.perf_counter()
+    extracted = extract_files(course_materials_dir, changed, workers, file_timings)
+    for relative_path, content in extracted.items():
+        new_entries[relative_path]["empty"] = not content
+    
+    # The last non-empty file (in path order) wins each affected slot
+    winners = {}
+    for slot in affected_slots:
+        winners[slot] = None
+        for relative_path, entry in new_entries.items():
+            if tuple(entry["slot"]) == slot and not entry["empty"]:
+                winners[slot] = relative_path
+    
+    # Unchanged winners (e.g. after a sibling file was deleted) need their content too
+    missing = sorted(w for w in winners.values() if w is not None and w not in extracted)
+    extracted.update(extract_files(course_materials_dir, missing, workers, file_timings))
+    stage_timings["extract"] = time.perf_counter() - stage_started
+    
+    # Patch each affected slot
+    stage_started = time.perf_counter()
+    for slot, winner in sorted(winners.items()):
+        section, category, key = slot
+        target = knowledge_base.setdefault(section, {}).setdefault(category, {})
+        if winner is None:
+            target.pop(key, None)
+        else:
+            target[key] = extracted[winner]
+    stage_timings["merge"] = time.perf_counter() - stage_started
+    
+    manifest = {"version": MANIFEST_VERSION, "files": new_entries}
+    return knowledge_base, manifest, changed
+
+def print_timing_report(timings, workers, show_files=False):
+    """Per-stage (and optionally per-file) build timings."""
+    stages = timings.get("stages", {})
+    files = timings.get("files", {})
+    print(f"⏱️  Build timing ({workers} worker{'s' if workers != 1 else ''}):")
+    for stage, seconds in stages.items():
+        print(f"   {stage:<10}{seconds * 1000:>10.2f} ms")
+    print(f"   {'total':<10}{sum(stages.values()) * 1000:>10.2f} ms")
+    if files:
+        cpu = sum(files.values())
+        print(f"   {len(files)} files extracted, {cpu * 1000:.2f} ms of extraction work")
+    if show_files:
+        for relative_path, seconds in sorted(files.items(), key=lambda item: -item[1]):
+            print(f"   {seconds * 1000:>10.2f} ms  {relative_path}")
 
-def create_enhanced_knowledge_base():
+def create_enhanced_knowledge_base(full=False, workers=None, show_file_timings=False):
     """Create an enhanced knowledge base with all course materials."""
     print("🔍 Building comprehensive knowledge base from course materials...")
     
-    knowledge_base = build_comprehensive_knowledge_base()
+    workers = workers or default_worker_count()
+    timings = {}
+    knowledge_base, manifest, changed = build_comprehensive_knowledge_base(full=full, workers=workers, timings=timings)
+    if not full and not changed and OUTPUT_PATH.exists() and manifest == load_manifest():
+        print("✅ Knowledge base is up to date (no course materials changed)")
+        print_timing_report(timings, workers, show_file_timings)
+        return knowledge_base
+    print(f"♻️  Re-extracted {len(changed)} of {len(manifest['files'])} files")
     
     # Add specific course information
     knowledge_base["course_info"] = {
@@ -144,14 +324,28 @@ def create_enhanced_knowledge_base():
     }
     
     # Save the enhanced knowledge base
-    output_path = Path("ai_knowledge_base_comprehensive.json")
+    write_started = time.perf_counter()
+    output_path = OUTPUT_PATH
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(knowledge_base, f, indent=2, ensure_ascii=False)
     
+    # Save the manifest last so a failed write forces a re-extract next time
+    with open(MANIFEST_PATH, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    timings["stages"]["write"] = time.perf_counter() - write_started
+    
     print(f"✅ Comprehensive knowledge base saved to {output_path}")
     print(f"📊 Total sections: {sum(len(section) for section in knowledge_base['math'].values())}")
+    print_timing_report(timings, workers, show_file_timings)
     
     return knowledge_base
 
 if __name__ == "__main__":
-    create_enhanced_knowledge_base()
+    workers = None
+    if '--workers' in sys.argv:
+        workers = int(sys.argv[sys.argv.index('--workers') + 1])
+    create_enhanced_knowledge_base(
+        full='--full' in sys.argv,
+        workers=workers,
+        show_file_timings='--timing' in sys.argv
+    )
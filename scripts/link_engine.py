@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Async External Link Engine
+Checks external links from one asyncio event loop for LinkChecker.
+
+- A global limit caps the number of requests in flight, and a per-host
+  limit stops one slow server from taking every slot.
+- Each link is checked with HEAD first. Servers that reject HEAD
+  (400/403/405/501) get a GET that fetches only the headers.
+- Connections are pooled and reused for every request to a host.
+- Timeouts, connection errors and 429/5xx answers are retried with
+  exponential backoff. A numeric Retry-After header is honoured, up to a cap.
+  Slots are only held while a request is in flight, never during a backoff.
+- Results go through the shared LinkStatusCache (see link_status_cache.py).
+
+aiohttp is used when it is installed. Otherwise blocking calls on a pooled
+requests.Session are run in a thread pool sized to the global limit, so the
+limits and retry policy are the same either way.
+
+check_all() runs a batch on a fresh event loop. check() serves one-off
+checks from a background loop that stays open, so repeated single checks
+share one connection pool and one set of limits instead of each starting
+an engine of their own.
+
+Limits come from LINK_CHECK_CONCURRENCY (default 32) and
+LINK_CHECK_PER_HOST (default 4).
+"""
+
+import asyncio
+import os
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from link_status_cache import LinkStatusCache
+
+GLOBAL_LIMIT = int(os.getenv('LINK_CHECK_CONCURRENCY', 32))
+PER_HOST_LIMIT = int(os.getenv('LINK_CHECK_PER_HOST', 4))
+USER_AGENT = 'Mozilla/5.0 (compatible; LinkChecker/1.0)'
+
+# Statuses after which HEAD is retried as GET
+HEAD_REJECTED = {400, 403, 405, 501}
+# Statuses (and network errors) that are worth retrying
+RETRY_STATUSES = {429, 502, 503, 504}
+MAX_RETRIES = 2
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+
+
+class _Response:
+    """The parts of an HTTP response the engine looks at."""
+
+    def __init__(self, status, final_url, headers):
+        self.status = status
+        self.final_url = final_url
+        self.headers = headers
+
+
+class _AiohttpTransport:
+    def __init__(self, global_limit, per_host_limit, timeout):
+        self.global_limit = global_limit
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.session = None
+
+    async def open(self):
+        connector = aiohttp.TCPConnector(limit=self.global_limit, limit_per_host=self.per_host_limit)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={'User-Agent': USER_AGENT}
+        )
+
+    async def request(self, method, url, headers):
+        try:
+            async with self.session.request(method, url, headers=headers, allow_redirects=True) as response:
+                return _Response(response.status, str(response.url), response.headers)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise ConnectionError(str(e) or type(e).__name__) from e
+
+    async def close(self):
+        await self.session.close()
+
+
+class _RequestsTransport:
+    """Blocking requests.Session calls offloaded to a thread pool."""
+
+    def __init__(self, global_limit, per_host_limit, timeout):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': USER_AGENT})
+        # pool_maxsize is per host: one kept-alive connection per allowed in-flight request
+        adapter = HTTPAdapter(pool_connections=global_limit, pool_maxsize=per_host_limit)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.executor = ThreadPoolExecutor(max_workers=global_limit, thread_name_prefix='link-check')
+
+    async def open(self):
+        pass
+
+    def _request(self, method, url, headers):
+        try:
+            # stream=True: GET fallbacks read the headers, never the body
+            with self.session.request(method, url, headers=headers, timeout=self.timeout,
+                                      allow_redirects=True, stream=True) as response:
+                return _Response(response.status_code, response.url, response.headers)
+        except requests.exceptions.RequestException as e:
+            raise ConnectionError(str(e)) from e
+
+    async def request(self, method, url, headers):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._request, method, url, headers)
+
+    async def close(self):
+        self.executor.shutdown(wait=False)
+        self.session.close()
+
+
+class AsyncLinkEngine:
+    def __init__(self, status_cache=None, global_limit=GLOBAL_LIMIT, per_host_limit=PER_HOST_LIMIT,
+                 timeout=10, max_retries=MAX_RETRIES):
+        self.status_cache = status_cache or LinkStatusCache(enabled=False)
+        self.global_limit = global_limit
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.stats = {'requests': 0, 'get_fallbacks': 0, 'retries': 0}
+        self._loop = None
+        self._lock = threading.Lock()
+
+    def check_all(self, link_infos, on_result=None):
+        """Check external links; returns results in input order.
+
+        on_result(result) is called as each check completes.
+        """
+        return asyncio.run(self._check_all(list(link_infos), on_result))
+
+    def check(self, link_info):
+        """Check one link on the engine's background loop (started on first use).
+
+        Safe to call from several threads; their checks run concurrently
+        under the same limits. Call close() when done.
+        """
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=loop.run_forever, name='link-engine', daemon=True)
+                self._thread.start()
+                asyncio.run_coroutine_threadsafe(self._open(), loop).result()
+                self._loop = loop
+            loop = self._loop
+        return asyncio.run_coroutine_threadsafe(self.check_link(link_info), loop).result()
+
+    def close(self):
+        """Stop the background loop used by check(), if it was started."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is not None:
+            asyncio.run_coroutine_threadsafe(self.transport.close(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            self._thread.join()
+            loop.close()
+
+    async def _open(self):
+        transport_class = _AiohttpTransport if aiohttp is not None else _RequestsTransport
+        self.transport = transport_class(self.global_limit, self.per_host_limit, self.timeout)
+        self.global_slots = asyncio.Semaphore(self.global_limit)
+        self.host_slots = {}
+        await self.transport.open()
+
+    async def _check_all(self, link_infos, on_result):
+        await self._open()
+        try:
+            async def run(link_info):
+                result = await self.check_link(link_info)
+                if on_result:
+                    on_result(result)
+                return result
+
+            return await asyncio.gather(*(run(link_info) for link_info in link_infos))
+        finally:
+            await self.transport.close()
+
+    def _host_slot(self, url):
+        host = (urlparse(url).hostname or '').lower()
+        if host not in self.host_slots:
+            self.host_slots[host] = asyncio.Semaphore(self.per_host_limit)
+        return self.host_slots[host]
+
+    async def check_link(self, link_info):
+        """Same result shape as LinkChecker.check_http_link."""
+        url = link_info['url']
+
+        cached = self.status_cache.fresh(url)
+        if cached:
+            return self.result_from_cache(link_info, cached, 'hit')
+
+        headers = self.status_cache.conditional_headers(url)
+        try:
+            response = await self._fetch('HEAD', url, headers)
+            if response.status in HEAD_REJECTED:
+                self.stats['get_fallbacks'] += 1
+                response = await self._fetch('GET', url, headers)
+        except ConnectionError as e:
+            result = {
+                'url': url,
+                'file': link_info['file'],
+                'link_type': link_info['link_type'],
+                'status': 'BROKEN',
+                'error': str(e),
+                'status_code': None
+            }
+            self.status_cache.record(url, result)
+            result['cache'] = 'miss'
+            return result
+
+        if response.status == 304 and headers:
+            return self.result_from_cache(link_info, self.status_cache.record_not_modified(url), 'revalidated')
+        result = {
+            'url': url,
+            'file': link_info['file'],
+            'link_type': link_info['link_type'],
+            'status': 'OK' if response.status < 400 else 'BROKEN',
+            'status_code': response.status,
+            'final_url': response.final_url
+        }
+        self.status_cache.record(url, result,
+                                 etag=response.headers.get('ETag'),
+                                 last_modified=response.headers.get('Last-Modified'))
+        result['cache'] = 'miss'
+        return result
+
+    async def _fetch(self, method, url, headers):
+        """One request with the retry policy; raises ConnectionError once retries run out.
+
+        The host and global slots are taken for each attempt and given back
+        before sleeping, so a backing-off link doesn't block other links.
+        """
+        attempt = 0
+        while True:
+            self.stats['requests'] += 1
+            try:
+                async with self._host_slot(url), self.global_slots:
+                    response = await self.transport.request(method, url, headers)
+            except ConnectionError:
+                if attempt >= self.max_retries:
+                    raise
+                response = None
+            if response is not None and (response.status not in RETRY_STATUSES or attempt >= self.max_retries):
+                return response
+            attempt += 1
+            self.stats['retries'] += 1
+            await asyncio.sleep(self._backoff(attempt, response))
+
+    def _backoff(self, attempt, response):
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), BACKOFF_MAX)
+        delay = min(BACKOFF_BASE * 2 ** (attempt - 1), BACKOFF_MAX)
+        return delay + random.uniform(0, delay / 2)
+
+    @staticmethod
+    def result_from_cache(link_info, entry, cache_state):
+        result = {
+            'url': link_info['url'],
+            'file': link_info['file'],
+            'link_type': link_info['link_type'],
+            'status': entry['status'],
+            'status_code': entry['status_code'],
+            'cache': cache_state
+        }
+        if entry.get('error'):
+            result['error'] = entry['error']
+        else:
+            result['final_url'] = entry['final_url']
+        return result
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Site Link Graph
+Page -> target edges for the whole site, with every unique target resolved
+once.
+
+The files that exist under the base directory are indexed by a single
+directory walk, so a link check is a set lookup instead of a stat() per
+occurrence. A target that 30 pages link to is resolved once for each
+directory those pages live in.
+
+The graph also answers two site-structure questions:
+- inbound link counts per target (how many distinct pages link to it)
+- orphan pages: HTML pages that no other page links to
+"""
+
+import os
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+# Never indexed; targets inside them fall back to a filesystem check
+SKIP_DIRS = {'.git', 'node_modules', '__pycache__'}
+
+# Entry points (and generated reports) that are expected to have no inbound links
+ENTRY_PAGES = {'index.html', 'link_check_report.html'}
+
+
+def _relative(path, base_dir):
+    return os.path.relpath(path, base_dir).replace(os.sep, '/')
+
+
+class LinkGraph:
+    def __init__(self, base_dir="."):
+        self.base_dir = os.path.abspath(base_dir)
+        self.files = set()  # relative paths of every file and directory
+        for root, dirs, files in os.walk(self.base_dir):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            rel_root = _relative(root, self.base_dir)
+            prefix = '' if rel_root == '.' else rel_root + '/'
+            if prefix:
+                self.files.add(rel_root)
+            self.files.update(prefix + name for name in files)
+        self.pages = set()
+        self.edges = {}  # page -> set of resolved targets
+        self._resolved = {}  # (page directory, url) -> (absolute target, exists)
+        self.stats = {'lookups': 0, 'resolutions': 0}
+
+    def resolve(self, page, url):
+        """(resolved path, exists) for a file link on a page.
+
+        The query string and #fragment are dropped and %-escapes decoded, so
+        'chapter-1.html#quiz' resolves to chapter-1.html. Resolution is
+        memoized per (page directory, url).
+        """
+        self.stats['lookups'] += 1
+        page_dir = os.path.dirname(os.path.abspath(page))
+        key = (page_dir, url)
+        cached = self._resolved.get(key)
+        if cached is not None:
+            return cached
+
+        self.stats['resolutions'] += 1
+        target = unquote(urlsplit(url).path)
+        if not target:
+            # Pure query/fragment link: points back at the page itself
+            absolute = os.path.abspath(page)
+        elif target.startswith('/'):
+            # Absolute path from project root
+            absolute = os.path.normpath(os.path.join(self.base_dir, target.lstrip('/')))
+        else:
+            absolute = os.path.normpath(os.path.join(page_dir, target))
+        relative = _relative(absolute, self.base_dir)
+        if relative == '.':
+            exists = True
+        elif relative.startswith('../') or relative.split('/', 1)[0] in SKIP_DIRS:
+            exists = os.path.exists(absolute)
+        else:
+            exists = relative in self.files
+        self._resolved[key] = (absolute, exists)
+        return self._resolved[key]
+
+    def add_page(self, page):
+        self.pages.add(_relative(os.path.abspath(page), self.base_dir))
+
+    def add_edge(self, page, url):
+        """Record a page -> target link; returns (resolved path, exists)."""
+        absolute, exists = self.resolve(page, url)
+        source = _relative(os.path.abspath(page), self.base_dir)
+        self.pages.add(source)
+        self.edges.setdefault(source, set()).add(_relative(absolute, self.base_dir))
+        return absolute, exists
+
+    def inbound_counts(self):
+        """{target: number of other pages linking to it}, most linked first."""
+        counts = {}
+        for source, targets in self.edges.items():
+            for target in targets:
+                if target != source:
+                    counts[target] = counts.get(target, 0) + 1
+        return dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+
+    def orphan_pages(self):
+        """Pages with no inbound links from other pages (entry pages excluded)."""
+        linked = self.inbound_counts()
+        return sorted(page for page in self.pages
+                      if page not in linked and Path(page).name not in ENTRY_PAGES)
+
+    def report(self):
+        inbound = self.inbound_counts()
+        return {
+            'pages': len(self.pages),
+            'unique_targets': len({target for targets in self.edges.values() for target in targets}),
+            'edges': sum(len(targets) for targets in self.edges.values()),
+            'indexed_files': len(self.files),
+            'resolutions': self.stats['resolutions'],
+            'lookups': self.stats['lookups'],
+            'orphan_pages': self.orphan_pages(),
+            'inbound_links': inbound
+        }
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+External Link Status Cache
+On-disk memory of what each external URL returned, shared across runs.
+
+- Fresh entries (younger than the URL's TTL) are answered without touching
+  the network. TTLs are per domain: font CDNs barely change, course
+  platforms change more often.
+- Stale entries that came with an ETag or Last-Modified are revalidated
+  with a conditional request; a 304 just extends the entry.
+- Failures are cached too, with exponential backoff, so a dead host costs
+  one timeout per backoff window instead of one per page that links to it.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+CACHE_FILENAME = ".link_status_cache.json"
+
+HOUR = 3600
+DEFAULT_TTL = float(os.getenv('LINK_CACHE_TTL_HOURS', 24)) * HOUR
+
+# Suffix-matched against the URL host
+DOMAIN_TTLS = {
+    'fonts.googleapis.com': 7 * 24 * HOUR,
+    'fonts.gstatic.com': 7 * 24 * HOUR,
+    'cdn.jsdelivr.net': 7 * 24 * HOUR,
+    'unpkg.com': 7 * 24 * HOUR,
+    'cdn.tailwindcss.com': 7 * 24 * HOUR,
+    'hawkeslearning.com': 24 * HOUR,
+    'drive.google.com': 6 * HOUR,
+    'docs.google.com': 6 * HOUR,
+}
+
+# Negative caching: first retry after FAILURE_BACKOFF, doubling up to FAILURE_BACKOFF_MAX
+FAILURE_BACKOFF = 15 * 60
+FAILURE_BACKOFF_MAX = 24 * HOUR
+
+
+def ttl_for(url, domain_ttls=DOMAIN_TTLS, default_ttl=DEFAULT_TTL):
+    host = (urlparse(url).hostname or '').lower()
+    for domain, ttl in domain_ttls.items():
+        if host == domain or host.endswith('.' + domain):
+            return ttl
+    return default_ttl
+
+
+class LinkStatusCache:
+    """Thread-safe {url: status entry} store persisted as JSON."""
+
+    def __init__(self, base_dir=".", enabled=True, domain_ttls=DOMAIN_TTLS, default_ttl=DEFAULT_TTL):
+        self.path = Path(base_dir) / CACHE_FILENAME
+        self.enabled = enabled
+        self.domain_ttls = domain_ttls
+        self.default_ttl = default_ttl
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.stats = {"hits": 0, "negative_hits": 0, "revalidated": 0, "misses": 0}
+        if enabled and self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def fresh(self, url, now=None):
+        """The cached result if it's still within its TTL/backoff window, else None."""
+        if not self.enabled:
+            return None
+        now = now or time.time()
+        with self.lock:
+            entry = self.entries.get(url)
+            if entry and now < entry['expires_at']:
+                self.stats['negative_hits' if entry['status'] == 'BROKEN' else 'hits'] += 1
+                return entry
+        return None
+
+    def conditional_headers(self, url):
+        """If-None-Match / If-Modified-Since for a stale but validatable OK entry."""
+        with self.lock:
+            entry = self.entries.get(url)
+        headers = {}
+        if self.enabled and entry and entry['status'] == 'OK':
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def record_not_modified(self, url):
+        """A 304 came back: the old result stands for another TTL."""
+        now = time.time()
+        with self.lock:
+            entry = self.entries[url]
+            entry['checked_at'] = now
+            entry['expires_at'] = now + ttl_for(url, self.domain_ttls, self.default_ttl)
+            self.stats['revalidated'] += 1
+            return entry
+
+    def record(self, url, result, etag=None, last_modified=None):
+        """Store a fresh result; BROKEN results back off exponentially."""
+        now = time.time()
+        with self.lock:
+            self.stats['misses'] += 1
+            previous = self.entries.get(url) or {}
+            entry = {
+                'status': result['status'],
+                'status_code': result.get('status_code'),
+                'final_url': result.get('final_url'),
+                'error': result.get('error'),
+                'etag': etag,
+                'last_modified': last_modified,
+                'checked_at': now,
+                'failures': 0
+            }
+            if result['status'] == 'BROKEN':
+                entry['failures'] = previous.get('failures', 0) + 1
+                entry['expires_at'] = now + min(FAILURE_BACKOFF * 2 ** (entry['failures'] - 1), FAILURE_BACKOFF_MAX)
+            else:
+                entry['expires_at'] = now + ttl_for(url, self.domain_ttls, self.default_ttl)
+            self.entries[url] = entry
+            return entry
+
+    def save(self):
+        if not self.enabled:
+            return
+        with self.lock:
+            data = dict(self.entries)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Audit Rule Engine
+Runs every accessibility rule over a page in a single traversal of its
+tokens (see html_document.py).
+
+A rule declares which elements it cares about (`tags`) and which attributes
+(`attributes`); the engine builds a dispatch table from those, walks the
+token list once and hands each start tag only to the rules interested in
+it. Rules that need the whole page (text blocks, per-page summaries) do
+their work in finish(). Adding a rule adds a dictionary lookup per
+interesting element, not another pass over the document.
+
+Time spent in each rule is accumulated so slow rules show up in reports.
+"""
+
+import time
+from collections import defaultdict
+
+
+class Rule:
+    """Base class for audit rules.
+
+    category    results bucket the rule reports into (e.g. 'adhd_issues')
+    tags        element names to receive in element(); '*' for every element
+    attributes  attribute names; elements carrying one are also delivered
+    """
+
+    name = None
+    category = 'issues'
+    tags = ()
+    attributes = ()
+
+    def start(self, page):
+        """Called before the traversal of each page."""
+
+    def element(self, page, index, token):
+        """Called for each start tag the rule is interested in."""
+
+    def finish(self, page):
+        """Called after the traversal of each page."""
+
+
+class Page:
+    """Per-page state handed to rules: the document, its path and a report() sink."""
+
+    def __init__(self, document, file_path):
+        self.document = document
+        self.file_path = file_path
+        self.issues = defaultdict(list)
+        self.state = {}  # scratch space, keyed by rule name
+
+    def report(self, category, issue):
+        self.issues[category].append(issue)
+
+
+class RuleEngine:
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self.by_tag = defaultdict(list)
+        self.by_attribute = defaultdict(list)
+        self.every_element = []
+        for rule in self.rules:
+            rule.name = rule.name or type(rule).__name__
+            if '*' in rule.tags:
+                self.every_element.append(rule)
+                continue
+            for tag in rule.tags:
+                self.by_tag[tag].append(rule)
+            for attribute in rule.attributes:
+                self.by_attribute[attribute].append(rule)
+        self.timings = {rule.name: {'seconds': 0.0, 'calls': 0} for rule in self.rules}
+
+    def _call(self, rule, method, *args):
+        started = time.perf_counter()
+        method(*args)
+        timing = self.timings[rule.name]
+        timing['seconds'] += time.perf_counter() - started
+        timing['calls'] += 1
+
+    def run(self, document, file_path):
+        """Run all rules over one document; returns {category: [issues]}."""
+        page = Page(document, file_path)
+        for rule in self.rules:
+            self._call(rule, rule.start, page)
+
+        by_tag = self.by_tag
+        by_attribute = self.by_attribute
+        for index, token in enumerate(document.tokens):
+            if token.kind != 'start' and token.kind != 'startend':
+                continue
+            interested = by_tag.get(token.tag, ())
+            if by_attribute:
+                extra = [rule for name in token.attrs if name in by_attribute
+                         for rule in by_attribute[name] if rule not in interested]
+                if extra:
+                    interested = list(interested) + list(dict.fromkeys(extra))
+            for rule in self.every_element:
+                self._call(rule, rule.element, page, index, token)
+            for rule in interested:
+                self._call(rule, rule.element, page, index, token)
+
+        for rule in self.rules:
+            self._call(rule, rule.finish, page)
+        return page.issues
+
+    def merge_timings(self, timings):
+        """Add timings collected elsewhere (e.g. by a worker process's engine)."""
+        for name, timing in timings.items():
+            total = self.timings.setdefault(name, {'seconds': 0.0, 'calls': 0})
+            total['seconds'] += timing['seconds']
+            total['calls'] += timing['calls']
+
+    def timing_report(self):
+        """{rule name: {'ms': total milliseconds, 'calls': n}}, slowest first."""
+        ordered = sorted(self.timings.items(), key=lambda item: -item[1]['seconds'])
+        return {name: {'ms': round(timing['seconds'] * 1000, 2), 'calls': timing['calls']} for name, timing in ordered}
+
+    def print_timings(self):
+        print("\n⏱️  Rule timings:")
+        for name, timing in self.timing_report().items():
+            print(f"  {name:<32}{timing['ms']:>10.2f} ms  ({timing['calls']} calls)")
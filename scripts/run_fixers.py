@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Fixer Driver
+Runs several fix_*.py scripts in one process so they share html_document's
+file list and page cache.
+
+Run on their own, each fixer is a separate process that walks the tree and
+reads every page again. Here the tree is walked once, each page is read once,
+and only pages a fixer actually rewrote are read again by the next one.
+
+Usage: python scripts/run_fixers.py [fixer ...]
+    fixer  module names to run in order, e.g. fix_card_spacing fix_icons_simple
+           (with no names, lists the available fixers)
+"""
+
+import importlib
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+import html_document
+
+# module -> (fixer class, methods to call in order)
+FIXERS = {
+    'fix_accessibility': ('AccessibilityFixer', ('run_fixes', 'save_fix_report')),
+    'fix_accessibility_comprehensive': ('ComprehensiveAccessibilityFixer', ('run_comprehensive_fix',)),
+    'fix_accessibility_robust': ('RobustAccessibilityFixer', ('run_robust_fix',)),
+    'fix_accessibility_simple': ('SimpleAccessibilityFixer', ('run_fixes', 'save_fix_report')),
+    'fix_all_broken_links': ('ComprehensiveLinkFixer', ('run',)),
+    'fix_broken_links': ('BrokenLinkFixer', ('run',)),
+    'fix_card_spacing': ('CardSpacingFixer', ('run',)),
+    'fix_color_accessibility': ('ColorAccessibilityFixer', ('run',)),
+    'fix_critical_contrast': ('CriticalContrastFixer', ('run',)),
+    'fix_html_structure': ('HTMLStructureFixer', ('run',)),
+    'fix_icon_accessibility': ('IconAccessibilityFixer', ('run',)),
+    'fix_icon_accessibility_simple': ('SimpleIconAccessibilityFixer', ('run',)),
+    'fix_icons_simple': ('UltraSimpleIconFixer', ('run',)),
+    'fix_links_and_retro_style': ('LinksAndRetroStyleFixer', ('run',)),
+    'fix_remaining_contrast': ('RemainingContrastFixer', ('run',)),
+    'fix_remaining_links': ('RemainingLinkFixer', ('run',)),
+    'fix_spacing_and_links': ('SpacingAndLinksFixer', ('run',)),
+    'fix_spacing_simple': ('SimpleSpacingFixer', ('run',)),
+}
+
+
+def run_fixers(names, base_dir="."):
+    """Run the named fixers in order against base_dir, sharing one document cache."""
+    for name in names:
+        class_name, methods = FIXERS[name]
+        fixer = getattr(importlib.import_module(name), class_name)(base_dir)
+        print(f"\n▶️  {name}")
+        for method in methods:
+            getattr(fixer, method)()
+    return html_document.document_stats()
+
+
+def main():
+    names = [Path(name).stem for name in sys.argv[1:]]
+    if not names:
+        print(__doc__.strip())
+        print("\nAvailable fixers:")
+        for name in FIXERS:
+            print(f"  • {name}")
+        return
+
+    unknown = [name for name in names if name not in FIXERS]
+    if unknown:
+        print(f"❌ Unknown fixer(s): {', '.join(unknown)}")
+        sys.exit(1)
+
+    stats = run_fixers(names)
+    print("\n" + "=" * 60)
+    print(f"📄 Pages read: {stats['reads']}, cache hits: {stats['hits']}, "
+          f"pages written: {stats['writes']}, tree scans: {stats['tree_scans']}")
+
+
+if __name__ == "__main__":
+    main()
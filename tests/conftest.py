@@ -0,0 +1,12 @@
+"""Put api/ and scripts/ on the import path, the same way the scripts and endpoints import their helpers.
+
+The repository root goes on too, so tutor_system/ is imported as a package.
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+for folder in ("api", "scripts"):
+    sys.path.insert(0, str(ROOT / folder))
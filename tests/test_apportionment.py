@@ -0,0 +1,25 @@
+"""Apportionment: the modified divisor shown to students must reproduce the allocation."""
+
+import numpy as np
+import pytest
+
+from _apportionment import DIVISOR_METHODS, apportion, round_quotas
+
+
+@pytest.mark.parametrize("populations, seats", [([500, 300, 200], 9), ([6000, 4000, 1000], 9)])
+def test_adams_divisor_reproduces_allocation(populations, seats):
+    result = apportion(populations, seats, 'adams')
+    seats_column = result["table"]["seats"]
+    assert sum(seats_column) == seats
+    divisor = result["modified_divisor"]
+    assert np.ceil(np.array(populations) / divisor).astype(int).tolist() == seats_column
+    lowest, highest = result["divisor_range"]
+    assert lowest <= divisor < highest
+
+
+@pytest.mark.parametrize("method", DIVISOR_METHODS)
+def test_every_method_divisor_reproduces_allocation(method):
+    populations = [2_560_000, 3_315_000, 995_000, 5_012_000, 1_118_000]
+    result = apportion(populations, 50, method)
+    divisor = result["modified_divisor"]
+    assert round_quotas(np.array(populations) / divisor, method).astype(int).tolist() == result["table"]["seats"]
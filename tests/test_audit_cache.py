@@ -0,0 +1,24 @@
+"""Audit cache: a full (non-reusing) run still refreshes the stored results."""
+
+from audit_cache import AuditCache
+
+
+def test_refresh_skips_old_results_but_saves_new_ones(tmp_path):
+    page = tmp_path / "index.html"
+    first = AuditCache(tmp_path, 'accessibility', 'rules-v1')
+    first.put(page, 'hash-1', {'contrast_issues': ['old']})
+    first.save()
+
+    full = AuditCache(tmp_path, 'accessibility', 'rules-v1', reuse=False)
+    assert full.get(page, 'hash-1') is None
+    full.put(page, 'hash-1', {'contrast_issues': []})
+    full.save()
+
+    assert AuditCache(tmp_path, 'accessibility', 'rules-v1').get(page, 'hash-1') == {'contrast_issues': []}
+
+
+def test_disabled_cache_leaves_the_file_alone(tmp_path):
+    disabled = AuditCache(tmp_path, 'links', 'rules-v1', enabled=False)
+    disabled.put(tmp_path / "index.html", 'hash-1', {})
+    disabled.save()
+    assert not (tmp_path / ".audit_cache.json").exists()
@@ -0,0 +1,27 @@
+"""Form label and icon rules, run through the rule engine on small pages."""
+
+from pathlib import Path
+
+from check_accessibility import FormLabelRule
+from check_color_accessibility import IconLabelRule
+from html_document import HTMLDocument
+from rule_engine import RuleEngine
+
+
+def issues(rule, html):
+    return RuleEngine([rule]).run(HTMLDocument('page.html', html), Path('page.html'))[rule.category]
+
+
+def test_each_input_needs_its_own_label():
+    found = issues(FormLabelRule(), '<label for="name">Name</label><input type="text" id="name"><input type="email" id="mail">')
+    assert [issue['input_type'] for issue in found] == ['email']
+
+
+def test_aria_label_or_untyped_input():
+    found = issues(FormLabelRule(), '<input aria-label="Search"><input aria-labelledby="h"><input id="q">')
+    assert [issue['input_type'] for issue in found] == ['text']
+
+
+def test_aria_hidden_icons_are_not_reported():
+    found = issues(IconLabelRule(), '<i data-lucide="home" aria-hidden="true"></i><i data-lucide="x"></i><i data-lucide="y" aria-label="Close"></i>')
+    assert [issue['location'] for issue in found] == ['Line 1: <i data-lucide="x">...']
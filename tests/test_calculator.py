@@ -0,0 +1,65 @@
+"""Local calculator: questions that ask for a formula's input must fall through to the model."""
+
+import pytest
+
+from _calculator import solve
+
+ASKS_FOR_AN_INPUT = [
+    "How much must I deposit now at 6% compounded monthly to have $10,000 in 5 years?",
+    "What present value at 4% compounded quarterly grows to $5000 in 10 years?",
+    "Find the principal if the simple interest earned is $300 at 5% for 3 years",
+    "What score has a z-score of 2 if the mean is 70 and sd is 10?",
+    "Scores have a mean of 70 and sd of 10. What percent of students scored at most 2 standard deviations above the mean?",
+    "If I borrow $2000 at 5% simple interest for 3 years, what is the monthly payment?",
+    "She deposits $500 each month at 4% compounded monthly for 10 years. How much will she have?",
+    "Monthly deposits of $200 at 5% compounded monthly for 3 years",
+    "Convert 0 degrees C to kelvin",
+    "Compare 5% compounded monthly vs 5.1% compounded annually APY",
+    "$1000 at 5% compounded monthly for 3 years, then withdrawn after 2 years",
+]
+
+
+@pytest.mark.parametrize("question", ASKS_FOR_AN_INPUT)
+def test_unknown_inputs_fall_through(question):
+    assert solve(question) is None
+
+
+def test_compound_interest_still_solved():
+    solution = solve("Invest $1000 at 5% compounded quarterly for 10 years")
+    assert solution["kind"] == "compound_interest"
+    assert "$1,643.62" in solution["answer"]
+
+
+def test_simple_interest_still_solved():
+    solution = solve("Find the simple interest on $2000 at 5% for 3 years")
+    assert solution["kind"] == "simple_interest"
+    assert "$300.00" in solution["answer"]
+
+
+def test_z_score_still_solved():
+    solution = solve("What is the z-score of 85 if the mean is 70 and standard deviation is 10?")
+    assert solution["kind"] == "z_score"
+    assert solution["answer"].startswith("z = 1.5")
+
+
+def test_compounding_follows_compounded_not_annual_rate():
+    solution = solve("$1000 at 6% annual interest compounded monthly for 5 years")
+    assert "$1,348.85" in solution["answer"]
+
+
+def test_apy_of_annual_rate_compounded_monthly():
+    solution = solve("What is the APY of 6% annual interest compounded monthly?")
+    assert solution["answer"].startswith("APY = 6.17%")
+
+
+def test_apy_without_a_compounding_frequency_falls_through():
+    assert solve("What is the APY of 6% annual interest?") is None
+
+
+def test_years_and_months_are_added():
+    solution = solve("$1000 at 5% compounded monthly for 3 years and 6 months")
+    assert "$1,190.81" in solution["answer"]
+
+
+def test_celsius_to_fahrenheit_still_solved():
+    assert solve("Convert 0 degrees C to F")["answer"] == "0°C = 32°F"
@@ -0,0 +1,41 @@
+"""Shared HTML document cache: encodings survive a save, and fixers run together share reads."""
+
+import pytest
+
+import html_document
+from run_fixers import run_fixers
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    html_document.clear_cache()
+    yield
+    html_document.clear_cache()
+
+
+def test_latin1_page_is_written_back_as_latin1(tmp_path):
+    page = tmp_path / "page.html"
+    page.write_bytes("<p>caf\xe9</p>".encode('latin-1'))
+    document = html_document.load_document(page)
+    assert document.encoding == 'latin-1'
+
+    html_document.save_document(page, document.source.replace('</p>', ' ✓</p>'))
+    assert page.read_bytes() == "<p>caf\xe9 &#10003;</p>".encode('latin-1')
+
+
+def test_utf8_page_stays_utf8(tmp_path):
+    page = tmp_path / "page.html"
+    page.write_text("<p>caf\xe9</p>", encoding='utf-8')
+    document = html_document.load_document(page)
+    html_document.save_document(page, document.source + "\n")
+    assert page.read_bytes() == "<p>caf\xe9</p>\n".encode('utf-8')
+
+
+def test_fixers_in_one_process_read_each_page_once(tmp_path):
+    for name in ("a.html", "b.html"):
+        (tmp_path / name).write_text("<div class=\"grid gap-6\"><p>text</p></div>", encoding='utf-8')
+
+    stats = run_fixers(["fix_card_spacing", "fix_spacing_simple", "fix_icons_simple"], base_dir=tmp_path)
+    assert stats['tree_scans'] == 1
+    assert stats['reads'] == 2 + stats['writes']
+    assert stats['hits'] > 0
@@ -0,0 +1,29 @@
+"""Streaming text extractor: files and strings are passed explicitly, never guessed."""
+
+import pytest
+
+from html_text import html_to_text, iter_text_blocks
+
+PAGE = "<html><head><title>t</title></head><body><h2>Interest</h2><p>I = Prt &amp; more</p><script>x()</script></body></html>"
+
+
+def test_html_string():
+    blocks = list(iter_text_blocks(html=PAGE))
+    assert [block.text for block in blocks] == ["Interest", "I = Prt & more"]
+    assert blocks[1].headings == ("Interest",)
+
+
+def test_path(tmp_path):
+    page = tmp_path / "page.html"
+    page.write_text(PAGE, encoding='utf-8')
+    assert html_to_text(path=page) == html_to_text(html=PAGE) == "Interest\nI = Prt & more"
+
+
+def test_plain_text_is_not_mistaken_for_a_path():
+    assert html_to_text(html="no tags here") == "no tags here"
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"path": "a.html", "html": "<p>x</p>"}])
+def test_exactly_one_source(kwargs):
+    with pytest.raises(TypeError):
+        iter_text_blocks(**kwargs)
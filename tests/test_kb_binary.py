@@ -0,0 +1,60 @@
+"""Binary knowledge base: round trip, and detecting a .kbin that no longer matches its JSON."""
+
+import json
+import os
+
+import pytest
+
+from _kb_binary import open_kb, to_plain, write_kb
+
+KB = {"math": {"formulas": {"simple_interest": "I = Prt"}, "count": 3, "ratio": 0.5, "flags": [True, False, None]}}
+
+
+@pytest.fixture
+def built(tmp_path):
+    json_path = tmp_path / "kb.json"
+    kbin_path = tmp_path / "kb.kbin"
+    json_path.write_text(json.dumps(KB), encoding='utf-8')
+    write_kb(KB, kbin_path, source=json_path)
+    return json_path, kbin_path
+
+
+def test_round_trip(built):
+    json_path, kbin_path = built
+    assert to_plain(open_kb(kbin_path, source=json_path)) == KB
+
+
+def test_edited_json_makes_the_kbin_stale(built):
+    json_path, kbin_path = built
+    json_path.write_text(json.dumps(KB).replace("Prt", "PRT"), encoding='utf-8')  # same size, new content
+    with pytest.raises(ValueError, match="out of date"):
+        open_kb(kbin_path, source=json_path)
+
+
+def test_touched_but_unchanged_json_is_still_current(built):
+    json_path, kbin_path = built
+    stat = os.stat(json_path)
+    os.utime(json_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert to_plain(open_kb(kbin_path, source=json_path)) == KB
+
+
+def test_kbin_without_recorded_source_is_not_trusted(built, tmp_path):
+    json_path, _ = built
+    unrecorded = tmp_path / "other.kbin"
+    write_kb(KB, unrecorded)
+    assert to_plain(open_kb(unrecorded)) == KB
+    with pytest.raises(ValueError):
+        open_kb(unrecorded, source=json_path)
+
+
+def test_missing_json_keeps_the_kbin(built):
+    json_path, kbin_path = built
+    json_path.unlink()
+    assert to_plain(open_kb(kbin_path, source=json_path)) == KB
+
+
+def test_old_or_truncated_files_are_rejected(tmp_path):
+    path = tmp_path / "old.kbin"
+    path.write_bytes(b"KBIN" + bytes(8))
+    with pytest.raises(ValueError):
+        open_kb(path)
@@ -0,0 +1,37 @@
+"""Knowledge index: the copy stored in a .kbin answers like the freshly built one, without decoding it all."""
+
+from _kb_binary import open_kb, write_kb
+from _knowledge_index import INDEX_KEY, KnowledgeIndex, StoredKnowledgeIndex
+
+MATH = {
+    "formulas": {
+        "6": ["Simple interest: I = Prt", "Compound interest: A = P(1 + r/n)^(nt)"],
+        "11": ["z-score: z = (x - mean) / standard deviation"]
+    },
+    "concepts": {"6": "Interest is the cost of borrowing money"},
+    "study_guides": {f"guide_{i}": f"Study guide {i} on proportions and percent change" for i in range(50)},
+    "assignments": {"hw6": "Homework on compound interest and annuities"}
+}
+QUERIES = [(["interest"], "formula"), (["proportion"], "study_guide"), (["z-score"], "formula"), (["missing"], "formula")]
+
+
+def test_stored_index_matches_built_index(tmp_path):
+    built = KnowledgeIndex.from_math_knowledge(MATH)
+    path = tmp_path / "kb.kbin"
+    write_kb({"math": MATH, INDEX_KEY: built.to_data()}, path)
+    stored = StoredKnowledgeIndex(open_kb(path)[INDEX_KEY])
+
+    for terms, kind in QUERIES:
+        assert stored.search(terms, kind) == built.search(terms, kind)
+    assert stored.group_texts("formula", "6") == built.group_texts("formula", "6")
+    assert stored.kind_texts("assignment") == built.kind_texts("assignment")
+
+
+def test_stored_index_decodes_only_what_a_query_touches(tmp_path):
+    path = tmp_path / "kb.kbin"
+    write_kb({"math": MATH, INDEX_KEY: KnowledgeIndex.from_math_knowledge(MATH).to_data()}, path)
+    root = open_kb(path)
+    StoredKnowledgeIndex(root[INDEX_KEY]).search(["annuities"], "assignment")
+    decoded = root._kb.string_cache.values()
+    assert "Homework on compound interest and annuities" in decoded
+    assert not any(text.startswith("Study guide") for text in decoded)
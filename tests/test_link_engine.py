@@ -0,0 +1,75 @@
+"""Link engine scheduling against a local stand-in server: backoff never holds a slot, single checks share an engine."""
+
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from check_links import LinkChecker
+from link_engine import AsyncLinkEngine
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """/busy: 503 with Retry-After: 1 the first time, then 200. Anything else: 200."""
+
+    hits = Counter()
+
+    def do_HEAD(self):
+        self.hits[self.path] += 1
+        if self.path == '/busy' and self.hits[self.path] == 1:
+            self.send_response(503)
+            self.send_header('Retry-After', '1')
+        else:
+            self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    StandInHandler.hits.clear()
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def link(url):
+    return {'url': url, 'file': 'index.html', 'link_type': 'link'}
+
+
+def test_backoff_releases_the_slots(server):
+    # One slot in total: /ok can only finish during /busy's backoff if the slot was given back
+    engine = AsyncLinkEngine(global_limit=1, per_host_limit=1, max_retries=1, timeout=5)
+    finished = []
+    results = engine.check_all([link(f"{server}/busy"), link(f"{server}/ok")],
+                               on_result=lambda result: finished.append(result['url']))
+    assert [result['status'] for result in results] == ['OK', 'OK']
+    assert finished == [f"{server}/ok", f"{server}/busy"]
+    assert engine.stats['retries'] == 1
+
+
+def test_single_checks_share_one_engine(server, tmp_path):
+    checker = LinkChecker(tmp_path, timeout=5)
+    checker.status_cache.enabled = False
+    try:
+        first = checker.check_http_link(link(f"{server}/a"))
+        engine = checker.engine
+        threads = [threading.Thread(target=checker.check_http_link, args=(link(f"{server}/{i}"),)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert first['status'] == 'OK'
+        assert checker.engine is engine
+        assert engine.stats['requests'] == 5
+    finally:
+        checker.close()
+    assert checker.engine is None
@@ -0,0 +1,132 @@
+"""External link status cache, exercised through the link engine against a local stand-in server."""
+
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from link_engine import AsyncLinkEngine
+from link_status_cache import FAILURE_BACKOFF, LinkStatusCache, ttl_for
+
+ETAG = '"v1"'
+LAST_MODIFIED = 'Wed, 01 Jan 2025 00:00:00 GMT'
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """/ok: 200 with validators (304 when they match), /missing: 404, /error: 500."""
+
+    hits = Counter()
+    conditional = Counter()
+
+    def do_HEAD(self):
+        self.hits[self.path] += 1
+        if self.headers.get('If-None-Match') or self.headers.get('If-Modified-Since'):
+            self.conditional[self.path] += 1
+        if self.path == '/ok':
+            if self.headers.get('If-None-Match') == ETAG:
+                self.send_response(304)
+            else:
+                self.send_response(200)
+            self.send_header('ETag', ETAG)
+            self.send_header('Last-Modified', LAST_MODIFIED)
+        elif self.path == '/missing':
+            self.send_response(404)
+        else:
+            self.send_response(500)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    do_GET = do_HEAD
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    StandInHandler.hits.clear()
+    StandInHandler.conditional.clear()
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def check(cache, url):
+    engine = AsyncLinkEngine(cache, max_retries=0, timeout=5)
+    return engine.check_all([{'url': url, 'file': 'index.html', 'link_type': 'link'}])[0]
+
+
+def test_ok_response_with_validators_is_stored(server, tmp_path):
+    url = f"{server}/ok"
+    cache = LinkStatusCache(tmp_path)
+    result = check(cache, url)
+    assert result['status'] == 'OK' and result['cache'] == 'miss'
+    assert cache.entries[url]['etag'] == ETAG
+    assert cache.entries[url]['last_modified'] == LAST_MODIFIED
+
+    # Fresh entry: answered from the cache, also after a save and reload
+    cache.save()
+    reloaded = LinkStatusCache(tmp_path)
+    assert check(reloaded, url)['cache'] == 'hit'
+    assert StandInHandler.hits['/ok'] == 1
+
+
+def test_stale_entry_revalidates_with_304(server, tmp_path):
+    url = f"{server}/ok"
+    cache = LinkStatusCache(tmp_path, default_ttl=0)
+    assert check(cache, url)['cache'] == 'miss'
+
+    result = check(cache, url)
+    assert result['cache'] == 'revalidated'
+    assert result['status'] == 'OK' and result['status_code'] == 200
+    assert StandInHandler.conditional['/ok'] == 1
+    assert cache.stats['revalidated'] == 1
+
+
+@pytest.mark.parametrize("path, status_code", [('/missing', 404), ('/error', 500)])
+def test_failures_are_cached_with_backoff(server, tmp_path, path, status_code):
+    url = f"{server}{path}"
+    cache = LinkStatusCache(tmp_path)
+    result = check(cache, url)
+    assert result['status'] == 'BROKEN' and result['status_code'] == status_code
+    entry = cache.entries[url]
+    assert entry['failures'] == 1
+    assert entry['expires_at'] - entry['checked_at'] == pytest.approx(FAILURE_BACKOFF)
+
+    # Within the backoff window the failure is served from the cache
+    assert check(cache, url)['cache'] == 'hit'
+    assert cache.stats['negative_hits'] == 1
+    assert StandInHandler.hits[path] == 1
+
+    # After the window it is checked again, and the next window is twice as long
+    entry['expires_at'] = 0
+    check(cache, url)
+    entry = cache.entries[url]
+    assert entry['failures'] == 2
+    assert entry['expires_at'] - entry['checked_at'] == pytest.approx(2 * FAILURE_BACKOFF)
+    assert StandInHandler.hits[path] == 2
+
+
+def test_ttl_expiry(server, tmp_path):
+    url = f"{server}/ok"
+    cache = LinkStatusCache(tmp_path, default_ttl=60)
+    check(cache, url)
+    now = time.time()
+    assert cache.fresh(url, now=now + 30) is not None
+    assert cache.fresh(url, now=now + 61) is None
+
+    # An expired entry goes back to the server
+    cache.entries[url]['expires_at'] = 0
+    assert check(cache, url)['cache'] == 'revalidated'
+    assert StandInHandler.hits['/ok'] == 2
+
+
+def test_domain_ttls():
+    assert ttl_for('https://fonts.googleapis.com/css', default_ttl=10) == 7 * 24 * 3600
+    assert ttl_for('https://sub.docs.google.com/x', default_ttl=10) == 6 * 3600
+    assert ttl_for('https://example.com/', default_ttl=10) == 10
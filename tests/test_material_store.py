@@ -0,0 +1,31 @@
+"""Lazy course material store, imported through the tutor_system package."""
+
+from tutor_system.material_store import LazyMaterialStore
+from tutor_system.mat143_tutor import MAT143Tutor
+
+
+def make_store(tmp_path, **kwargs):
+    (tmp_path / "All_Sections_Guide.md").write_text("# Guide\n\n## Chapter 1: Thinking\n", encoding='utf-8')
+    (tmp_path / "Chapter_6_Formula_Sheet.md").write_text("# Sheet\n\n## Present Value\n", encoding='utf-8')
+    return LazyMaterialStore(tmp_path, **kwargs)
+
+
+def test_files_are_read_on_first_access_only(tmp_path):
+    store = make_store(tmp_path)
+    assert len(store) == 2 and store.stats["loads"] == 0
+    [sheet] = store.find("formula_sheet")
+    assert "Present Value" in store[sheet]
+    store[sheet]
+    assert store.stats == {"loads": 1, "hits": 1, "evictions": 0}
+
+
+def test_least_recently_used_files_are_dropped_over_budget(tmp_path):
+    store = make_store(tmp_path, memory_budget=10)
+    for path in store:
+        store[path]
+    assert store.stats["evictions"] == 1 and len(store.loaded) == 1
+
+
+def test_tutor_imports_as_a_package():
+    tutor = MAT143Tutor.__new__(MAT143Tutor)
+    assert "Compound Interest" in tutor.formula_lookup("interest")
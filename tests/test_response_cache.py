@@ -0,0 +1,25 @@
+"""Response cache keys: filler words and case don't matter, word order and repeats do."""
+
+from _response_cache import make_cache_key, normalize_query
+
+
+def test_filler_case_and_punctuation_ignored():
+    assert make_cache_key("How do I calculate simple interest?") == make_cache_key("simple INTEREST")
+
+
+def test_word_order_changes_the_key():
+    assert make_cache_key("$2000 at 5% for 3 years") != make_cache_key("$3 at 5% for 2000 years")
+    assert (make_cache_key("z-score of 85 with mean 70 and sd 10")
+            != make_cache_key("z-score of 70 with mean 85 and sd 10"))
+
+
+def test_repeated_words_kept():
+    assert normalize_query("5 5 7") == "5 5 7"
+    assert make_cache_key("mean of 5, 5, 7") != make_cache_key("mean of 5, 7")
+
+
+def test_operators_and_signs_change_the_key():
+    assert make_cache_key("what is 2+3") != make_cache_key("what is 2*3")
+    assert make_cache_key("solve x = -1.5") != make_cache_key("solve x = 1.5")
+    assert normalize_query("x = -1.5") == "x = -1.5"
+    assert normalize_query("5-3") == "5 - 3"
@@ -0,0 +1,43 @@
+"""Semantic cache: paraphrases hit, but only with the same numbers and topic."""
+
+import pytest
+
+from _semantic_cache import SemanticCache
+
+QUESTION = "How do I calculate compound interest on $1000 at 5% for 10 years?"
+PARAPHRASE = "how to calculate the compound interest on $1000 at 5% for 10 years"
+
+
+def test_paraphrase_with_same_numbers_hits():
+    cache = SemanticCache()
+    cache.add(QUESTION, "6", {"answer": "stored"}, "interest")
+    hit = cache.lookup(PARAPHRASE, "6", "interest")
+    assert hit is not None and hit[0] == {"answer": "stored"}
+
+
+def test_different_numbers_miss():
+    cache = SemanticCache()
+    cache.add(QUESTION, "6", {"answer": "stored"}, "interest")
+    assert cache.lookup("How do I calculate compound interest on $2000 at 5% for 10 years?", "6", "interest") is None
+    assert cache.lookup("How do I calculate compound interest on $1000 at 10% for 5 years?", "6", "interest") is None
+
+
+def test_topic_is_part_of_the_bucket():
+    cache = SemanticCache()
+    cache.add(QUESTION, "6", {"answer": "stored"}, "interest")
+    assert cache.lookup(QUESTION, "6", "probability") is None
+    assert cache.lookup(QUESTION, "6", "interest") is not None
+
+
+@pytest.mark.parametrize("stored, asked", [
+    ("How do I convert 100 fahrenheit to celsius?", "How do I convert 100 celsius to fahrenheit?"),
+    ("convert 5 km to miles", "convert 5 miles to km"),
+    ("What is the probability of rolling a 6?", "What is the probability of not rolling a 6?"),
+    ("What is the area to the left of a z score for -2?", "What is the area to the left of a z score for 2?"),
+    ("Is a mile longer than a km?", "Is a km longer than a mile?"),
+])
+def test_lookalikes_with_different_answers_miss(stored, asked):
+    cache = SemanticCache()
+    cache.add(stored, "11", {"answer": "stored"})
+    assert cache.lookup(stored, "11") is not None
+    assert cache.lookup(asked, "11") is None
@@ -0,0 +1,73 @@
+"""Statistics engine: picking the dataset out of a question, and the streaming accumulators."""
+
+import numpy as np
+import pytest
+
+from _calculator import solve
+from _statistics import RunningStats, describe, normal_cdf, solve_normal, solve_statistics
+
+
+def test_year_run_is_not_the_dataset():
+    solution = solve_statistics("In 2020, 2021, and 2022 sales were 100, 200, 300. Find the mean sales.")
+    assert solution["answer"].startswith("mean = 200,")
+    assert solve("In 2020, 2021, and 2022 sales were 100, 200, 300. Find the mean sales.")["answer"].startswith("mean = 200,")
+
+
+@pytest.mark.parametrize("question", [
+    "Test 1 had 3 4 5 and test 2 had 6 7 8; find the mean",
+    "Quiz one scores: 3, 4, 5. Quiz two scores: 6, 7, 9. Find the mean",
+    "Find the mean of 2019, 2020, 2021",
+])
+def test_ambiguous_datasets_fall_through(question):
+    assert solve_statistics(question) is None
+
+
+def test_cued_run_wins():
+    solution = solve_statistics("Class of 24 students, 3 sections. Scores: 70, 80, 90. Find the mean")
+    assert solution["answer"].startswith("mean = 80,")
+
+
+@pytest.mark.parametrize("question", [
+    "The average of 4 test scores is 85. If three are 80, 90, 75, what is the fourth?",
+    "Three scores are 80, 90, 75. What must the fourth score be?",
+    "Scores are 80, 90, 75. If the mean is 85, what is the missing value?",
+    "A student needs an average of 90. Scores so far are 85, 92, 88. What score is needed on the last test?",
+])
+def test_working_back_from_a_mean_falls_through(question):
+    assert solve_statistics(question) is None
+
+
+def test_textbook_dataset():
+    solution = solve_statistics("Find the mean and standard deviation of 2, 4, 4, 4, 5, 5, 7, 9")
+    assert solution["answer"] == "mean = 5, median = 4.5, s = 2.1381"
+
+
+def test_running_stats_match_numpy():
+    data = np.random.default_rng(0).normal(50, 10, 200_000)
+    summary = describe(data)
+    assert summary["mean"] == pytest.approx(data.mean())
+    assert summary["std"] == pytest.approx(data.std(ddof=1))
+    merged = RunningStats().update(data[:1000]).merge(RunningStats().update(data[1000:]))
+    assert merged.variance == pytest.approx(data.var(ddof=1))
+    assert summary["median"] == pytest.approx(np.median(data), abs=0.1)
+
+
+def test_normal_table():
+    assert normal_cdf(1.96) == pytest.approx(0.975, abs=1e-4)
+    assert normal_cdf(0) == pytest.approx(0.5)
+
+
+IQ = "IQ scores are normal with mean 100 and standard deviation 15. "
+
+
+@pytest.mark.parametrize("question, answer", [
+    ("What proportion score at least 70 and less than 90?", "P(70 < X < 90) ≈ 0.2297"),
+    ("What proportion score below 130 but above 85?", "P(85 < X < 130) ≈ 0.8186"),
+    ("What percent score greater than 130 or less than 70?", "P(X < 70 or X > 130) ≈ 0.0455"),
+])
+def test_normal_two_bounds(question, answer):
+    assert solve_normal(IQ + question)["answer"].startswith(answer)
+
+
+def test_normal_unjoined_bounds_fall_through():
+    assert solve_normal(IQ + "What proportion score above 130 and below 90?") is None
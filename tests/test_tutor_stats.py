@@ -0,0 +1,44 @@
+"""GET /api/tutor: the stats report is served only for an exact 'stats' query key."""
+
+import io
+import json
+
+import pytest
+
+import tutor
+
+
+class StubHandler(tutor.handler):
+    """The endpoint's handler without a socket: responses go to a buffer."""
+
+    def __init__(self, path):
+        self.path = path
+        self.wfile = io.BytesIO()
+        self.status = None
+
+    def send_response(self, code, message=None):
+        self.status = code
+
+    def send_header(self, keyword, value):
+        pass
+
+    def end_headers(self):
+        pass
+
+
+def get(path):
+    stub = StubHandler(path)
+    stub.do_GET()
+    return stub.status, json.loads(stub.wfile.getvalue())
+
+
+@pytest.mark.parametrize("path", ["/api/tutor?stats=1", "/api/tutor?stats", "/api/tutor?x=2&stats=1"])
+def test_stats_key(path):
+    status, body = get(path)
+    assert status == 200 and "response_cache" in body
+
+
+@pytest.mark.parametrize("path", ["/api/tutor", "/api/tutor?nostats=1", "/api/tutor?q=stats", "/api/tutor?statsx=1"])
+def test_other_queries_are_not_stats(path):
+    status, body = get(path)
+    assert status == 405 and body["error"] is True
@@ -0,0 +1,36 @@
+"""Voting engine: pasted preference schedules and the pairwise comparison steps."""
+
+import pytest
+
+from _voting import PreferenceSchedule, parse_ballot_lines
+
+
+@pytest.mark.parametrize("line, expected", [
+    ("ABC 5", (['A', 'B', 'C'], 5)),
+    ("A > B > C 5", (['A', 'B', 'C'], 5)),
+    ("A, B, C 12 voters", (['A', 'B', 'C'], 12)),
+    ("12: A > B > C", (['A', 'B', 'C'], 12)),
+    ("A, B, C - 12", (['A', 'B', 'C'], 12)),
+    ("Option 1 > Option 2", (['Option 1', 'Option 2'], 1)),
+    ("Option 1 > Option 2 - 4", (['Option 1', 'Option 2'], 4)),
+])
+def test_ballot_line_layouts(line, expected):
+    assert parse_ballot_lines(line) == [expected]
+
+
+def test_trailing_count_schedule():
+    schedule = PreferenceSchedule.from_counts(parse_ballot_lines("ABC 5\nBCA 4\nCAB 3"))
+    assert schedule.voters == 12
+    assert schedule.plurality()["winner"] == "A"
+
+
+def test_condorcet_cycle_says_there_is_no_condorcet_winner():
+    result = PreferenceSchedule.from_counts([("ABC", 1), ("BCA", 1), ("CAB", 1)]).pairwise()
+    assert result["winners"] == ['A', 'B', 'C'] and result["condorcet_winner"] is None
+    assert result["steps"][-1] == "No candidate beats every other candidate head to head, so there is no Condorcet winner"
+
+
+def test_condorcet_winner_step():
+    result = PreferenceSchedule.from_counts([("ABC", 3), ("BCA", 2)]).pairwise()
+    assert result["condorcet_winner"] == "A"
+    assert result["steps"][-1].endswith("(Condorcet winner)")
@@ -8,18 +8,25 @@ import os
 import json
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
-import anthropic
+import sys
 from pathlib import Path
 
+# Reuse the same pooled Anthropic client as the api/ endpoints
+sys.path.insert(0, str(Path(__file__).parent.parent / "api"))
+from _client_pool import get_client
+
+# Also importable as tutor_system.<module>, not only when run as a script
+sys.path.insert(0, str(Path(__file__).parent))
+from material_store import LazyMaterialStore
+
 class MAT143TutorWithCalendar:
     def __init__(self, api_key: str = None):
         """Initialize the MAT 143 Tutor with course knowledge and calendar."""
         if api_key:
-            self.client = anthropic.Anthropic(api_key=api_key)
+            self.client = get_client(api_key)
         else:
             self.client = None
         
-        self.course_materials = {}
         self.session_history = []
         self.load_course_materials()
         
@@ -127,6 +134,11 @@ class MAT143TutorWithCalendar:
             }
         }
 
+    def load_course_materials(self):
+        """Index course materials; each file is read the first time it is used."""
+        materials_dir = Path(__file__).parent.parent / "course_materials"
+        self.course_materials = LazyMaterialStore(materials_dir)
+
     def create_semester_schedule(self):
         """Create detailed semester schedule with all assignments and due dates."""
         
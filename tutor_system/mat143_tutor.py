@@ -15,14 +15,21 @@ import os
 import json
 from datetime import datetime
 from typing import Dict, List, Optional
-import anthropic
+import sys
 from pathlib import Path
 
+# Reuse the same pooled Anthropic client as the api/ endpoints
+sys.path.insert(0, str(Path(__file__).parent.parent / "api"))
+from _client_pool import get_client
+
+# Also importable as tutor_system.<module>, not only when run as a script
+sys.path.insert(0, str(Path(__file__).parent))
+from material_store import LazyMaterialStore
+
 class MAT143Tutor:
     def __init__(self, api_key: str):
         """Initialize the MAT 143 Tutor with course knowledge."""
-        self.client = anthropic.Anthropic(api_key=api_key)
-        self.course_materials = {}
+        self.client = get_client(api_key)
         self.session_history = []
         self.load_course_materials()
         
@@ -47,18 +54,9 @@ class MAT143Tutor:
         }
 
     def load_course_materials(self):
-        """Load all course materials from the course_materials directory."""
+        """Index course materials; each file is read the first time it is used."""
         materials_dir = Path(__file__).parent.parent / "course_materials"
-        
-        if materials_dir.exists():
-            for file_path in materials_dir.rglob("*"):
-                if file_path.is_file():
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                            self.course_materials[str(file_path)] = content
-                    except Exception as e:
-                        print(f"Could not load {file_path}: {e}")
+        self.course_materials = LazyMaterialStore(materials_dir)
 
     def get_chapter_help(self, chapter: int, topic: str = "") -> str:
         """Get help for a specific chapter and topic."""
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Lazy Course Material Store
+Indexes course_materials/ at startup and reads files only when asked for.
+
+Most tutoring sessions only touch one chapter, so reading every formula sheet
+and schedule up front just slows down CLI startup. The store behaves like the
+old {path: content} dict, but content is loaded on first access and the
+least recently used files are dropped once the memory budget is exceeded.
+"""
+
+import os
+from collections import OrderedDict
+from collections.abc import Mapping
+from pathlib import Path
+
+DEFAULT_MEMORY_BUDGET = int(os.getenv('MAT143_MATERIALS_BUDGET', 8 * 1024 * 1024))  # characters of decoded text
+
+
+class LazyMaterialStore(Mapping):
+    """Read-only {path: content} mapping with on-demand loading."""
+
+    def __init__(self, materials_dir, memory_budget=DEFAULT_MEMORY_BUDGET):
+        self.materials_dir = Path(materials_dir)
+        self.memory_budget = memory_budget
+        self.sizes = {}
+        self.loaded = OrderedDict()
+        self.loaded_bytes = 0
+        self.stats = {"loads": 0, "hits": 0, "evictions": 0}
+
+        if self.materials_dir.exists():
+            for file_path in self.materials_dir.rglob("*"):
+                if file_path.is_file():
+                    self.sizes[str(file_path)] = file_path.stat().st_size
+
+    def __getitem__(self, path):
+        path = str(path)
+        if path in self.loaded:
+            self.loaded.move_to_end(path)
+            self.stats["hits"] += 1
+            return self.loaded[path]
+        if path not in self.sizes:
+            raise KeyError(path)
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except Exception as e:
+            print(f"Could not load {path}: {e}")
+            raise KeyError(path) from e
+
+        self.stats["loads"] += 1
+        self.loaded[path] = content
+        self.loaded_bytes += len(content)
+        self._evict()
+        return content
+
+    def _evict(self):
+        """Drop least recently used files until we're back under budget."""
+        while self.loaded_bytes > self.memory_budget and len(self.loaded) > 1:
+            _, content = self.loaded.popitem(last=False)
+            self.loaded_bytes -= len(content)
+            self.stats["evictions"] += 1
+
+    def __iter__(self):
+        return iter(self.sizes)
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def __contains__(self, path):
+        return str(path) in self.sizes
+
+    def find(self, text):
+        """Paths whose file name contains `text` (e.g. 'Chapter_6'), without reading them."""
+        text = text.lower()
+        return [path for path in self.sizes if text in Path(path).name.lower()]